@@ -0,0 +1,51 @@
+"""
+Memory of `ProcessStateProgress` models vs. a `ProgressStore`.
+
+    $ python -m benchmarks.compact
+"""
+
+import gc
+import tracemalloc
+
+from core_client.base.models.v3 import ProcessList
+from core_client.compact import ProgressStore
+from core_client.decoding import adapter
+from tests.fixtures import process
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def bench(count: int, outputs: int = 4):
+    processes = adapter(ProcessList).validate_python(
+        [process(i, outputs=outputs) for i in range(count)]
+    )
+    # copies, so the models do not share the decoded list
+    models, models_size = traced(
+        lambda: {
+            p.id: p.state.progress.model_copy(deep=True) for p in processes
+        }
+    )
+
+    def build_store():
+        store = ProgressStore()
+        store.update_processes(processes)
+        return store
+
+    store, store_size = traced(build_store)
+    print(f"{count} processes, {outputs + 2} inputs/outputs each")
+    print(f"  models      {models_size / 1e6:>10.1f} MB")
+    print(f"  store       {store_size / 1e6:>10.1f} MB")
+    print(f"  ratio       {models_size / store_size:>10.1f}x")
+
+
+if __name__ == "__main__":
+    bench(1000)
+    bench(10000)
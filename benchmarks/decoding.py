@@ -0,0 +1,46 @@
+"""
+Response decoding: a TypeAdapter per call from parsed JSON vs. the
+cached adapter validating the raw JSON bytes (`Decoder`).
+
+    $ python -m benchmarks.decoding
+"""
+
+import json
+import timeit
+from pydantic import TypeAdapter
+
+from core_client.base.models.v3 import Process, ProcessList
+from core_client.decoding import Decoder
+from tests.fixtures import process
+
+
+def bench(name: str, model, data, number: int, repeat: int = 7):
+    body = json.dumps(data).encode()
+    decoder = Decoder()
+    cases = {
+        "per call adapter": lambda: TypeAdapter(model).validate_python(
+            json.loads(body), from_attributes=True
+        ),
+        "decoder": lambda: decoder(model, body),
+    }
+    results = {case: [] for case in cases}
+    for _ in range(repeat):
+        for case, call in cases.items():
+            results[case].append(timeit.timeit(call, number=number) / number)
+    base = min(results["per call adapter"])
+    print(f"{name}, {len(body) / 1e3:.1f} kB")
+    for case, times in results.items():
+        print(
+            f"  {case:<18}{min(times) * 1e6:>10.1f} us"
+            f"{base / min(times):>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench("Process", Process, process(0), number=200)
+    bench(
+        "ProcessList, 200 processes",
+        ProcessList,
+        [process(i) for i in range(200)],
+        number=5,
+    )
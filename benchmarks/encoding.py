@@ -0,0 +1,46 @@
+"""
+Request body encoding: `model_dump()` + httpx `json=` vs. `json_body`.
+
+    $ python -m benchmarks.encoding
+"""
+
+import timeit
+
+import httpx
+
+from core_client.base.models.v3 import Config, ProcessConfig
+from core_client.endpoints import json_body
+from tests.fixtures import config, process
+
+URL = "http://127.0.0.1:8080/api/v3/config"
+
+
+def bench(name: str, model, number: int, repeat: int = 7):
+    cases = {
+        "model_dump + json": lambda: httpx.Request(
+            "PUT", URL, json=model.model_dump()
+        ),
+        "json_body": lambda: httpx.Request(
+            "PUT", URL, content=json_body(model)
+        ),
+    }
+    results = {case: [] for case in cases}
+    for _ in range(repeat):
+        for case, call in cases.items():
+            results[case].append(timeit.timeit(call, number=number) / number)
+    base = min(results["model_dump + json"])
+    print(f"{name}, {len(json_body(model)) / 1e3:.1f} kB")
+    for case, times in results.items():
+        print(
+            f"  {case:<18}{min(times) * 1e6:>10.1f} us"
+            f"{base / min(times):>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench("Config", Config.model_validate(config()), number=2000)
+    bench(
+        "ProcessConfig, 20 outputs",
+        ProcessConfig.model_validate(process(0, outputs=20)["config"]),
+        number=2000,
+    )
@@ -0,0 +1,51 @@
+"""
+Concurrent viewers of one process state: direct to a local stub Core vs.
+through the caching `Gateway` (ttl 1s).
+
+    $ python -m benchmarks.gateway
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from core_client import AsyncClient
+from core_client.gateway import Gateway
+from tests.fixtures import process
+from tests.stub import StubCore
+
+ID = "restreamer-ui:ingest:a"
+URL = f"/api/v3/process/{ID}/state"
+
+
+async def viewers(http: httpx.AsyncClient, count: int, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(http.get(URL) for _ in range(count)))
+    return time.perf_counter() - start
+
+
+async def main(count: int = 500, rounds: int = 5):
+    print(f"{rounds} x {count} concurrent GET {URL}")
+    with StubCore({("GET", URL): (200, process(0)["state"])}) as core:
+        limits = httpx.Limits(max_connections=100)
+        async with httpx.AsyncClient(base_url=core.url, limits=limits) as http:
+            seconds = await viewers(http, count, rounds)
+        upstream = len(core.requests)
+        print(f"  {'direct':<8}{seconds:>8.2f} s{upstream:>8} upstream")
+        core.requests.clear()
+        client = AsyncClient(base_url=core.url, access_token="token")
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=Gateway(client)),
+            base_url="http://gateway",
+            headers={"authorization": "Bearer token"},
+        ) as http:
+            seconds = await viewers(http, count, rounds)
+        await client.aclose()
+        upstream = len(core.requests)
+        print(f"  {'gateway':<8}{seconds:>8.2f} s{upstream:>8} upstream")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""
+Playout keyframes of many channels from a local stub Core (20 ms per
+keyframe): sequential calls vs. `KeyframeHarvester`.
+
+    $ python -m benchmarks.keyframes
+"""
+
+import asyncio
+import time
+
+from core_client import AsyncClient, Client
+from core_client.keyframes import KeyframeHarvester
+from tests.stub import StubCore
+
+CHANNELS = 200
+PATH = "/api/v3/process/channel-{}/playout/input/keyframe/last.jpg"
+
+
+def keyframe(handler):
+    time.sleep(0.02)
+    return 200, b"\xff\xd8" + handler.path.encode()
+
+
+def sequential(url: str):
+    client = Client(base_url=url, access_token="token")
+    for n in range(CHANNELS):
+        client.v3_process_get_playout_input_keyframe(
+            id=f"channel-{n}", input_id="input", input_name="last.jpg"
+        )
+    client.close()
+
+
+async def harvester(url: str, concurrency: int):
+    client = AsyncClient(base_url=url, access_token="token")
+    harvester = KeyframeHarvester(client, concurrency=concurrency)
+    inputs = [(f"channel-{n}", "input") for n in range(CHANNELS)]
+    async for _ in harvester.harvest(inputs):
+        pass
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    routes = {("GET", PATH.format(n)): keyframe for n in range(CHANNELS)}
+    print(f"{CHANNELS} keyframes, 20 ms each")
+    with StubCore(routes) as core:
+        start = time.perf_counter()
+        sequential(core.url)
+        print(f"  {'sequential':<16}{time.perf_counter() - start:>8.2f} s")
+        for concurrency in (8, 16):
+            start = time.perf_counter()
+            asyncio.run(harvester(core.url, concurrency))
+            name = f"harvester ({concurrency})"
+            print(f"  {name:<16}{time.perf_counter() - start:>8.2f} s")
@@ -0,0 +1,49 @@
+"""
+Full `ProcessList` decoding vs. a field projection.
+
+    $ python -m benchmarks.projection
+"""
+
+import json
+import timeit
+from pydantic import TypeAdapter
+
+from core_client.base.models.v3 import ProcessList
+from core_client.projection import projection_adapter
+from tests.fixtures import process
+
+FIELDS = frozenset(
+    [
+        "id",
+        "reference",
+        "state.exec",
+        "state.order",
+        "state.progress.bitrate_kbit",
+    ]
+)
+
+
+def bench(count: int, repeat: int = 5):
+    body = json.dumps([process(i) for i in range(count)]).encode()
+    full = TypeAdapter(ProcessList)
+    projected = projection_adapter(FIELDS, many=True)
+    results = {
+        "full": timeit.repeat(
+            lambda: full.validate_python(json.loads(body)),
+            number=1,
+            repeat=repeat,
+        ),
+        "projection": timeit.repeat(
+            lambda: projected.validate_json(body), number=1, repeat=repeat
+        ),
+    }
+    print(f"{count} processes, {len(body) / 1e6:.1f} MB")
+    for name, times in results.items():
+        print(f"  {name:<12}{min(times) * 1000:>10.1f} ms")
+    speedup = min(results["full"]) / min(results["projection"])
+    print(f"  speedup     {speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    bench(1000)
+    bench(10000, repeat=3)
@@ -0,0 +1,44 @@
+"""
+Request latency against a local stub Core: TCP (loopback) vs. UDS.
+
+    $ python -m benchmarks.uds
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+from core_client import Client
+from tests.stub import StubCore
+
+ROUTES = {("GET", "/api/v3/fs"): (200, [])}
+
+
+def bench(name: str, client: Client, count: int):
+    client.v3_fs_get_list()  # connect
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.v3_fs_get_list()
+        times.append(time.perf_counter() - start)
+    client.close()
+    times.sort()
+    print(
+        f"  {name:<6}"
+        f"{statistics.mean(times) * 1e6:>10.0f} us mean"
+        f"{times[len(times) // 2] * 1e6:>10.0f} us p50"
+        f"{times[int(len(times) * 0.99)] * 1e6:>10.0f} us p99"
+    )
+
+
+if __name__ == "__main__":
+    count = 2000
+    print(f"{count} sequential v3_fs_get_list calls")
+    with StubCore(ROUTES) as core:
+        bench("tcp", Client(base_url=core.url, access_token="token"), count)
+    with tempfile.TemporaryDirectory() as directory:
+        uds = os.path.join(directory, "core.sock")
+        with StubCore(ROUTES, uds=uds) as core:
+            client = Client(base_url=core.url, access_token="token", uds=uds)
+            bench("uds", client, count)
@@ -1,22 +1,57 @@
 import httpx
-import functools
-import importlib
-import pkgutil
+import asyncio
 import base64
 import json
+import threading
+import time
 from datetime import datetime
 from httpx import InvalidURL as HttpInvalidURL, HTTPError
 from pydantic import (
     AnyUrl,
+    BaseModel,
     ValidationError as PydanticValidationError,
 )
 
-from . import base
 from .models import Client as ClientModel
-from .base.models import Token, AccessToken, About
+from .base.api import ENDPOINTS
+from .base.models import Token, AccessToken, About, Error
+from .compression import DEFAULT_ENCODINGS, TransferStats, accept_encoding
+from .config_patch import config_dict, config_diff, config_merge_patch
+from .decoding import Decoder
+from .endpoints import Endpoint
+from .events import aevents, events
+from .lanes import DEFAULT, AsyncLanes, Lanes, endpoint_lane
+from .token_store import TokenStore
+
+
+def _jwt_expires_at(token: str):
+    """Expiry (exp claim) of a JWT, None if it can not be read."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))["exp"]
+    except (AttributeError, IndexError, KeyError, ValueError):
+        return None
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
 
 
 class Client:
+    _lanes_class = Lanes
+
     def __init__(
         self,
         base_url: AnyUrl,
@@ -27,9 +62,35 @@ class Client:
         auth0_token: str = None,
         retries: int = 3,
         timeout: float = 10.0,
+        coalesce: tuple = (),
+        lanes: dict = None,
+        token_store: TokenStore = None,
+        token_min_ttl: float = 60.0,
+        uds: str = None,
+        transport_factory=None,
+        compression: tuple = DEFAULT_ENCODINGS,
     ):
+        """
+        Args:
+            coalesce (tuple): names of idempotent GET endpoints whose
+                identical in-flight calls share one request and result,
+                e.g. ("v3_process_get_list", "v3_skills_get")
+            lanes (dict): max. concurrent requests per lane ("control",
+                "default", "bulk"), e.g. {"bulk": 4}, None is unlimited
+            token_store (TokenStore): shares tokens and the About response
+                of logins per (base_url, credentials), e.g. FileTokenStore()
+            token_min_ttl (float): cached access tokens expiring within n
+                seconds are refreshed
+            uds (str): Unix domain socket path of the Core, e.g. for a
+                sidecar, base_url only sets the Host header then
+            transport_factory (callable): returns the httpx transport for
+                (retries: int, asynchronous: bool), overrides uds
+            compression (tuple): accepted response encodings by preference
+                ("zstd", "br", "gzip", "deflate"), () disables compression
+        """
         self.headers = {
             "accept": "application/json",
+            "accept-encoding": accept_encoding(compression),
             "content-type": "application/json",
         }
         # Convert AnyUrl to string and handle trailing slash
@@ -46,9 +107,26 @@ class Client:
         self.auth0_token = auth0_token
         self.retries = retries
         self.timeout = timeout
+        self._config_cache = None
+        self._http_client = None
+        for name in coalesce:
+            if name not in ENDPOINTS or ENDPOINTS[name].method != "get":
+                raise ValueError(f'"{name}" is not a GET endpoint')
+        self.coalesce = set(coalesce)
+        self.coalesce_stats = {}
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.decoder = Decoder()
+        self.lanes = None if lanes is None else self._lanes_class(lanes)
+        self.token_store = token_store
+        self.token_min_ttl = token_min_ttl
+        self._about = None
+        self.uds = uds
+        self.transport_factory = transport_factory
+        self.transfer_stats = TransferStats()
 
     def _basic_login(self):
-        r_login = httpx.post(
+        r_login = self._get_auth_http_client().post(
             url=f"{self.base_url}/api/login",
             json={
                 "username": f"{self.username}",
@@ -71,7 +149,7 @@ class Client:
     def _auth0_login(self):
         _headers = self.headers
         _headers["authorization"] = f"Bearer {self.auth0_token}"
-        r_login = httpx.post(
+        r_login = self._get_auth_http_client().post(
             url=f"{self.base_url}/api/login",
             headers=_headers,
             # failed login delay: 5s
@@ -117,7 +195,7 @@ class Client:
         if self.refresh_token:
             _headers = self.headers
             _headers["authorization"] = f"Bearer {self.refresh_token}"
-            r_refresh_access_token = httpx.get(
+            r_refresh_access_token = self._get_auth_http_client().get(
                 url=f"{self.base_url}/api/login/refresh",
                 headers=_headers,
                 # failed login delay: 5s
@@ -131,6 +209,7 @@ class Client:
                 self._basic_login()
         else:
             self._basic_login()
+        self._store_token()
 
     def _get_headers(self):
         _headers = self.headers
@@ -139,6 +218,56 @@ class Client:
         _headers["authorization"] = f"Bearer {self.access_token}"
         return _headers
 
+    def _transport(self, retries: int, asynchronous: bool = False):
+        """httpx transport of the pooled and one-off connections."""
+        if self.transport_factory is not None:
+            return self.transport_factory(retries, asynchronous)
+        if asynchronous:
+            return httpx.AsyncHTTPTransport(retries=retries, uds=self.uds)
+        return httpx.HTTPTransport(retries=retries, uds=self.uds)
+
+    def _get_http_client(self):
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                transport=self._transport(self.retries), http2=True
+            )
+        return self._http_client
+
+    def _get_auth_http_client(self):
+        """Sync client of the login and token refresh calls."""
+        return self._get_http_client()
+
+    @property
+    def lane_stats(self) -> dict:
+        """Queue-wait metrics per lane, see `lanes.LaneStats`."""
+        return {} if self.lanes is None else self.lanes.stats
+
+    def _client_model(self, lane: str = DEFAULT):
+        return ClientModel(
+            base_url=self.base_url,
+            headers=self._get_headers(),
+            retries=self.retries,
+            timeout=self.timeout,
+            http_client=self._get_http_client(),
+            decoder=self.decoder,
+            lanes=self.lanes,
+            lane=lane,
+            transport=self._transport,
+            transfer_stats=self.transfer_stats,
+        )
+
+    def close(self):
+        """Closes the pooled connections."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def token(self):
         return Token(
             access_token=self.access_token,
@@ -146,13 +275,77 @@ class Client:
             expires_at=int(self.access_token_expires_at),
         )
 
+    def _token_key(self):
+        if self.token_store is None:
+            return None
+        return self.token_store.key(
+            self.base_url,
+            username=self.username,
+            password=self.password,
+            auth0_token=self.auth0_token,
+        )
+
+    def _set_about(self, about: About):
+        self._about = about
+        if about.version:
+            self.decoder.set_version(about.version.number)
+
+    def _store_token(self):
+        key = self._token_key()
+        if key is None or not self.access_token_expires_at:
+            return
+        self.token_store.set(
+            key,
+            {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "expires_at": self.access_token_expires_at,
+                "about": self._about and self._about.model_dump(mode="json"),
+            },
+        )
+
+    def _cached_login(self, key: str):
+        entry = self.token_store.get(key)
+        if not entry:
+            return None
+        if entry.get("about"):
+            self._set_about(About(**entry["about"]))
+        now = time.time()
+        if entry["expires_at"] - now > self.token_min_ttl:
+            self.access_token = entry["access_token"]
+            self.refresh_token = entry["refresh_token"]
+            self.access_token_expires_at = entry["expires_at"]
+            return self.token()
+        refresh_expires_at = _jwt_expires_at(entry["refresh_token"])
+        if (
+            refresh_expires_at
+            and refresh_expires_at - now > self.token_min_ttl
+        ):
+            self.refresh_token = entry["refresh_token"]
+            self._refresh_access_token()
+            return self.token()
+        return None
+
     def login(self):
-        r_about = httpx.get(url=f"{self.base_url}/api")
+        key = self._token_key()
+        if key is None:
+            return self._login()
+        # workers sharing the store wait for one login and reuse it
+        with self.token_store.lock(key):
+            token = self._cached_login(key)
+            if token is None:
+                token = self._login()
+                self._store_token()
+            return token
+
+    def _login(self):
+        r_about = self._get_auth_http_client().get(url=f"{self.base_url}/api")
         if r_about.status_code == 200:
             try:
                 about = About(**r_about.json())
             except PydanticValidationError:
                 raise HttpInvalidURL(f'"{self.base_url}/api"')
+            self._set_about(about)
             if about.auths and "localjwt" in about.auths:
                 if self.refresh_token:
                     try:
@@ -182,52 +375,222 @@ class Client:
             return Token()
         raise HTTPError(f'"{self.base_url}/api", {r_about.status_code}')
 
+    def _config_patch(self, patch, reload: bool, refresh: bool):
+        """Steps of `v3_config_patch` for the sync and async client.
+
+        Yields the (method name, kwargs) calls to make and gets their
+        results sent back, returns the result.
+        """
+        if refresh or self._config_cache is None:
+            config_saved = yield "v3_config_get", {}
+            if isinstance(config_saved, Error):
+                return config_saved
+            self._config_cache = config_dict(config_saved)
+        if isinstance(patch, BaseModel):
+            patch = config_diff(self._config_cache, patch)
+        config = config_merge_patch(self._config_cache, patch)
+        diff = config_diff(self._config_cache, config)
+        if not diff:
+            return diff
+        response = yield "v3_config_put", {"config": config}
+        if isinstance(response, Error):
+            self._config_cache = None
+            return response
+        self._config_cache = config
+        if reload:
+            yield "v3_config_reload", {}
+        return diff
+
+    def v3_config_patch(self, patch, reload: bool = True, refresh=False):
+        """Partial config update against a cached base config.
+
+        Skips `v3_config_put` and `v3_config_reload` if nothing changed.
+        Args:
+            patch (dict | Config): merge patch (RFC 7386) or full config
+            reload (bool): reload the config after a change
+            refresh (bool): fetch the base config instead of using the cache
+        Returns:
+            dict: applied merge patch, empty if nothing changed
+        """
+        steps = self._config_patch(patch, reload, refresh)
+        try:
+            name, kwargs = next(steps)
+            while True:
+                result = getattr(self, name)(**kwargs)
+                name, kwargs = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def events(self, filters: list = None, **kwargs):
+        """Subscribes to the Core event stream, yields `Event`s.
+
+        A long-lived connection replacing log and state polling,
+        reconnected and resumed after drops, see `events.events`.
+        Args:
+            filters (list): event filters, e.g. [{"event": "process"}]
+        """
+        return events(self, filters, **kwargs)
+
+    def _flight_key(self, method_name: str, kwargs: dict):
+        if method_name not in self.coalesce:
+            return None
+        key = (method_name, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _count_flight(self, method_name: str, hit: bool):
+        stats = self.coalesce_stats.setdefault(
+            method_name, {"hits": 0, "misses": 0}
+        )
+        stats["hits" if hit else "misses"] += 1
+
+    def _single_flight(self, key, call):
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            self._count_flight(key[0], hit=not leader)
+        if not leader:
+            return flight.wait()
+        try:
+            flight.result = call()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
     @classmethod
-    def _make_proxy_method(cls, function):
-        @functools.wraps(function)
+    def _make_proxy_method(cls, endpoint: Endpoint):
+        method_name = endpoint.name
+        function = endpoint.sync
+        lane = endpoint_lane(method_name)
+
         def proxy_method(self, **kwargs):
-            kwargs["client"] = ClientModel(
-                base_url=self.base_url,
-                headers=self._get_headers(),
-                retries=self.retries,
-                timeout=self.timeout,
+            key = self._flight_key(method_name, kwargs)
+            if key is None:
+                kwargs["client"] = self._client_model(lane)
+                return function(**kwargs)
+            return self._single_flight(
+                key,
+                lambda: function(client=self._client_model(lane), **kwargs),
             )
-            return function(**kwargs)
 
         return proxy_method
 
     @classmethod
-    def _add_proxy_method(cls, method_name, function):
-        proxy_method = cls._make_proxy_method(function)
-        if not hasattr(cls, method_name):
-            setattr(cls, method_name, proxy_method)
+    def _add_proxy_method(cls, endpoint: Endpoint):
+        if hasattr(cls, endpoint.name):
+            return
+        proxy_method = cls._make_proxy_method(endpoint)
+        proxy_method.__name__ = endpoint.name
+        proxy_method.__qualname__ = f"{cls.__name__}.{endpoint.name}"
+        proxy_method.__doc__ = endpoint.doc
+        proxy_method.__signature__ = endpoint.signature
+        setattr(cls, endpoint.name, proxy_method)
 
 
 class AsyncClient(Client):
+    _lanes_class = AsyncLanes
+
+    _auth_http_client = None
+    _http_client_loop = None
+
+    def _get_http_client(self):
+        # the pool is bound to an event loop, e.g. of one asyncio.run()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._http_client is None or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                transport=self._transport(self.retries, asynchronous=True)
+            )
+            self._http_client_loop = loop
+        return self._http_client
+
+    def _get_auth_http_client(self):
+        # login() and the token refresh of _get_headers() are sync
+        if self._auth_http_client is None:
+            self._auth_http_client = httpx.Client(
+                transport=self._transport(self.retries)
+            )
+        return self._auth_http_client
+
+    async def aclose(self):
+        """Closes the pooled connections."""
+        if self._http_client is not None:
+            # the connections of a former event loop are closed with it
+            if self._http_client_loop is asyncio.get_running_loop():
+                await self._http_client.aclose()
+            self._http_client = None
+        if self._auth_http_client is not None:
+            self._auth_http_client.close()
+            self._auth_http_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def v3_config_patch(self, patch, reload: bool = True, refresh=False):
+        steps = self._config_patch(patch, reload, refresh)
+        try:
+            name, kwargs = next(steps)
+            while True:
+                result = await getattr(self, name)(**kwargs)
+                name, kwargs = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    v3_config_patch.__doc__ = Client.v3_config_patch.__doc__
+
+    def events(self, filters: list = None, **kwargs):
+        return aevents(self, filters, **kwargs)
+
+    events.__doc__ = Client.events.__doc__
+
+    async def _single_flight(self, key, call):
+        task = self._flights.get(key)
+        self._count_flight(key[0], hit=task is not None)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._flights[key] = task
+
+            def done(_):
+                if self._flights.get(key) is task:
+                    del self._flights[key]
+
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
+
     @classmethod
-    def _make_proxy_method(cls, function):
-        @functools.wraps(function)
+    def _make_proxy_method(cls, endpoint: Endpoint):
+        method_name = endpoint.name
+        function = endpoint.asyncio
+        lane = endpoint_lane(method_name)
+
         async def proxy_method(self, *args, **kwargs):
-            kwargs["client"] = ClientModel(
-                base_url=self.base_url,
-                headers=self._get_headers(),
-                retries=self.retries,
-                timeout=self.timeout,
+            key = self._flight_key(method_name, kwargs)
+            if key is None or args:
+                kwargs["client"] = self._client_model(lane)
+                return await function(*args, **kwargs)
+            return await self._single_flight(
+                key,
+                lambda: function(client=self._client_model(lane), **kwargs),
             )
-            return await function(*args, **kwargs)
 
         return proxy_method
 
 
-for module_info in pkgutil.walk_packages(base.__path__):
-    module_name = f"{base.__name__}.{module_info.name}"
-    module = importlib.import_module(module_name)
-    for submodule_info in pkgutil.walk_packages(module.__path__):
-        submodule_name = f"{module_name}.{submodule_info.name}"
-        submodule = importlib.import_module(submodule_name)
-        if hasattr(submodule, "asyncio"):
-            AsyncClient._add_proxy_method(
-                submodule_info.name, submodule.asyncio
-            )
-        if hasattr(submodule, "sync"):
-            Client._add_proxy_method(submodule_info.name, submodule.sync)
+for endpoint in ENDPOINTS.values():
+    AsyncClient._add_proxy_method(endpoint)
+    Client._add_proxy_method(endpoint)
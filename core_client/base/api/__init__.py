@@ -0,0 +1,350 @@
+from ...endpoints import (
+    BYTES,
+    JSON,
+    JSON_OR_TEXT,
+    TEXT,
+    Endpoint,
+    json_body,
+    wrapped,
+)
+from ..models import About
+from ..models.v3 import (
+    ClusterNode,
+    ClusterNodeList,
+    ConfigSaved,
+    FilesystemFileList,
+    FilesystemList,
+    Log,
+    Metadata,
+    Metrics,
+    MetricsCollectionList,
+    Process,
+    ProcessConfig,
+    ProcessList,
+    ProcessProbe,
+    ProcessReport,
+    ProcessState,
+    RtmpList,
+    Session,
+    SessionActive,
+    Skills,
+    SrtList,
+    Widget,
+)
+
+
+def _metadata(value):
+    if isinstance(value, Metadata):
+        value = value.data
+    return json_body(value)
+
+
+def _command(value):
+    return json_body({"command": f"{value}"})
+
+
+_COLLECTORS_DOC = """Args:
+    collectors (str): ffmpeg, hls, hlsingress, http, rtmp, srt"""
+
+ENDPOINTS = {
+    endpoint.name: endpoint
+    for endpoint in (
+        Endpoint("about", "get", "/api", responses={200: About}),
+        Endpoint("about_get", "get", "/api", responses={200: About}),
+        Endpoint("ping", "get", "/ping", responses={200: TEXT}),
+        # cluster
+        Endpoint(
+            "v3_cluster_get_list",
+            "get",
+            "/api/v3/cluster",
+            responses={200: ClusterNodeList},
+        ),
+        Endpoint(
+            "v3_cluster_get_node",
+            "get",
+            "/api/v3/cluster/node/{id}",
+            responses={200: ClusterNode},
+        ),
+        # core issue
+        Endpoint(
+            "v3_cluster_get_node_proxy",
+            "get",
+            "/api/v3/cluster/node/{id}/proxy",
+        ),
+        Endpoint(
+            "v3_cluster_post_node",
+            "post",
+            "/api/v3/cluster/node",
+            body=("node", json_body),
+        ),
+        Endpoint(
+            "v3_cluster_put_node",
+            "put",
+            "/api/v3/cluster/node/{id}",
+            body=("node", json_body),
+        ),
+        Endpoint(
+            "v3_cluster_delete_node", "delete", "/api/v3/cluster/node/{id}"
+        ),
+        # config
+        Endpoint(
+            "v3_config_get",
+            "get",
+            "/api/v3/config",
+            responses={200: ConfigSaved},
+        ),
+        Endpoint(
+            "v3_config_put",
+            "put",
+            "/api/v3/config",
+            body=("config", json_body),
+        ),
+        Endpoint(
+            "v3_config_reload",
+            "get",
+            "/api/v3/config/reload",
+            responses={200: JSON_OR_TEXT},
+        ),
+        # filesystem
+        Endpoint(
+            "v3_fs_get_list",
+            "get",
+            "/api/v3/fs",
+            responses={200: FilesystemList},
+        ),
+        Endpoint(
+            "v3_fs_get_file_list",
+            "get",
+            "/api/v3/fs/{name}",
+            query={"glob": "", "sort": "", "order": ""},
+            responses={200: FilesystemFileList},
+            doc="""Args:
+    glob (str): glob pattern for file names
+    sort (str): none, name, size or lastmod
+    order (str): asc or desc""",
+        ),
+        Endpoint(
+            "v3_fs_get_file",
+            "get",
+            "/api/v3/fs/{name}/{path:path}",
+            responses={200: BYTES, 301: BYTES},
+        ),
+        Endpoint(
+            "v3_fs_put_file",
+            "put",
+            "/api/v3/fs/{name}/{path:path}",
+            content="data",
+            responses={201: JSON_OR_TEXT, 204: JSON_OR_TEXT},
+        ),
+        Endpoint(
+            "v3_fs_delete_file",
+            "delete",
+            "/api/v3/fs/{name}/{path:path}",
+            responses={200: JSON_OR_TEXT},
+        ),
+        # log
+        Endpoint(
+            "v3_log_get",
+            "get",
+            "/api/v3/log",
+            query={"format": "console"},
+            responses={200: Log},
+            doc="""Args:
+    format (str): console or raw""",
+        ),
+        # metadata
+        Endpoint(
+            "v3_metadata_get",
+            "get",
+            "/api/v3/metadata/{key}",
+            responses={200: wrapped(Metadata)},
+        ),
+        Endpoint(
+            "v3_metadata_put",
+            "put",
+            "/api/v3/metadata/{key}",
+            body=("data", _metadata),
+            responses={200: wrapped(Metadata)},
+        ),
+        # metrics
+        Endpoint(
+            "v3_metrics_get",
+            "get",
+            "/api/v3/metrics",
+            responses={200: wrapped(MetricsCollectionList)},
+        ),
+        Endpoint(
+            "v3_metrics_post",
+            "post",
+            "/api/v3/metrics",
+            body=("config", json_body),
+            responses={200: Metrics},
+        ),
+        Endpoint(
+            "v3_metrics",
+            "post",
+            "/api/v3/metrics",
+            body=("config", json_body),
+            responses={200: Metrics},
+        ),
+        # process
+        Endpoint(
+            "v3_process_get_list",
+            "get",
+            "/api/v3/process",
+            query={
+                "filter": "",
+                "reference": "",
+                "id": "",
+                "idpattern": "",
+                "refpattern": "",
+            },
+            responses={200: ProcessList},
+            doc="""Args:
+    filter (str): config, state, report, metadata
+    reference (str): reference value
+    id (str): Comma separated of ids
+    idpattern (str): Glob pattern for ids
+    refpattern (str): Glob pattern for references""",
+        ),
+        Endpoint(
+            "v3_process_post",
+            "post",
+            "/api/v3/process",
+            body=("config", json_body),
+            responses={200: ProcessConfig},
+        ),
+        Endpoint(
+            "v3_process_get",
+            "get",
+            "/api/v3/process/{id}",
+            query={"filter": ""},
+            responses={200: Process},
+            doc="""Args:
+    filter (str): config, state, report, metadata""",
+        ),
+        Endpoint(
+            "v3_process_put",
+            "put",
+            "/api/v3/process/{id}",
+            body=("config", json_body),
+            responses={200: ProcessConfig},
+        ),
+        Endpoint("v3_process_delete", "delete", "/api/v3/process/{id}"),
+        Endpoint(
+            "v3_process_put_command",
+            "put",
+            "/api/v3/process/{id}/command",
+            body=("command", _command),
+        ),
+        Endpoint(
+            "v3_process_get_config",
+            "get",
+            "/api/v3/process/{id}/config",
+            responses={200: ProcessConfig},
+        ),
+        Endpoint(
+            "v3_process_get_state",
+            "get",
+            "/api/v3/process/{id}/state",
+            responses={200: ProcessState},
+        ),
+        Endpoint(
+            "v3_process_get_report",
+            "get",
+            "/api/v3/process/{id}/report",
+            responses={200: ProcessReport},
+        ),
+        Endpoint(
+            "v3_process_get_probe",
+            "get",
+            "/api/v3/process/{id}/probe",
+            responses={200: ProcessProbe},
+        ),
+        Endpoint(
+            "v3_process_get_metadata",
+            "get",
+            "/api/v3/process/{id}/metadata/{key}",
+            responses={200: wrapped(Metadata)},
+        ),
+        Endpoint(
+            "v3_process_put_metadata",
+            "put",
+            "/api/v3/process/{id}/metadata/{key}",
+            body=("data", _metadata),
+            responses={200: wrapped(Metadata)},
+        ),
+        # playout
+        Endpoint(
+            "v3_process_get_playout_input_status",
+            "get",
+            "/api/v3/process/{id}/playout/{input_id}/status",
+        ),
+        Endpoint(
+            "v3_process_get_playout_input_keyframe",
+            "get",
+            "/api/v3/process/{id}/playout/{input_id}/keyframe/{input_name}",
+            responses={200: BYTES},
+        ),
+        Endpoint(
+            "v3_process_get_playout_input_reopen",
+            "get",
+            "/api/v3/process/{id}/playout/{input_id}/reopen",
+        ),
+        Endpoint(
+            "v3_process_get_playout_input_errorframe_encode",
+            "get",
+            "/api/v3/process/{id}/playout/{input_id}/errorframe/encode",
+        ),
+        Endpoint(
+            "v3_process_post_playout_input_errorframe_name",
+            "post",
+            "/api/v3/process/{id}/playout/{input_id}/errorframe/{input_name}",
+        ),
+        Endpoint(
+            "v3_process_put_playout_input_stream",
+            "get",
+            "/api/v3/process/{id}/playout/{input_id}/stream",
+        ),
+        # rtmp, srt
+        Endpoint(
+            "v3_rtmp_get", "get", "/api/v3/rtmp", responses={200: RtmpList}
+        ),
+        # list[Srt] will be rebased to SrtList
+        Endpoint("v3_srt_get", "get", "/api/v3/srt", responses={200: SrtList}),
+        # session
+        Endpoint(
+            "v3_session_get",
+            "get",
+            "/api/v3/session",
+            query={"collectors": ...},
+            responses={200: Session},
+            doc=_COLLECTORS_DOC,
+        ),
+        Endpoint(
+            "v3_session_get_active",
+            "get",
+            "/api/v3/session/active",
+            query={"collectors": ...},
+            responses={200: SessionActive},
+            doc=_COLLECTORS_DOC,
+        ),
+        # skills
+        Endpoint(
+            "v3_skills_get", "get", "/api/v3/skills", responses={200: Skills}
+        ),
+        Endpoint(
+            "v3_skills_reload",
+            "get",
+            "/api/v3/skills/reload",
+            responses={200: Skills},
+        ),
+        # widget
+        Endpoint(
+            "v3_widget_get_process",
+            "get",
+            "/api/v3/widget/process/{id}",
+            responses={200: Widget},
+        ),
+    )
+}
@@ -0,0 +1,28 @@
+import warnings
+
+from . import ENDPOINTS
+
+
+def exports(module: str):
+    """Functions of a former API module, backed by its `Endpoint`.
+
+    The modules `core_client.base.api.<name>` are kept for imports like
+    `from core_client.base.api.v3_process_get import sync` and will be
+    removed in the next major version.
+    Returns:
+        tuple: _build_request, _build_response, sync and asyncio
+    """
+    name = module.rpartition(".")[2]
+    warnings.warn(
+        f"{module} is deprecated, use Client.{name} or "
+        f'core_client.base.api.ENDPOINTS["{name}"]',
+        DeprecationWarning,
+        stacklevel=3,
+    )
+    endpoint = ENDPOINTS[name]
+    return (
+        endpoint._build_request,
+        endpoint._build_response,
+        endpoint.sync,
+        endpoint.asyncio,
+    )
@@ -1,50 +1,5 @@
-import httpx
-from pydantic import TypeAdapter
+"""Deprecated, use the client method of the same name."""
 
-from ...models import Client
-from ..models import Error
-from ..models.v3 import ClusterNodeList
+from ._compat import exports
 
-
-def _build_request(
-    client: Client,
-    retries: int = None,
-    timeout: float = None,
-):
-    if not retries:
-        retries = client.retries
-    if not timeout:
-        timeout = client.timeout
-    return {
-        "method": "get",
-        "url": f"{client.base_url}/api/v3/cluster",
-        "headers": client.headers,
-        "timeout": timeout,
-        "data": None,
-        "json": None,
-    }, retries
-
-
-def _build_response(response: httpx.Response):
-    if response.status_code == 200:
-        response_200 = TypeAdapter(ClusterNodeList).validate_python(response.json(), from_attributes=True)
-        return response_200
-    else:
-        response_error = TypeAdapter(Error).validate_python(response.json(), from_attributes=True)
-        return response_error
-
-
-def sync(client: Client, **kwargs):
-    request, retries = _build_request(client, **kwargs)
-    transport = httpx.HTTPTransport(retries=retries)
-    httpx_client = httpx.Client(transport=transport, http2=True)
-    response = httpx_client.request(**request)
-    return _build_response(response=response)
-
-
-async def asyncio(client: Client, **kwargs):
-    request, retries = _build_request(client, **kwargs)
-    transport = httpx.AsyncHTTPTransport(retries=retries)
-    async with httpx.AsyncClient(transport=transport) as httpx_client:
-        response = await httpx_client.request(**request)
-    return _build_response(response=response)
+_build_request, _build_response, sync, asyncio = exports(__name__)
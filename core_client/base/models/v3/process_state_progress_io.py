@@ -37,27 +37,27 @@ class ProcessStateProgressIO(BaseModel):
     """
 
     address: str
-    avstream: Optional[ProcessStateProgressIOAvstream]
+    avstream: Optional[ProcessStateProgressIOAvstream] = None
     bitrate_kbit: float
-    channels: Optional[int]
+    channels: Optional[int] = None
     codec: str
     coder: str
     format: str
     fps: float
     frame: float
-    height: Optional[int]
+    height: Optional[int] = None
     id: str
     index: int
-    layout: Optional[str]
+    layout: Optional[str] = None
     packet: float
-    pix_fmt: Optional[str]
+    pix_fmt: Optional[str] = None
     pps: float
     q: float
-    sampling_hz: Optional[float]
+    sampling_hz: Optional[float] = None
     size_kb: float
     stream: int
     type: str
-    width: Optional[int]
+    width: Optional[int] = None
 
     @model_validator(mode='before')
     @classmethod
@@ -16,9 +16,9 @@ class SessionActive(BaseModel):
     }
     """
 
-    ffmpeg: Optional[list[SessionCollectorActiveSession]]
-    hls: Optional[list[SessionCollectorActiveSession]]
-    hlsingress: Optional[list[SessionCollectorActiveSession]]
-    http: Optional[list[SessionCollectorActiveSession]]
-    rtmp: Optional[list[SessionCollectorActiveSession]]
-    srt: Optional[list[SessionCollectorActiveSession]]
+    ffmpeg: Optional[list[SessionCollectorActiveSession]] = None
+    hls: Optional[list[SessionCollectorActiveSession]] = None
+    hlsingress: Optional[list[SessionCollectorActiveSession]] = None
+    http: Optional[list[SessionCollectorActiveSession]] = None
+    rtmp: Optional[list[SessionCollectorActiveSession]] = None
+    srt: Optional[list[SessionCollectorActiveSession]] = None
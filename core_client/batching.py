@@ -0,0 +1,114 @@
+import asyncio
+from urllib.parse import quote
+
+from .base.models import Error
+
+# keeps the request line well below common proxy limits (8k)
+MAX_URL_LENGTH = 4000
+
+
+def id_chunks(base_url: str, ids, filter: str, max_url_length: int):
+    """Splits ids into `v3_process_get_list(id=...)` batches that keep
+    the request URL below `max_url_length`."""
+    base_length = len(f"{base_url}/api/v3/process?filter={filter}&id=")
+    chunk = []
+    length = base_length
+    for id in ids:
+        # ids are URL-encoded, e.g. ":" as "%3A"
+        id_length = len(quote(id, safe=","))
+        if chunk and length + id_length + 1 > max_url_length:
+            yield chunk
+            chunk = []
+            length = base_length
+        chunk.append(id)
+        length += id_length + 1
+    if chunk:
+        yield chunk
+
+
+class ProcessBatcher:
+    def __init__(
+        self,
+        client,
+        window: float = 0.0,
+        max_url_length: int = MAX_URL_LENGTH,
+    ):
+        """Batches concurrent `v3_process_get` calls (DataLoader like).
+
+        Calls of the same event loop tick (or within `window` seconds) are
+        sent as one `v3_process_get_list(id=...)` per filter, split into
+        chunks that keep the URL below `max_url_length`.
+        Args:
+            client (AsyncClient): logged in client
+            window (float): seconds to collect calls, 0 for one loop tick
+            max_url_length (int): max. length of a batch request URL
+        """
+        self.client = client
+        self.window = window
+        self.max_url_length = max_url_length
+        self.requests = 0
+        self.calls = 0
+        self._pending = {}
+        self._handle = None
+        self._tasks = set()
+
+    async def v3_process_get(self, id: str, filter: str = ""):
+        """Same result as `AsyncClient.v3_process_get`."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(filter, {}).setdefault(id, []).append(future)
+        self.calls += 1
+        if self._handle is None:
+            if self.window:
+                self._handle = loop.call_later(self.window, self._dispatch)
+            else:
+                self._handle = loop.call_soon(self._dispatch)
+        return await future
+
+    def _chunks(self, ids, filter: str):
+        return id_chunks(
+            self.client.base_url, ids, filter, self.max_url_length
+        )
+
+    def _dispatch(self):
+        self._handle = None
+        pending, self._pending = self._pending, {}
+        for filter, futures in pending.items():
+            for chunk in self._chunks(list(futures), filter):
+                task = asyncio.ensure_future(
+                    self._load(
+                        chunk, filter, {id: futures[id] for id in chunk}
+                    )
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, ids, filter: str, futures: dict):
+        self.requests += 1
+        try:
+            response = await self.client.v3_process_get_list(
+                id=",".join(ids), filter=filter
+            )
+        except Exception as exc:
+            for id in ids:
+                for future in futures[id]:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        if isinstance(response, Error):
+            processes = {}
+        else:
+            processes = {process.id: process for process in response}
+        for id in ids:
+            result = processes.get(id)
+            if result is None:
+                result = (
+                    response
+                    if isinstance(response, Error)
+                    else Error(
+                        code=404, message="Unknown process ID", details=[]
+                    )
+                )
+            for future in futures[id]:
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,290 @@
+import asyncio
+import functools
+import threading
+import time
+
+from .base.models import Error
+
+# process calls that are not bound to a single process id
+_UNROUTED = ("v3_process_get_list", "v3_process_post")
+
+
+def _is_not_found(response):
+    return isinstance(response, Error) and response.code == 404
+
+
+class _ClusterRouter:
+    def __init__(
+        self,
+        client,
+        node_state: str = "connected",
+        stale_seconds: int = None,
+        refresh_interval: float = 10.0,
+    ):
+        """Routes process calls to the cluster node owning the process.
+
+        Args:
+            client (Client | AsyncClient): logged in client of any node,
+                also used for all non-process calls
+            node_state (str): ClusterNode.state of usable nodes
+            stale_seconds (int): skip nodes with an older last_update
+            refresh_interval (float): background node refresh in seconds
+        """
+        self.client = client
+        self.node_state = node_state
+        self.stale_seconds = stale_seconds
+        self.refresh_interval = refresh_interval
+        self.nodes = {}
+        self.node_clients = {}
+        self.processes = {}
+
+    def _node_is_usable(self, node, now: float):
+        if node.state != self.node_state:
+            return False
+        if self.stale_seconds is None:
+            return True
+        return now - node.last_update <= self.stale_seconds
+
+    def _update_nodes(self, node_list):
+        """Returns clients of new nodes, drops clients of gone nodes."""
+        if isinstance(node_list, Error):
+            return {}, []
+        now = time.time()
+        nodes = {
+            node.id: node
+            for node in node_list
+            if self._node_is_usable(node, now)
+        }
+        added = {}
+        for node_id, node in nodes.items():
+            known = self.nodes.get(node_id)
+            if known is None or known.address != node.address:
+                added[node_id] = self.client.__class__(
+                    base_url=node.address,
+                    username=self.client.username,
+                    password=self.client.password,
+                    access_token=self.client.access_token,
+                    auth0_token=self.client.auth0_token,
+                    retries=self.client.retries,
+                    timeout=self.client.timeout,
+                    token_store=self.client.token_store,
+                    transport_factory=self.client.transport_factory,
+                )
+        removed = [
+            self.node_clients[node_id]
+            for node_id in self.node_clients
+            if node_id not in nodes or node_id in added
+        ]
+        node_clients = {
+            node_id: node_client
+            for node_id, node_client in self.node_clients.items()
+            if node_id in nodes and node_id not in added
+        }
+        node_clients.update(added)
+        self.nodes = nodes
+        self.node_clients = node_clients
+        self.processes = {
+            process_id: node_id
+            for process_id, node_id in self.processes.items()
+            if node_id in node_clients
+        }
+        return added, removed
+
+    def _remember(self, node_id, process_list):
+        if not isinstance(process_list, Error):
+            for process in process_list:
+                self.processes[process.id] = node_id
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        if name.startswith("v3_process_") and name not in _UNROUTED:
+            return functools.partial(self._call, name)
+        return getattr(self.client, name)
+
+
+class ClusterClient(_ClusterRouter):
+    """Cluster aware `Client`, see `_ClusterRouter` for the arguments.
+
+    Keeps one pooled client per node and caches the process id -> node
+    mapping. A 404 from the cached node invalidates the entry.
+    """
+
+    _thread = None
+
+    def refresh(self):
+        """Discovers the cluster nodes via `v3_cluster_get_list`."""
+        added, removed = self._update_nodes(self.client.v3_cluster_get_list())
+        for node_client in added.values():
+            node_client.login()
+        for node_client in removed:
+            node_client.close()
+        return self.nodes
+
+    def start(self):
+        """Refreshes the nodes in a background thread."""
+        if self._thread is None:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                continue
+
+    def close(self):
+        self.stop()
+        for node_client in self.node_clients.values():
+            node_client.close()
+        self.client.close()
+
+    def _locate(self, id: str):
+        for node_id, node_client in list(self.node_clients.items()):
+            response = node_client.v3_process_get(id=id, filter="metadata")
+            if not isinstance(response, Error):
+                self.processes[id] = node_id
+                return node_id
+        return None
+
+    def _call(self, name: str, **kwargs):
+        node_id = self.processes.get(kwargs["id"])
+        if node_id is None:
+            node_id = self._locate(kwargs["id"])
+        node_client = self.node_clients.get(node_id, self.client)
+        response = getattr(node_client, name)(**kwargs)
+        if _is_not_found(response) and node_id is not None:
+            self.processes.pop(kwargs["id"], None)
+            node_id = self._locate(kwargs["id"])
+            if node_id is not None:
+                response = getattr(self.node_clients[node_id], name)(**kwargs)
+        return response
+
+    def v3_process_get_list(self, **kwargs):
+        """Merged process list of all nodes."""
+        if not self.node_clients:
+            return self.client.v3_process_get_list(**kwargs)
+        processes = []
+        for node_id, node_client in list(self.node_clients.items()):
+            process_list = node_client.v3_process_get_list(**kwargs)
+            self._remember(node_id, process_list)
+            if not isinstance(process_list, Error):
+                processes.extend(process_list)
+        return processes
+
+    def v3_process_post(self, node_id: str = None, **kwargs):
+        """Creates the process on `node_id` or the node of `client`."""
+        node_client = self.node_clients.get(node_id, self.client)
+        response = node_client.v3_process_post(**kwargs)
+        if node_id in self.node_clients and not isinstance(response, Error):
+            self.processes[response.id] = node_id
+        return response
+
+
+class AsyncClusterClient(_ClusterRouter):
+    """Cluster aware `AsyncClient`, see `ClusterClient`."""
+
+    _task = None
+
+    async def refresh(self):
+        node_list = await self.client.v3_cluster_get_list()
+        added, removed = self._update_nodes(node_list)
+        # login() is sync, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(None, node_client.login)
+                for node_client in added.values()
+            )
+        )
+        for node_client in removed:
+            await node_client.aclose()
+        return self.nodes
+
+    def start(self):
+        """Refreshes the nodes in a background task."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                continue
+
+    async def aclose(self):
+        await self.stop()
+        for node_client in self.node_clients.values():
+            await node_client.aclose()
+        await self.client.aclose()
+
+    async def _locate(self, id: str):
+        node_items = list(self.node_clients.items())
+        responses = await asyncio.gather(
+            *(
+                node_client.v3_process_get(id=id, filter="metadata")
+                for _, node_client in node_items
+            )
+        )
+        for (node_id, _), response in zip(node_items, responses):
+            if not isinstance(response, Error):
+                self.processes[id] = node_id
+                return node_id
+        return None
+
+    async def _call(self, name: str, **kwargs):
+        node_id = self.processes.get(kwargs["id"])
+        if node_id is None:
+            node_id = await self._locate(kwargs["id"])
+        node_client = self.node_clients.get(node_id, self.client)
+        response = await getattr(node_client, name)(**kwargs)
+        if _is_not_found(response) and node_id is not None:
+            self.processes.pop(kwargs["id"], None)
+            node_id = await self._locate(kwargs["id"])
+            if node_id is not None:
+                node_client = self.node_clients[node_id]
+                response = await getattr(node_client, name)(**kwargs)
+        return response
+
+    async def v3_process_get_list(self, **kwargs):
+        if not self.node_clients:
+            return await self.client.v3_process_get_list(**kwargs)
+        node_items = list(self.node_clients.items())
+        process_lists = await asyncio.gather(
+            *(
+                node_client.v3_process_get_list(**kwargs)
+                for _, node_client in node_items
+            )
+        )
+        processes = []
+        for (node_id, _), process_list in zip(node_items, process_lists):
+            self._remember(node_id, process_list)
+            if not isinstance(process_list, Error):
+                processes.extend(process_list)
+        return processes
+
+    async def v3_process_post(self, node_id: str = None, **kwargs):
+        node_client = self.node_clients.get(node_id, self.client)
+        response = await node_client.v3_process_post(**kwargs)
+        if node_id in self.node_clients and not isinstance(response, Error):
+            self.processes[response.id] = node_id
+        return response
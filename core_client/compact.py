@@ -0,0 +1,223 @@
+import math
+import sys
+import typing
+from array import array
+
+from .base.models.v3 import ProcessStateProgress, ProcessStateProgressIO
+
+# typed array None markers, JSON has no NaN
+_INT_NONE = -(2**63)
+_FLOAT_NONE = math.nan
+
+
+def _kind(annotation):
+    """Column type of a field: "str", "float", "int" or "object"."""
+    args = [
+        arg
+        for arg in typing.get_args(annotation) or [annotation]
+        if arg is not type(None)
+    ]
+    if len(args) == 1 and args[0] in (str, float, int):
+        return args[0].__name__
+    return "object"
+
+
+class _Table:
+    """Column store of one model, strings are dictionary encoded into the
+    shared `strings` table, numbers are kept in typed arrays."""
+
+    def __init__(self, model, strings, exclude=()):
+        self.model = model
+        self.strings = strings
+        self.columns = {}
+        for name, field in model.model_fields.items():
+            if name in exclude:
+                continue
+            kind = _kind(field.annotation)
+            if kind == "str":
+                column = array("I")
+            elif kind == "float":
+                column = array("d")
+            elif kind == "int":
+                column = array("q")
+            else:
+                column = []
+            self.columns[name] = (kind, column)
+        self.free = []
+        self.size = 0
+
+    def allocate(self) -> int:
+        if self.free:
+            return self.free.pop()
+        for kind, column in self.columns.values():
+            column.append(None if kind == "object" else 0)
+        self.size += 1
+        return self.size - 1
+
+    def set(self, row: int, values):
+        for name, (kind, column) in self.columns.items():
+            value = getattr(values, name)
+            if kind == "str":
+                value = self.strings.encode(value)
+                self.strings.release(column[row])
+            elif value is None:
+                if kind == "float":
+                    value = _FLOAT_NONE
+                elif kind == "int":
+                    value = _INT_NONE
+            column[row] = value
+
+    def get(self, row: int) -> dict:
+        values = {}
+        for name, (kind, column) in self.columns.items():
+            value = column[row]
+            if kind == "str":
+                value = self.strings.values[value]
+            elif kind == "float" and value != value:
+                value = None
+            elif kind == "int" and value == _INT_NONE:
+                value = None
+            values[name] = value
+        return values
+
+    def release(self, row: int):
+        for kind, column in self.columns.values():
+            if kind == "object":
+                column[row] = None
+            elif kind == "str":
+                self.strings.release(column[row])
+                column[row] = 0
+        self.free.append(row)
+
+    def nbytes(self) -> int:
+        size = 0
+        for kind, column in self.columns.values():
+            if kind == "object":
+                size += sys.getsizeof(column)
+            else:
+                size += column.itemsize * len(column)
+        return size
+
+
+class _Strings:
+    """Interned strings, code 0 is None.
+
+    Codes are reference counted by the stored rows, so the table only
+    holds the strings in use, e.g. not every address a process had.
+    """
+
+    def __init__(self):
+        self.values = [None]
+        self.codes = {None: 0}
+        self.counts = [0]
+        self.free = []
+
+    def __len__(self):
+        return len(self.codes) - 1
+
+    def encode(self, value) -> int:
+        """Code of a stored value, `release` it when it is replaced."""
+        code = self.codes.get(value)
+        if code is None:
+            if self.free:
+                code = self.free.pop()
+                self.values[code] = value
+            else:
+                code = len(self.values)
+                self.values.append(value)
+                self.counts.append(0)
+            self.codes[value] = code
+        if code:
+            self.counts[code] += 1
+        return code
+
+    def release(self, code: int):
+        if not code:
+            return
+        self.counts[code] -= 1
+        if self.counts[code] == 0:
+            del self.codes[self.values[code]]
+            self.values[code] = None
+            self.free.append(code)
+
+
+class ProgressStore:
+    """Compact in-memory store of `ProcessStateProgress` per process id.
+
+    Low-cardinality strings (codec, coder, format, type, pix_fmt, layout,
+    address, ...) are dictionary encoded, numbers are kept in typed
+    arrays. Rows are updated in place, so a long-lived cache of fleet
+    state does not grow with the number of polls.
+    """
+
+    def __init__(self):
+        self.strings = _Strings()
+        self._progress = _Table(
+            ProcessStateProgress, self.strings, exclude=("inputs", "outputs")
+        )
+        self._ios = _Table(ProcessStateProgressIO, self.strings)
+        # process id -> (progress row, input rows, output rows)
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, id: str):
+        return id in self._rows
+
+    def ids(self):
+        return self._rows.keys()
+
+    def update(self, id: str, progress: ProcessStateProgress):
+        """Stores the progress of a process, replacing the previous one."""
+        rows = self._rows.get(id)
+        if rows is None or (
+            len(rows[1]) != len(progress.inputs)
+            or len(rows[2]) != len(progress.outputs)
+        ):
+            self.remove(id)
+            rows = (
+                self._progress.allocate(),
+                [self._ios.allocate() for _ in progress.inputs],
+                [self._ios.allocate() for _ in progress.outputs],
+            )
+            self._rows[id] = rows
+        self._progress.set(rows[0], progress)
+        for row, io in zip(rows[1], progress.inputs):
+            self._ios.set(row, io)
+        for row, io in zip(rows[2], progress.outputs):
+            self._ios.set(row, io)
+
+    def update_processes(self, processes):
+        """Stores the progress of a `ProcessList`, filter "state"."""
+        for process in processes:
+            if process.state is not None and process.state.progress:
+                self.update(process.id, process.state.progress)
+
+    def get(self, id: str) -> ProcessStateProgress:
+        """The stored progress as model, KeyError for unknown ids."""
+        progress_row, input_rows, output_rows = self._rows[id]
+        return ProcessStateProgress.model_construct(
+            inputs=[self._io(row) for row in input_rows],
+            outputs=[self._io(row) for row in output_rows],
+            **self._progress.get(progress_row),
+        )
+
+    def _io(self, row: int):
+        return ProcessStateProgressIO.model_construct(**self._ios.get(row))
+
+    def remove(self, id: str):
+        rows = self._rows.pop(id, None)
+        if rows is None:
+            return
+        self._progress.release(rows[0])
+        for row in rows[1] + rows[2]:
+            self._ios.release(row)
+
+    def nbytes(self) -> int:
+        """Approx. size of the columns and the string table."""
+        return (
+            self._progress.nbytes()
+            + self._ios.nbytes()
+            + sum(sys.getsizeof(value) for value in self.strings.values)
+        )
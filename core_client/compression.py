@@ -0,0 +1,80 @@
+import threading
+
+# the optional decoder packages, imported as by httpx
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# content-encodings httpx can decode (br: brotli, zstd: zstandard, both
+# decoded by httpx>=0.27 when the package is installed)
+ENCODINGS = ("zstd", "br", "gzip", "deflate")
+_DECODERS = {
+    "zstd": zstandard is not None,
+    "br": brotli is not None,
+    "gzip": True,
+    "deflate": True,
+}
+DEFAULT_ENCODINGS = ("zstd", "br", "gzip")
+
+
+def accept_encoding(compression: tuple) -> str:
+    """accept-encoding header of the preferred encodings.
+
+    Encodings without an installed decoder are skipped, the order sets
+    the q-values, no encodings ("identity") disables compression.
+    """
+    for encoding in compression:
+        if encoding not in ENCODINGS:
+            raise ValueError(f'unknown encoding "{encoding}"')
+    encodings = [encoding for encoding in compression if _DECODERS[encoding]]
+    if not encodings:
+        return "identity"
+    return ", ".join(
+        encoding if n == 0 else f"{encoding};q={1 - n / 10:.1f}"
+        for n, encoding in enumerate(encodings)
+    )
+
+
+class TransferStats:
+    """Response bytes on the wire vs. decoded, per client."""
+
+    __slots__ = ("responses", "wire_bytes", "body_bytes", "encodings", "_lock")
+
+    def __init__(self):
+        self.responses = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        # content-encoding -> responses
+        self.encodings = {}
+        self._lock = threading.Lock()
+
+    def record(self, encoding: str, wire_bytes: int, body_bytes: int):
+        with self._lock:
+            self.responses += 1
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.body_bytes - self.wire_bytes
+
+    @property
+    def ratio(self) -> float:
+        """Decoded / wire bytes, 1.0 without compression."""
+        return self.body_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def __repr__(self):
+        return (
+            f"TransferStats(responses={self.responses}, "
+            f"wire_bytes={self.wire_bytes}, body_bytes={self.body_bytes}, "
+            f"ratio={self.ratio:.2f}, encodings={self.encodings})"
+        )
@@ -0,0 +1,74 @@
+import copy
+from pydantic import BaseModel
+
+from .base.models.v3 import ConfigSaved
+
+
+def config_dict(config):
+    """Returns a plain dict copy of a Config, ConfigSaved or raw dict."""
+    if isinstance(config, ConfigSaved):
+        config = config.config
+    if isinstance(config, BaseModel):
+        return config.model_dump()
+    if config is None:
+        return {}
+    return copy.deepcopy(config)
+
+
+def config_diff(old, new):
+    """Structural diff of two configs as a JSON merge patch (RFC 7386).
+
+    Args:
+        old (Config | ConfigSaved | dict): current config
+        new (Config | ConfigSaved | dict): desired config
+
+    Returns:
+        dict: patch that turns `old` into `new`, empty if both are equal.
+        Removed keys are set to None, lists are replaced as a whole. A
+        missing key equals a None value.
+    """
+    return _diff(config_dict(old), config_dict(new))
+
+
+def _diff(old: dict, new: dict):
+    patch = {}
+    for key in old.keys() - new.keys():
+        if old[key] is not None:
+            patch[key] = None
+    for key, value in new.items():
+        if key not in old:
+            if value is not None:
+                patch[key] = copy.deepcopy(value)
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_patch = _diff(old[key], value)
+            if sub_patch:
+                patch[key] = sub_patch
+        elif value != old[key]:
+            patch[key] = copy.deepcopy(value)
+    return patch
+
+
+def config_merge_patch(base, patch: dict):
+    """Applies a JSON merge patch (RFC 7386) to a config.
+
+    Args:
+        base (Config | ConfigSaved | dict): config to patch, left untouched
+        patch (dict): partial config, None values remove keys
+
+    Returns:
+        dict: the patched config
+    """
+    return _merge(config_dict(base), patch)
+
+
+def _merge(target, patch):
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    if not isinstance(target, dict):
+        target = {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = _merge(target.get(key), value)
+    return target
@@ -0,0 +1,45 @@
+import functools
+from pydantic import TypeAdapter
+
+from .versions import epoch, parse_version, public, specialize
+
+
+@functools.lru_cache(maxsize=None)
+def adapter(model) -> TypeAdapter:
+    """Cached TypeAdapter, building one per response is costly."""
+    return TypeAdapter(model)
+
+
+class Decoder:
+    """Decodes response data into the models of the Core version.
+
+    The JSON bytes are validated by pydantic-core in one pass, with the
+    cached adapter of the model. Specialized models are returned as
+    instances of the public models.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._epoch = None
+
+    def set_version(self, number: str):
+        """Selects the models specialized for the Core version (About)."""
+        self.version = parse_version(number)
+        self._epoch = epoch(self.version)
+
+    def __call__(self, model, content: bytes):
+        specialized = specialize(model, self._epoch)
+        value = adapter(specialized).validate_json(content)
+        if specialized is model:
+            return value
+        # responses are instances of the public models
+        return public(value)
+
+
+_decoder = Decoder()
+
+
+def decode(client, model, content: bytes):
+    """Decodes a JSON response body with the decoder of the ClientModel."""
+    decoder = getattr(client, "decoder", None) or _decoder
+    return decoder(model, content)
@@ -0,0 +1,234 @@
+import functools
+import inspect
+import re
+from urllib.parse import quote
+
+import httpx
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .base.models import Error
+from .decoding import adapter, decode
+from .models import Client
+from .transport import send, asend
+
+# "{name}" is one path segment, "{name:path}" may contain slashes
+_PARAM = re.compile(r"{(\w+)(:path)?}")
+_REQUIRED = inspect.Parameter.empty
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote(value: str, safe: str) -> str:
+    # ids repeat across calls and quote() is slow
+    return quote(value, safe)
+
+
+def JSON(response: httpx.Response, client: Client):
+    return response.json()
+
+
+def TEXT(response: httpx.Response, client: Client):
+    return response.text
+
+
+def BYTES(response: httpx.Response, client: Client):
+    return response.content
+
+
+def JSON_OR_TEXT(response: httpx.Response, client: Client):
+    content_type = response.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        return response.json()
+    return response.text
+
+
+def wrapped(model):
+    """Response handler of a bare JSON value validated as `model.data`."""
+
+    def build(response: httpx.Response, client: Client):
+        return adapter(model).validate_python({"data": response.json()}).data
+
+    return build
+
+
+def _model(model):
+    def build(response: httpx.Response, client: Client):
+        return decode(client, model, response.content)
+
+    return build
+
+
+def json_body(value, exclude_none: bool = False) -> bytes:
+    """JSON body of a model or of a JSON value.
+
+    Models are serialized by pydantic-core straight to bytes, without a
+    `model_dump()` dict that httpx would encode again. None fields are
+    sent as null, Core clears a field on an explicit null, unless
+    `exclude_none` is set.
+    """
+    if isinstance(value, BaseModel):
+        return adapter(type(value)).dump_json(value, exclude_none=exclude_none)
+    return to_json(value)
+
+
+def _error(response: httpx.Response):
+    return adapter(Error).validate_python(
+        response.json(), from_attributes=True
+    )
+
+
+class Endpoint:
+    """Declarative spec of a Core API call, see `core_client.base.api`.
+
+    The path template and the query are compiled once, path parameters
+    are URL-encoded, empty query parameters ("" or None) are omitted.
+    Args:
+        name (str): client method name
+        method (str): HTTP method
+        path (str): path template, e.g. "/api/v3/process/{id}"
+        query (dict): query parameter defaults, `...` for required ones
+        body (tuple): (parameter, encoder to JSON bytes) of the body
+        content (str): parameter of the raw body
+        responses (dict): status -> model or handler(response, client),
+            other statuses are decoded as `Error`
+        doc (str): Args of the method docstring
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        query: dict = None,
+        body: tuple = None,
+        content: str = None,
+        responses: dict = None,
+        doc: str = None,
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.content = content
+        self.doc = f"{method.upper()} {path}"
+        if doc:
+            self.doc += f"\n\n{doc}"
+        self.responses = {
+            status: _model(handler) if isinstance(handler, type) else handler
+            for status, handler in (responses or {200: JSON}).items()
+        }
+
+        self._template = _PARAM.sub("{}", path)
+        self._path = tuple(
+            (name, "/" if kind else "") for name, kind in _PARAM.findall(path)
+        )
+        query = query or {}
+        self._query = tuple(
+            (name, f"{name}=", default) for name, default in query.items()
+        )
+        parameters = [name for name, _ in self._path]
+        if body is not None:
+            parameters.append(body[0])
+        if content is not None:
+            parameters.append(content)
+        self._names = frozenset(parameters) | query.keys()
+
+        parameters = [
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY)
+            for name in parameters
+        ]
+        parameters += [
+            inspect.Parameter(
+                name,
+                inspect.Parameter.KEYWORD_ONLY,
+                default=_REQUIRED if default is ... else default,
+            )
+            for name, default in query.items()
+        ]
+        parameters += [
+            inspect.Parameter(
+                name, inspect.Parameter.KEYWORD_ONLY, default=None
+            )
+            for name in ("retries", "timeout")
+        ]
+        self.signature = inspect.Signature(
+            [
+                inspect.Parameter(
+                    "self", inspect.Parameter.POSITIONAL_OR_KEYWORD
+                ),
+                *parameters,
+            ]
+        )
+
+    def __repr__(self):
+        return f"Endpoint({self.name!r}, {self.method!r}, {self.path!r})"
+
+    def _missing(self, name: str):
+        return TypeError(
+            f"{self.name}() missing required keyword argument '{name}'"
+        )
+
+    def _build_request(
+        self,
+        client: Client,
+        retries: int = None,
+        timeout: float = None,
+        **kwargs,
+    ):
+        if not self._names.issuperset(kwargs):
+            raise TypeError(
+                f"{self.name}() got an unexpected keyword argument "
+                f"'{min(kwargs.keys() - self._names)}'"
+            )
+        if not retries:
+            retries = client.retries
+        if not timeout:
+            timeout = client.timeout
+        try:
+            path = [
+                _quote(str(kwargs[name]), safe) for name, safe in self._path
+            ]
+        except KeyError as e:
+            raise self._missing(e.args[0]) from None
+        url = client.base_url + self._template.format(*path)
+        query = []
+        for name, prefix, default in self._query:
+            value = kwargs.get(name, default)
+            if value is None or value == "":
+                continue
+            if value is ...:
+                raise self._missing(name)
+            query.append(prefix + _quote(str(value), ","))
+        if query:
+            url += "?" + "&".join(query)
+        request = {
+            "method": self.method,
+            "url": url,
+            "headers": client.headers,
+            "timeout": timeout,
+        }
+        try:
+            if self.body is not None:
+                name, encode = self.body
+                request["content"] = encode(kwargs[name])
+            elif self.content is not None:
+                request["content"] = kwargs[self.content]
+        except KeyError as e:
+            raise self._missing(e.args[0]) from None
+        return request, retries
+
+    def _build_response(self, response: httpx.Response, client: Client = None):
+        handler = self.responses.get(response.status_code)
+        if handler is None:
+            return _error(response)
+        return handler(response, client)
+
+    def sync(self, client: Client, **kwargs):
+        request, retries = self._build_request(client, **kwargs)
+        response = send(client, request, retries)
+        return self._build_response(response, client)
+
+    async def asyncio(self, client: Client, **kwargs):
+        request, retries = self._build_request(client, **kwargs)
+        response = await asend(client, request, retries)
+        return self._build_response(response, client)
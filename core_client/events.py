@@ -0,0 +1,356 @@
+import asyncio
+import codecs
+import json
+import time
+from collections import namedtuple
+
+import httpx
+from httpx import HTTPError
+
+from .endpoints import Endpoint, json_body
+from .transport import aiter_bytes, astream, iter_bytes, stream
+
+# long-lived connections, not limited by the "bulk"/"default" lanes
+LANE = "events"
+MAX_EVENT_BYTES = 1024 * 1024
+
+Event = namedtuple(
+    "Event", ["id", "ts", "level", "component", "message", "data"]
+)
+ProcessChange = namedtuple("ProcessChange", ["id", "change", "exec", "ts"])
+
+# process changes
+ADDED = "added"
+REMOVED = "removed"
+UPDATED = "updated"
+STATE = "state"
+
+# message parts of process events, checked in order
+_PROCESS_MESSAGES = (
+    ("delet", REMOVED),
+    ("remov", REMOVED),
+    ("add", ADDED),
+    ("creat", ADDED),
+    ("updat", UPDATED),
+    ("replac", UPDATED),
+)
+
+_EVENTS = Endpoint(
+    "events",
+    "post",
+    "/api/v3/events",
+    body=("filters", lambda filters: json_body({"filters": filters or []})),
+)
+
+
+class EventStreamDecoder:
+    """Incremental decoder of an event stream response.
+
+    Server-sent events (text/event-stream) and JSON lines
+    (application/x-json-stream) are parsed chunk by chunk, only the
+    current partial event is buffered, up to `max_event_bytes`.
+    """
+
+    def __init__(self, sse: bool = True, max_event_bytes=MAX_EVENT_BYTES):
+        self.sse = sse
+        self.max_event_bytes = max_event_bytes
+        # reconnect delay sent by the server (SSE "retry"), seconds
+        self.retry = None
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._id = None
+        self._type = None
+        self._data = []
+
+    def feed(self, chunk: bytes, final: bool = False):
+        lines = (self._buffer + self._text.decode(chunk, final)).split("\n")
+        self._buffer = "" if final else lines.pop()
+        if len(self._buffer) > self.max_event_bytes:
+            raise ValueError(f"event exceeds {self.max_event_bytes} bytes")
+        events = []
+        for line in lines:
+            event = self._line(line.rstrip("\r"))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _line(self, line: str):
+        if not self.sse:
+            return _event(None, None, json.loads(line)) if line else None
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None  # comment, e.g. keep-alive
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "data":
+            self._data.append(value)
+        elif name == "id":
+            self._id = value
+        elif name == "event":
+            self._type = value
+        elif name == "retry" and value.isdigit():
+            self.retry = int(value) / 1000
+        return None
+
+    def _dispatch(self):
+        data, self._data = self._data, []
+        type, self._type = self._type, None
+        if not data:
+            return None
+        text = "\n".join(data)
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = {"message": text}
+        return _event(self._id, type, value)
+
+
+def _event(id, type, value: dict) -> Event:
+    return Event(
+        id,
+        value.get("ts"),
+        value.get("level"),
+        value.get("event") or value.get("component") or type,
+        value.get("message", ""),
+        value.get("data") or {},
+    )
+
+
+def process_change(event: Event) -> ProcessChange:
+    """`ProcessChange` of a process event (process id in data["id"]),
+    None for other events."""
+    id = event.data.get("id")
+    if not id or event.component not in ("process", "restream"):
+        return None
+    message = event.message.lower()
+    for part, change in _PROCESS_MESSAGES:
+        if part in message:
+            return ProcessChange(id, change, None, event.ts)
+    exec = event.data.get("exec") or event.data.get("state")
+    if exec:
+        return ProcessChange(id, STATE, exec, event.ts)
+    return None
+
+
+def diff_processes(snapshot: dict, processes, ts=None):
+    """`ProcessChange`s between two polls of `v3_process_get_list`.
+
+    Args:
+        snapshot (dict): process id -> `Process` of the previous poll
+        processes (ProcessList): current poll, filter "config,state"
+        ts (int): time of the current poll
+    Returns:
+        tuple: (changes, snapshot of the current poll)
+    """
+    current = {process.id: process for process in processes}
+    changes = []
+    for id, process in current.items():
+        previous = snapshot.get(id)
+        exec = process.state.exec if process.state else None
+        if previous is None:
+            changes.append(ProcessChange(id, ADDED, exec, ts))
+            continue
+        if previous.config != process.config:
+            changes.append(ProcessChange(id, UPDATED, exec, ts))
+        if (previous.state.exec if previous.state else None) != exec:
+            changes.append(ProcessChange(id, STATE, exec, ts))
+    for id in snapshot.keys() - current.keys():
+        changes.append(ProcessChange(id, REMOVED, None, ts))
+    return changes, current
+
+
+class _Subscription:
+    """Reconnect and resume state of `events`/`aevents`."""
+
+    def __init__(
+        self,
+        client,
+        filters,
+        reconnect,
+        reconnect_delay,
+        max_reconnect_delay,
+        idle_timeout,
+        max_event_bytes,
+    ):
+        self.client = client
+        self.filters = filters
+        self.reconnect = reconnect
+        self.min_delay = reconnect_delay
+        self.max_delay = max_reconnect_delay
+        self.delay = reconnect_delay
+        self.idle_timeout = idle_timeout
+        self.max_event_bytes = max_event_bytes
+        self.last_id = None
+        # resume of streams without ids: events up to (ts, seen at ts)
+        self.last_ts = None
+        self.seen = set()
+
+    def request(self):
+        client = self.client._client_model(LANE)
+        request, retries = _EVENTS._build_request(client, filters=self.filters)
+        request["headers"] = {
+            **request["headers"],
+            "accept": "text/event-stream, application/x-json-stream",
+        }
+        if self.last_id is not None:
+            request["headers"]["last-event-id"] = self.last_id
+        request["timeout"] = httpx.Timeout(
+            client.timeout, read=self.idle_timeout
+        )
+        return client, request, retries
+
+    def decoder(self, response):
+        if response.status_code != 200:
+            raise HTTPError(
+                f"events: {response.status_code} {response.text[:200]}"
+            )
+        content_type = response.headers.get("content-type", "")
+        return EventStreamDecoder(
+            content_type.startswith("text/event-stream"),
+            self.max_event_bytes,
+        )
+
+    def feed(self, decoder, chunk: bytes, final: bool = False):
+        return [
+            event for event in decoder.feed(chunk, final) if self.new(event)
+        ]
+
+    def new(self, event: Event) -> bool:
+        """False for events already seen before a reconnect."""
+        self.delay = self.min_delay
+        if event.id is not None:
+            self.last_id = event.id
+            return True
+        if event.ts is None:
+            return True
+        key = (event.ts, event.component, event.message, str(event.data))
+        if self.last_ts is not None and (
+            event.ts < self.last_ts or key in self.seen
+        ):
+            return False
+        if event.ts != self.last_ts:
+            self.last_ts = event.ts
+            self.seen.clear()
+        self.seen.add(key)
+        return True
+
+    def backoff(self, decoder) -> float:
+        if not self.reconnect:
+            return None
+        delay = self.delay
+        if decoder is not None and decoder.retry is not None:
+            delay = decoder.retry
+        self.delay = min(self.delay * 2, self.max_delay)
+        return delay
+
+
+def events(
+    client,
+    filters: list = None,
+    reconnect: bool = True,
+    reconnect_delay: float = 1.0,
+    max_reconnect_delay: float = 30.0,
+    idle_timeout: float = None,
+    max_event_bytes: int = MAX_EVENT_BYTES,
+):
+    """Yields the `Event`s of the Core event stream (/api/v3/events).
+
+    One long-lived connection is read as fast as the events are
+    consumed, so a slow consumer holds back the server (TCP flow
+    control) instead of buffering. Dropped connections are reopened
+    after `reconnect_delay` (doubling up to `max_reconnect_delay`,
+    or the server's SSE "retry"), resuming after the last event id
+    ("last-event-id") or timestamp.
+    Args:
+        filters (list): event filters, e.g. [{"event": "process"}]
+        reconnect (bool): reopen dropped connections
+        idle_timeout (float): reconnect after n seconds without data,
+            None waits forever
+        max_event_bytes (int): max. size of one event
+    """
+    subscription = _Subscription(
+        client,
+        filters,
+        reconnect,
+        reconnect_delay,
+        max_reconnect_delay,
+        idle_timeout,
+        max_event_bytes,
+    )
+    while True:
+        decoder = None
+        try:
+            request = subscription.request()
+            with stream(*request) as response:
+                if response.status_code != 200:
+                    response.read()
+                decoder = subscription.decoder(response)
+                for chunk in iter_bytes(request[0], response):
+                    for event in subscription.feed(decoder, chunk):
+                        yield event
+                for event in subscription.feed(decoder, b"", final=True):
+                    yield event
+        except httpx.TransportError:
+            if not reconnect:
+                raise
+        delay = subscription.backoff(decoder)
+        if delay is None:
+            return
+        time.sleep(delay)
+
+
+async def aevents(
+    client,
+    filters: list = None,
+    reconnect: bool = True,
+    reconnect_delay: float = 1.0,
+    max_reconnect_delay: float = 30.0,
+    idle_timeout: float = None,
+    max_event_bytes: int = MAX_EVENT_BYTES,
+):
+    """Async `events` for an `AsyncClient`."""
+    subscription = _Subscription(
+        client,
+        filters,
+        reconnect,
+        reconnect_delay,
+        max_reconnect_delay,
+        idle_timeout,
+        max_event_bytes,
+    )
+    while True:
+        decoder = None
+        try:
+            request = subscription.request()
+            async with astream(*request) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                decoder = subscription.decoder(response)
+                async for chunk in aiter_bytes(request[0], response):
+                    for event in subscription.feed(decoder, chunk):
+                        yield event
+                for event in subscription.feed(decoder, b"", final=True):
+                    yield event
+        except httpx.TransportError:
+            if not reconnect:
+                raise
+        delay = subscription.backoff(decoder)
+        if delay is None:
+            return
+        await asyncio.sleep(delay)
+
+
+def process_changes(events):
+    """`ProcessChange`s of an `events` iterator."""
+    for event in events:
+        change = process_change(event)
+        if change is not None:
+            yield change
+
+
+async def aprocess_changes(events):
+    async for event in events:
+        change = process_change(event)
+        if change is not None:
+            yield change
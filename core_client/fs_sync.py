@@ -0,0 +1,392 @@
+import asyncio
+import fnmatch
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .base.api import ENDPOINTS
+from .base.models import Error
+from .lanes import BULK
+from .transport import aiter_bytes, astream, iter_bytes, stream
+
+MANIFEST = ".core_fs_sync.json"
+PART_SUFFIX = ".core_fs_sync.part"
+CHUNK_SIZE = 64 * 1024
+
+FsSyncResult = namedtuple(
+    "FsSyncResult", ["transferred", "deleted", "unchanged", "errors"]
+)
+
+_V3_FS_GET_FILE = ENDPOINTS["v3_fs_get_file"]
+
+
+class _FsSync:
+    def __init__(
+        self,
+        client,
+        local_dir: str,
+        name: str,
+        glob: str = "",
+        direction: str = "push",
+        delete: bool = False,
+        concurrency: int = 4,
+        manifest: str = None,
+    ):
+        if direction not in ("push", "pull"):
+            raise ValueError(f'direction "{direction}" is not push or pull')
+        self.client = client
+        self.local_dir = os.path.abspath(local_dir)
+        self.name = name
+        self.glob = glob
+        self.direction = direction
+        self.delete = delete
+        self.concurrency = concurrency
+        self.manifest_path = manifest or os.path.join(self.local_dir, MANIFEST)
+        self.manifest = self._load_manifest()
+        self.entries = self.manifest.setdefault(name, {})
+        self.errors = []
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _local_path(self, path: str):
+        """Local path of a remote path, ValueError outside `local_dir`."""
+        parts = path.strip("/").split("/")
+        local_path = os.path.normpath(os.path.join(self.local_dir, *parts))
+        if ".." in parts or not local_path.startswith(
+            os.path.join(self.local_dir, "")
+        ):
+            raise ValueError(f'path "{path}" is outside of the local dir')
+        return local_path
+
+    def _match(self, path: str):
+        return not self.glob or fnmatch.fnmatchcase(path, self.glob)
+
+    def _local_files(self):
+        """Returns {remote path: os.stat_result} of the local directory."""
+        files = {}
+        manifest_path = os.path.abspath(self.manifest_path)
+        for root, _, file_names in os.walk(self.local_dir):
+            for file_name in file_names:
+                local_path = os.path.join(root, file_name)
+                if local_path == manifest_path or file_name.endswith(
+                    PART_SUFFIX
+                ):
+                    continue
+                rel_path = os.path.relpath(local_path, self.local_dir)
+                path = "/" + rel_path.replace(os.sep, "/")
+                if self._match(path):
+                    files[path] = os.stat(local_path)
+        return files
+
+    def _remote_files(self, file_list):
+        if isinstance(file_list, Error):
+            self.errors.append((None, file_list))
+            return None
+        files = {}
+        for file in file_list:
+            path = f"/{file.name.lstrip('/')}"
+            if not self._match(path):
+                continue
+            if self.direction == "pull":
+                try:
+                    self._local_path(path)
+                except ValueError as e:
+                    self.errors.append(
+                        (path, Error(code=400, message=str(e), details=[]))
+                    )
+                    continue
+            files[path] = file
+        return files
+
+    def _plan(self, local_files, remote_files):
+        """Returns (paths to transfer, paths to delete, unchanged count)."""
+        transfer = []
+        unchanged = 0
+        for path in local_files if self.direction == "push" else remote_files:
+            entry = self.entries.get(path)
+            local = local_files.get(path)
+            remote = remote_files.get(path)
+            if (
+                entry is not None
+                and local is not None
+                and remote is not None
+                and entry["size"] == local.st_size == remote.size_bytes
+                and entry["mtime_ns"] == local.st_mtime_ns
+                and entry["last_modified"] == remote.last_modified
+            ):
+                unchanged += 1
+            else:
+                transfer.append(path)
+        if not self.delete:
+            return transfer, [], unchanged
+        if self.direction == "push":
+            delete = [path for path in remote_files if path not in local_files]
+        else:
+            delete = [path for path in local_files if path not in remote_files]
+        return transfer, delete, unchanged
+
+    def _record(self, local_files, remote_files, paths):
+        for path in paths:
+            local = local_files.get(path)
+            remote = remote_files.get(path)
+            if local is None or remote is None:
+                self.entries.pop(path, None)
+                continue
+            self.entries[path] = {
+                "size": local.st_size,
+                "mtime_ns": local.st_mtime_ns,
+                "last_modified": remote.last_modified,
+            }
+        for path in list(self.entries):
+            if path not in local_files and path not in remote_files:
+                del self.entries[path]
+
+    def _get_request(self, path: str):
+        client = self.client._client_model(BULK)
+        request, retries = _V3_FS_GET_FILE._build_request(
+            client, name=self.name, path=path.lstrip("/")
+        )
+        return client, request, retries
+
+    def _delete_local(self, path: str):
+        try:
+            os.remove(self._local_path(path))
+        except FileNotFoundError:
+            pass
+
+    def _job(self, done: list, transfer, path: str, *args):
+        if transfer(path, *args):
+            done.append(path)
+
+    def _check(self, path: str, response):
+        if isinstance(response, Error):
+            self.errors.append((path, response))
+            return False
+        return True
+
+    def _result(self, transfer, delete, unchanged):
+        failed = {path for path, _ in self.errors}
+        return FsSyncResult(
+            transferred=[path for path in transfer if path not in failed],
+            deleted=[path for path in delete if path not in failed],
+            unchanged=unchanged,
+            errors=self.errors,
+        )
+
+
+def _read_chunks(local_path: str):
+    with open(local_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+class FsSync(_FsSync):
+    def upload(self, path: str):
+        response = self.client.v3_fs_put_file(
+            name=self.name,
+            path=path.lstrip("/"),
+            data=_read_chunks(self._local_path(path)),
+        )
+        return self._check(path, response)
+
+    def download(self, path: str, last_modified: int):
+        local_path = self._local_path(path)
+        tmp_path = f"{local_path}{PART_SUFFIX}"
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        request = self._get_request(path)
+        with stream(*request) as response:
+            if response.status_code != 200:
+                response.read()
+                return self._check(
+                    path, _V3_FS_GET_FILE._build_response(response)
+                )
+            with open(tmp_path, "wb") as f:
+                for chunk in iter_bytes(request[0], response, CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(tmp_path, local_path)
+        os.utime(local_path, (last_modified, last_modified))
+        return True
+
+    def delete_path(self, path: str):
+        if self.direction == "pull":
+            self._delete_local(path)
+            return True
+        response = self.client.v3_fs_delete_file(
+            name=self.name, path=path.lstrip("/")
+        )
+        return self._check(path, response)
+
+    def _list_remote(self):
+        return self._remote_files(
+            self.client.v3_fs_get_file_list(name=self.name, glob=self.glob)
+        )
+
+    def run(self):
+        remote_files = self._list_remote()
+        if remote_files is None:
+            return self._result([], [], 0)
+        transfer, delete, unchanged = self._plan(
+            self._local_files(), remote_files
+        )
+        done = []
+        try:
+            with ThreadPoolExecutor(self.concurrency) as executor:
+                if self.direction == "push":
+                    jobs = [
+                        executor.submit(self._job, done, self.upload, p)
+                        for p in transfer
+                    ]
+                else:
+                    jobs = [
+                        executor.submit(
+                            self._job,
+                            done,
+                            self.download,
+                            p,
+                            remote_files[p].last_modified,
+                        )
+                        for p in transfer
+                    ]
+                jobs += [executor.submit(self.delete_path, p) for p in delete]
+                for job in jobs:
+                    job.result()
+        finally:
+            # keep the progress of finished jobs if one raised
+            if self.direction == "push" and (done or delete):
+                remote_files = self._list_remote() or {}
+            self._record(self._local_files(), remote_files, done)
+            self._save_manifest()
+        return self._result(transfer, delete, unchanged)
+
+
+async def _aread_chunks(local_path: str):
+    with open(local_path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+            yield chunk
+
+
+class AsyncFsSync(_FsSync):
+    async def upload(self, path: str):
+        response = await self.client.v3_fs_put_file(
+            name=self.name,
+            path=path.lstrip("/"),
+            data=_aread_chunks(self._local_path(path)),
+        )
+        return self._check(path, response)
+
+    async def download(self, path: str, last_modified: int):
+        local_path = self._local_path(path)
+        tmp_path = f"{local_path}{PART_SUFFIX}"
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        request = self._get_request(path)
+        async with astream(*request) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return self._check(
+                    path, _V3_FS_GET_FILE._build_response(response)
+                )
+            with open(tmp_path, "wb") as f:
+                async for chunk in aiter_bytes(
+                    request[0], response, CHUNK_SIZE
+                ):
+                    await asyncio.to_thread(f.write, chunk)
+        os.replace(tmp_path, local_path)
+        os.utime(local_path, (last_modified, last_modified))
+        return True
+
+    async def delete_path(self, path: str):
+        if self.direction == "pull":
+            self._delete_local(path)
+            return True
+        response = await self.client.v3_fs_delete_file(
+            name=self.name, path=path.lstrip("/")
+        )
+        return self._check(path, response)
+
+    async def _list_remote(self):
+        return self._remote_files(
+            await self.client.v3_fs_get_file_list(
+                name=self.name, glob=self.glob
+            )
+        )
+
+    async def run(self):
+        remote_files = await self._list_remote()
+        if remote_files is None:
+            return self._result([], [], 0)
+        transfer, delete, unchanged = self._plan(
+            self._local_files(), remote_files
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = []
+
+        async def bounded(job, path=None):
+            async with semaphore:
+                if await job and path is not None:
+                    done.append(path)
+
+        if self.direction == "push":
+            jobs = [bounded(self.upload(path), path) for path in transfer]
+        else:
+            jobs = [
+                bounded(
+                    self.download(path, remote_files[path].last_modified),
+                    path,
+                )
+                for path in transfer
+            ]
+        jobs += [bounded(self.delete_path(path)) for path in delete]
+        try:
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        finally:
+            # keep the progress of finished jobs if one raised
+            if self.direction == "push" and (done or delete):
+                remote_files = await self._list_remote() or {}
+            self._record(self._local_files(), remote_files, done)
+            self._save_manifest()
+        return self._result(transfer, delete, unchanged)
+
+
+def fs_sync(client, local_dir: str, name: str, glob: str = "", **kwargs):
+    """Syncs a local directory with a Core filesystem (rsync like).
+
+    Only files that changed since the last run are transferred, compared
+    by size and mtime against a manifest in `local_dir`.
+    Args:
+        client (Client): logged in client
+        local_dir (str): local directory
+        name (str): filesystem name, e.g. disk or mem
+        glob (str): glob pattern for file names
+        direction (str): push (local to Core) or pull (Core to local)
+        delete (bool): delete files missing on the source side
+        concurrency (int): max. parallel transfers
+        manifest (str): manifest path, default `local_dir`/.core_fs_sync.json
+    Returns:
+        FsSyncResult: transferred, deleted, unchanged and errors
+    """
+    return FsSync(client, local_dir, name, glob=glob, **kwargs).run()
+
+
+async def afs_sync(
+    client, local_dir: str, name: str, glob: str = "", **kwargs
+):
+    """Async `fs_sync` for an `AsyncClient`."""
+    return await AsyncFsSync(
+        client, local_dir, name, glob=glob, **kwargs
+    ).run()
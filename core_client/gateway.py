@@ -0,0 +1,368 @@
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+
+from .base.api import ENDPOINTS
+from .lanes import CONTROL, endpoint_lane
+from .transport import asend
+
+# endpoint -> seconds a response is fresh
+DEFAULT_TTL = {
+    "v3_widget_get_process": 5.0,
+    "v3_process_get_state": 1.0,
+    "v3_session_get": 5.0,
+}
+# endpoints Core serves without credentials
+PUBLIC = ("v3_widget_get_process",)
+STATS_PATH = "/_gateway/stats"
+
+# request headers of callers forwarded on pass-through
+_FORWARD_HEADERS = (b"authorization", b"content-type", b"accept")
+
+
+def _path_pattern(path: str):
+    """Regex of an endpoint path template, "{id}" and "{path:path}"."""
+    pattern = re.sub(
+        r"\{(\w+)(:path)?\}",
+        lambda m: ".+" if m.group(2) else "[^/]+",
+        re.escape(path).replace(r"\{", "{").replace(r"\}", "}"),
+    )
+    return re.compile(pattern + "$")
+
+
+class _Entry:
+    __slots__ = ("status", "content_type", "body", "fetched_at")
+
+    def __init__(self, status, content_type, body, fetched_at):
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+        self.fetched_at = fetched_at
+
+
+class GatewayStats:
+    """Cache results of a `Gateway` endpoint."""
+
+    __slots__ = ("hits", "stale", "misses", "coalesced", "errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        # misses that waited for an in-flight upstream request
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def upstream(self) -> int:
+        return self.misses - self.coalesced
+
+    @property
+    def hit_rate(self) -> float:
+        """Requests served without waiting for the upstream."""
+        total = self.hits + self.stale + self.misses
+        return (self.hits + self.stale) / total if total else 0.0
+
+    def dict(self) -> dict:
+        return {
+            **{name: getattr(self, name) for name in self.__slots__},
+            "upstream": self.upstream,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class Gateway:
+    def __init__(
+        self,
+        clients,
+        ttl: dict = None,
+        stale: float = 30.0,
+        max_entries: int = 10000,
+        public: tuple = PUBLIC,
+        auth_ttl: float = 60.0,
+    ):
+        """ASGI app fronting Cores with a shared response cache.
+
+        `GET` requests of the endpoints in `ttl` are served from the
+        cache, fetched with the credentials of the client. Callers of
+        endpoints not in `public` need an authorization header, checked
+        by Core with an upstream request of the caller per path every
+        `auth_ttl` seconds (its response fills the cache), requests
+        without one are rejected. Fresh entries
+        are served as they are; within `stale` seconds after the ttl
+        the stale entry is served while one background request
+        refreshes it; older entries and misses wait for one upstream
+        request per key, shared by all concurrent callers. Other
+        requests (writes) are passed through with the authorization
+        header of the caller and drop the cached entries of the
+        process they change. Cache stats: `GET /_gateway/stats`.
+        Args:
+            clients (AsyncClient | dict): logged in client, or name ->
+                client for several Cores, served under "/{name}/api/..."
+            ttl (dict): endpoint -> seconds a response is fresh,
+                default `DEFAULT_TTL`
+            stale (float): seconds a stale entry is served after its ttl
+            max_entries (int): max. cached responses (LRU)
+            public (tuple): endpoints served without caller credentials,
+                default `PUBLIC` (the widget)
+            auth_ttl (float): seconds a checked authorization header is
+                served from the cache
+        """
+        if not isinstance(clients, dict):
+            clients = {"": clients}
+        self.clients = clients
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self.public = public
+        self.auth_ttl = auth_ttl
+        self.stats = {name: GatewayStats() for name in self.ttl}
+        self._routes = [
+            (_path_pattern(ENDPOINTS[name].path), ENDPOINTS[name])
+            for name in self.ttl
+        ]
+        self._cache = OrderedDict()
+        self._flights = {}
+        # (core, authorization, path) -> monotonic time it expires
+        self._authorized = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        status, content_type, content, headers = await self.handle(scope, body)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(content)).encode()),
+                    *((k.encode(), v.encode()) for k, v in headers.items()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    async def handle(self, scope: dict, body: bytes):
+        """(status, content type, body, headers) of an ASGI request."""
+        path = scope["path"]
+        if path == STATS_PATH:
+            stats = {name: s.dict() for name, s in self.stats.items()}
+            return 200, "application/json", json.dumps(stats).encode(), {}
+        core, path = self._core(path)
+        client = self.clients.get(core)
+        if client is None:
+            return _error(404, "Not Found")
+        query = scope.get("query_string", b"").decode()
+        if scope["method"] == "GET":
+            for pattern, endpoint in self._routes:
+                if pattern.match(path):
+                    return await self._cached(
+                        client, core, endpoint, path, query, scope
+                    )
+        return await self._pass_through(client, core, scope, path, query, body)
+
+    def _core(self, path: str):
+        if "" in self.clients:
+            return "", path
+        core, _, path = path[1:].partition("/")
+        return core, "/" + path
+
+    async def _cached(self, client, core, endpoint, path, query, scope):
+        ttl = self.ttl[endpoint.name]
+        stats = self.stats[endpoint.name]
+        key = (core, path, "&".join(sorted(query.split("&"))))
+        now = time.monotonic()
+        if endpoint.name not in self.public:
+            authorization = _header(scope, b"authorization")
+            if authorization is None:
+                return _error(401, "Unauthorized")
+            expires = self._authorized.get((core, authorization, path))
+            if expires is None or expires < now:
+                return await self._authorize(
+                    key, client, endpoint, path, query, stats, authorization
+                )
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            age = now - entry.fetched_at
+            if age < ttl:
+                stats.hits += 1
+                return _response(entry, "HIT", age, ttl)
+            if age < ttl + self.stale:
+                stats.stale += 1
+                self._refresh(key, client, endpoint, path, query, stats)
+                return _response(entry, "STALE", age, ttl)
+        stats.misses += 1
+        if key in self._flights:
+            stats.coalesced += 1
+        try:
+            entry = await self._refresh(
+                key, client, endpoint, path, query, stats
+            )
+        except Exception as e:
+            if entry is None:
+                return _error(502, f"Bad Gateway: {e!r}")
+            # stale if error
+            return _response(entry, "STALE", now - entry.fetched_at, ttl)
+        return _response(entry, "MISS", 0, ttl)
+
+    async def _authorize(
+        self, key, client, endpoint, path, query, stats, authorization
+    ):
+        """Miss fetched with the authorization header of the caller."""
+        stats.misses += 1
+        if (key, authorization) in self._flights:
+            stats.coalesced += 1
+        try:
+            entry = await self._refresh(
+                key, client, endpoint, path, query, stats, authorization
+            )
+        except Exception as e:
+            return _error(502, f"Bad Gateway: {e!r}")
+        if entry.status in (401, 403) or entry.status >= 500:
+            return entry.status, entry.content_type, entry.body, {}
+        authorized = (key[0], authorization, path)
+        self._authorized[authorized] = time.monotonic() + self.auth_ttl
+        self._authorized.move_to_end(authorized)
+        while len(self._authorized) > self.max_entries:
+            self._authorized.popitem(last=False)
+        return _response(entry, "MISS", 0, self.ttl[endpoint.name])
+
+    def _refresh(
+        self, key, client, endpoint, path, query, stats, authorization=None
+    ):
+        """Single-flight upstream request of a cache key (and caller)."""
+        flight = key if authorization is None else (key, authorization)
+        task = self._flights.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch(
+                    key, client, endpoint, path, query, stats, authorization
+                )
+            )
+            self._flights[flight] = task
+
+            def done(_):
+                del self._flights[flight]
+                if not task.cancelled():
+                    task.exception()  # retrieved, served stale
+
+            task.add_done_callback(done)
+        return task
+
+    async def _fetch(
+        self, key, client, endpoint, path, query, stats, authorization
+    ):
+        model = client._client_model(endpoint_lane(endpoint.name))
+        url = model.base_url + path + (f"?{query}" if query else "")
+        headers = model.headers
+        if authorization is not None:
+            headers = {**headers, "authorization": authorization}
+        request = {
+            "method": "GET",
+            "url": url,
+            "headers": headers,
+            "timeout": model.timeout,
+        }
+        try:
+            response = await asend(model, request, model.retries)
+        except Exception:
+            stats.errors += 1
+            raise
+        entry = _Entry(
+            response.status_code,
+            response.headers.get("content-type", "application/json"),
+            response.content,
+            time.monotonic(),
+        )
+        if response.status_code >= 500:
+            stats.errors += 1
+            old = self._cache.get(key)
+            return entry if old is None or authorization else old
+        if authorization is not None and entry.status in (401, 403):
+            return entry
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return entry
+
+    async def _pass_through(self, client, core, scope, path, query, body):
+        model = client._client_model(CONTROL)
+        headers = {"accept-encoding": model.headers["accept-encoding"]}
+        for name, value in scope.get("headers", ()):
+            if name.lower() in _FORWARD_HEADERS:
+                headers[name.decode().lower()] = value.decode()
+        request = {
+            "method": scope["method"],
+            "url": model.base_url + path + (f"?{query}" if query else ""),
+            "headers": headers,
+            "timeout": model.timeout,
+            "content": body,
+        }
+        try:
+            response = await asend(model, request, model.retries)
+        except Exception as e:
+            return _error(502, f"Bad Gateway: {e!r}")
+        if scope["method"] != "GET" and response.status_code < 400:
+            self.invalidate(core, path)
+        return (
+            response.status_code,
+            response.headers.get("content-type", "application/json"),
+            response.content,
+            {},
+        )
+
+    def invalidate(self, core: str = "", path: str = "/"):
+        """Drops the cached entries of a process (changed by a write to
+        /api/v3/process/{id}/...) and its widget, or below `path`."""
+        prefix = path.rstrip("/").split("/")[:5]
+        prefixes = [prefix]
+        if len(prefix) == 5 and prefix[1:4] == ["api", "v3", "process"]:
+            prefixes.append(["", "api", "v3", "widget", "process", prefix[4]])
+        for key in [k for k in self._cache if k[0] == core]:
+            segments = key[1].split("/")
+            if any(segments[: len(p)] == p for p in prefixes):
+                del self._cache[key]
+
+
+def _header(scope: dict, name: bytes):
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode()
+    return None
+
+
+def _response(entry: _Entry, cache: str, age: float, ttl: float):
+    return (
+        entry.status,
+        entry.content_type,
+        entry.body,
+        {
+            "x-cache": cache,
+            "age": str(int(age)),
+            "cache-control": f"max-age={int(ttl)}",
+        },
+    )
+
+
+def _error(code: int, message: str):
+    body = {"code": code, "message": message, "details": []}
+    return code, "application/json", json.dumps(body).encode(), {}
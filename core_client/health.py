@@ -0,0 +1,199 @@
+import time
+from collections import namedtuple
+
+from .base.models.v3 import ProcessStateProgress
+
+Health = namedtuple(
+    "Health", ["score", "alerts", "fps", "speed", "drop_rate", "dup_rate"]
+)
+
+# alerts
+STALLED = "stalled"
+SLOW = "slow"
+DROPS = "drops"
+DUPS = "dups"
+QUEUE = "queue"
+LOOPING = "looping"
+DUPLICATING = "duplicating"
+
+
+class _State:
+    __slots__ = (
+        "at",
+        "frame",
+        "drop",
+        "dup",
+        "fps",
+        "speed",
+        "drop_rate",
+        "dup_rate",
+        "frame_at",
+        "slow_since",
+        "health",
+    )
+
+    def __init__(self, progress, now):
+        self.at = now
+        self.frame = progress.frame
+        self.drop = progress.drop
+        self.dup = progress.dup
+        self.fps = progress.fps
+        self.speed = progress.speed
+        self.drop_rate = 0.0
+        self.dup_rate = 0.0
+        self.frame_at = now
+        self.slow_since = None
+        self.health = None
+
+
+class HealthEngine:
+    """Rolling stream health per process from successive progress samples.
+
+    Each sample updates EWMAs of fps, speed and the drop/dup rates
+    (frames/s) and the durations of speed < 1.0 and of a stalled frame
+    counter, O(1) per sample and process.
+    Args:
+        alpha (float): EWMA weight of a new sample
+        stall_seconds (float): frame counter unchanged for n seconds
+        slow_seconds (float): speed < 1.0 for n seconds
+        max_drop_ratio (float): dropped frames / fps
+        max_dup_ratio (float): duplicated frames / fps
+        max_queue (float): avstream queue length of an input
+        on_alert (callable): called with (id, alert, active) when an
+            alert is raised or cleared
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        stall_seconds: float = 5.0,
+        slow_seconds: float = 10.0,
+        max_drop_ratio: float = 0.01,
+        max_dup_ratio: float = 0.05,
+        max_queue: float = 512,
+        on_alert=None,
+    ):
+        self.alpha = alpha
+        self.stall_seconds = stall_seconds
+        self.slow_seconds = slow_seconds
+        self.max_drop_ratio = max_drop_ratio
+        self.max_dup_ratio = max_dup_ratio
+        self.max_queue = max_queue
+        self.on_alert = on_alert
+        self._states = {}
+
+    def __len__(self):
+        return len(self._states)
+
+    def health(self, id: str) -> Health:
+        """Latest health of a process, None before its first sample."""
+        state = self._states.get(id)
+        return None if state is None else state.health
+
+    def remove(self, id: str):
+        self._states.pop(id, None)
+
+    def update(
+        self, id: str, progress: ProcessStateProgress, now: float = None
+    ) -> Health:
+        """Adds a progress sample of a process.
+
+        Args:
+            now (float): sample time in seconds, time.monotonic() if None
+        """
+        if now is None:
+            now = time.monotonic()
+        state = self._states.get(id)
+        if state is None or progress.frame < state.frame:
+            # first sample or restarted process
+            previous = None if state is None else state.health
+            state = self._states[id] = _State(progress, now)
+            state.health = previous
+        else:
+            self._sample(state, progress, now)
+        return self._evaluate(id, state, progress, now)
+
+    def update_processes(self, processes, now: float = None):
+        """Adds the samples of a `ProcessList`, filter "state"."""
+        if now is None:
+            now = time.monotonic()
+        for process in processes:
+            if process.state is not None and process.state.progress:
+                self.update(process.id, process.state.progress, now)
+
+    def _sample(self, state, progress, now):
+        alpha = self.alpha
+        elapsed = now - state.at
+        if elapsed > 0:
+            drop_rate = max(progress.drop - state.drop, 0) / elapsed
+            dup_rate = max(progress.dup - state.dup, 0) / elapsed
+            state.drop_rate += alpha * (drop_rate - state.drop_rate)
+            state.dup_rate += alpha * (dup_rate - state.dup_rate)
+        state.fps += alpha * (progress.fps - state.fps)
+        state.speed += alpha * (progress.speed - state.speed)
+        if progress.frame != state.frame:
+            state.frame_at = now
+        state.at = now
+        state.frame = progress.frame
+        state.drop = progress.drop
+        state.dup = progress.dup
+
+    def _evaluate(self, id, state, progress, now) -> Health:
+        if progress.speed < 1.0:
+            if state.slow_since is None:
+                state.slow_since = now
+        else:
+            state.slow_since = None
+        fps = max(state.fps, 1.0)
+        drop_ratio = state.drop_rate / fps
+        dup_ratio = state.dup_rate / fps
+
+        alerts = set()
+        if now - state.frame_at >= self.stall_seconds:
+            alerts.add(STALLED)
+        if (
+            state.slow_since is not None
+            and now - state.slow_since >= self.slow_seconds
+        ):
+            alerts.add(SLOW)
+        if drop_ratio > self.max_drop_ratio:
+            alerts.add(DROPS)
+        if dup_ratio > self.max_dup_ratio:
+            alerts.add(DUPS)
+        for io in progress.inputs:
+            avstream = io.avstream
+            if avstream is None:
+                continue
+            if avstream.queue > self.max_queue:
+                alerts.add(QUEUE)
+            if avstream.looping:
+                alerts.add(LOOPING)
+            if avstream.duplicating:
+                alerts.add(DUPLICATING)
+
+        if STALLED in alerts:
+            score = 0.0
+        else:
+            score = 100.0
+            score -= min(40.0, max(0.0, 1.0 - state.speed) * 100.0)
+            score -= min(30.0, drop_ratio / self.max_drop_ratio * 10.0)
+            score -= min(20.0, dup_ratio / self.max_dup_ratio * 5.0)
+            score -= 10.0 * len(alerts & {QUEUE, LOOPING, DUPLICATING})
+            score = max(score, 0.0)
+
+        alerts = frozenset(alerts)
+        previous = state.health.alerts if state.health else frozenset()
+        state.health = Health(
+            round(score, 1),
+            alerts,
+            state.fps,
+            state.speed,
+            state.drop_rate,
+            state.dup_rate,
+        )
+        if self.on_alert is not None and alerts != previous:
+            for alert in sorted(alerts - previous):
+                self.on_alert(id, alert, True)
+            for alert in sorted(previous - alerts):
+                self.on_alert(id, alert, False)
+        return state.health
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import time
+from collections import namedtuple
+
+from .base.models import Error
+
+Keyframe = namedtuple(
+    "Keyframe",
+    ["core", "id", "input_id", "data", "hash", "changed", "cached", "error"],
+)
+
+
+class RateLimit:
+    """Token bucket of `rate` requests per second, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def wait(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class KeyframeHarvester:
+    def __init__(
+        self,
+        clients,
+        input_name: str = "last.jpg",
+        concurrency: int = 16,
+        rate: float = None,
+        burst: int = None,
+        ttl: float = 5.0,
+    ):
+        """Fetches playout input keyframes of many processes concurrently.
+
+        Keyframes are cached for `ttl` seconds, identical frames (e.g.
+        error frames) are stored once by content hash. Concurrent
+        harvests share the in-flight requests of a keyframe.
+        Args:
+            clients (AsyncClient | dict): logged in client, or name ->
+                client for several Cores
+            input_name (str): keyframe name, e.g. "last.jpg"/"last.png"
+            concurrency (int): max. running requests (all Cores)
+            rate (float): max. requests per second per Core, None for
+                no limit
+            burst (int): requests per Core at once within the rate,
+                default `concurrency`
+            ttl (float): seconds a keyframe is reused
+        """
+        if not isinstance(clients, dict):
+            clients = {"": clients}
+        self.clients = clients
+        self.input_name = input_name
+        self.ttl = ttl
+        self.requests = 0
+        self.errors = 0
+        # fetched frames already stored for another input or earlier
+        self.duplicates = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limits = {
+            core: RateLimit(rate, burst or concurrency)
+            for core in clients
+            if rate is not None
+        }
+        # (core, id, input_id) -> (hash, fetched_at)
+        self._entries = {}
+        # hash -> [data, entries]
+        self._frames = {}
+        self._flights = {}
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(len(frame[0]) for frame in self._frames.values())
+
+    def get(self, id: str, input_id: str, core: str = "") -> bytes:
+        """Cached keyframe of an input, also an expired one, or None."""
+        entry = self._entries.get((core, id, input_id))
+        return None if entry is None else self._frames[entry[0]][0]
+
+    async def harvest(self, inputs, refresh: bool = False):
+        """Yields the `Keyframe`s of inputs as they complete.
+
+        Fresh cached keyframes come first, failed requests yield a
+        `Keyframe` with `error` (`Error` or exception) and no data.
+        Args:
+            inputs (list): (process id, input id) tuples, with several
+                Cores (core, process id, input id)
+            refresh (bool): fetch all keyframes, ignoring the cache
+        """
+        now = time.monotonic()
+        cached = []
+        tasks = {}
+        for item in inputs:
+            key = item if len(item) == 3 else ("", *item)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl and not refresh:
+                cached.append(self._keyframe(key, entry[0], False, True))
+            elif key not in tasks:
+                tasks[key] = self._flight(key)
+        for keyframe in cached:
+            yield keyframe
+        for next in asyncio.as_completed(list(tasks.values())):
+            yield await next
+
+    def _flight(self, key):
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        return task
+
+    async def _fetch(self, key) -> Keyframe:
+        core, id, input_id = key
+        client = self.clients[core]
+        try:
+            async with self._semaphore:
+                if core in self._rate_limits:
+                    await self._rate_limits[core].wait()
+                self.requests += 1
+                data = await client.v3_process_get_playout_input_keyframe(
+                    id=id, input_id=input_id, input_name=self.input_name
+                )
+        except Exception as e:
+            data = e
+        if isinstance(data, (Error, Exception)):
+            self.errors += 1
+            return Keyframe(core, id, input_id, None, None, False, False, data)
+        return self._store(key, data)
+
+    def _store(self, key, data: bytes) -> Keyframe:
+        hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        previous = self._entries.get(key)
+        self._entries[key] = (hash, time.monotonic())
+        if hash in self._frames:
+            self.duplicates += 1
+        else:
+            self._frames[hash] = [data, 0]
+        self._frames[hash][1] += 1
+        if previous is not None:
+            self._release(previous[0])
+        changed = previous is None or previous[0] != hash
+        return self._keyframe(key, hash, changed, False)
+
+    def _release(self, hash: str):
+        frame = self._frames[hash]
+        frame[1] -= 1
+        if frame[1] == 0:
+            del self._frames[hash]
+
+    def _keyframe(self, key, hash: str, changed: bool, cached: bool):
+        data = self._frames[hash][0]
+        return Keyframe(*key, data, hash, changed, cached, None)
+
+    def invalidate(self, id: str = None, core: str = ""):
+        """Drops the cached keyframes of a process or all."""
+        for key in list(self._entries):
+            if id is None or key[:2] == (core, id):
+                self._release(self._entries.pop(key)[0])
@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import threading
+import time
+
+CONTROL = "control"
+DEFAULT = "default"
+BULK = "bulk"
+
+# read-only calls with large responses or fan-out
+BULK_ENDPOINTS = {
+    "v3_cluster_get_list",
+    "v3_fs_get_file",
+    "v3_fs_get_file_list",
+    "v3_fs_get_list",
+    "v3_log_get",
+    "v3_metrics_get",
+    "v3_metrics_post",
+    "v3_process_get_list",
+    "v3_rtmp_get",
+    "v3_session_get",
+    "v3_session_get_active",
+    "v3_srt_get",
+}
+_CONTROL_PARTS = ("_put", "_post", "_delete", "reload", "reopen", "errorframe")
+
+
+def endpoint_lane(method_name: str) -> str:
+    """Lane of a client method: mutating calls are "control", large
+    read-only calls are "bulk", others "default"."""
+    if method_name in BULK_ENDPOINTS:
+        return BULK
+    if any(part in method_name for part in _CONTROL_PARTS):
+        return CONTROL
+    return DEFAULT
+
+
+class LaneStats:
+    """Queue-wait metrics of a lane."""
+
+    __slots__ = (
+        "limit",
+        "in_flight",
+        "requests",
+        "waits",
+        "wait_seconds",
+        "max_wait_seconds",
+    )
+
+    def __init__(self, limit: int = None):
+        self.limit = limit
+        self.in_flight = 0
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _full(self) -> bool:
+        return self.limit is not None and self.in_flight >= self.limit
+
+    def _waited(self, seconds: float):
+        self.waits += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def __repr__(self):
+        return (
+            f"LaneStats(limit={self.limit}, in_flight={self.in_flight}, "
+            f"requests={self.requests}, waits={self.waits}, "
+            f"wait_seconds={self.wait_seconds:.3f}, "
+            f"max_wait_seconds={self.max_wait_seconds:.3f})"
+        )
+
+
+class _Lanes:
+    def __init__(self, limits: dict):
+        self.stats = {
+            lane: LaneStats(limits.get(lane))
+            for lane in (CONTROL, DEFAULT, BULK, *limits)
+        }
+
+    def _lane(self, lane: str) -> LaneStats:
+        stats = self.stats.get(lane)
+        if stats is None:
+            stats = self.stats[lane] = LaneStats()
+        return stats
+
+
+class Lanes(_Lanes):
+    """Per lane limits of concurrent requests of a `Client`.
+
+    Lanes only wait for their own capacity, so capping "bulk" (and
+    "default") reserves the rest of the connection pool for "control".
+    """
+
+    def __init__(self, limits: dict):
+        super().__init__(limits)
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def acquire(self, lane: str):
+        with self._condition:
+            stats = self._lane(lane)
+            stats.requests += 1
+            if stats._full():
+                start = time.monotonic()
+                while stats._full():
+                    self._condition.wait()
+                stats._waited(time.monotonic() - start)
+            stats.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                stats.in_flight -= 1
+                self._condition.notify_all()
+
+
+class AsyncLanes(_Lanes):
+    """`Lanes` of an `AsyncClient`."""
+
+    def __init__(self, limits: dict):
+        super().__init__(limits)
+        self._condition = None
+        self._loop = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, lane: str):
+        # a condition is bound to the event loop it waits in
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        stats = self._lane(lane)
+        stats.requests += 1
+        if stats._full():
+            start = time.monotonic()
+            async with self._condition:
+                await self._condition.wait_for(lambda: not stats._full())
+            stats._waited(time.monotonic() - start)
+        stats.in_flight += 1
+        try:
+            yield
+        finally:
+            stats.in_flight -= 1
+            async with self._condition:
+                self._condition.notify_all()
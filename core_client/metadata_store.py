@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+
+from .base.api import ENDPOINTS
+from .base.models import Error
+from .transport import send, asend
+
+_V3_METADATA_GET = ENDPOINTS["v3_metadata_get"]
+_V3_PROCESS_GET_METADATA = ENDPOINTS["v3_process_get_metadata"]
+
+
+class _MetadataStore:
+    def __init__(self, client, window: float = 0.1, ttl: float = None):
+        """Metadata cache with write-behind batching.
+
+        Entries are addressed by (process id, key), a process id of None
+        addresses the global metadata.
+        Args:
+            client (Client | AsyncClient): logged in client
+            window (float): seconds to coalesce writes before a flush
+            ttl (float): seconds until a cached value is revalidated,
+                None caches until the next write
+        """
+        self.client = client
+        self.window = window
+        self.ttl = ttl
+        self.errors = []
+        self._cache = {}
+        self._pending = {}
+
+    def _cached(self, entry):
+        """Returns (value, etag, fresh) of a cached entry or None."""
+        if entry in self._pending:
+            return self._pending[entry], None, True
+        if entry not in self._cache:
+            return None
+        value, etag, fetched_at = self._cache[entry]
+        fresh = self.ttl is None or time.monotonic() - fetched_at < self.ttl
+        return value, etag, fresh
+
+    def _build_get_request(self, entry, etag: str = None):
+        id, key = entry
+        client = self.client._client_model()
+        if id is None:
+            request, retries = _V3_METADATA_GET._build_request(client, key=key)
+        else:
+            request, retries = _V3_PROCESS_GET_METADATA._build_request(
+                client, id=id, key=key
+            )
+        if etag is not None:
+            request["headers"] = {**request["headers"], "if-none-match": etag}
+        return client, request, retries
+
+    def _store_response(self, entry, cached, response):
+        if response.status_code == 304 and cached is not None:
+            value = cached[0]
+        else:
+            value = _V3_METADATA_GET._build_response(response)
+        if isinstance(value, Error):
+            self._cache.pop(entry, None)
+        else:
+            self._cache[entry] = (
+                value,
+                response.headers.get("etag"),
+                time.monotonic(),
+            )
+        return value
+
+    def _set(self, entry, data):
+        self._pending[entry] = data
+        self._cache[entry] = (data, None, time.monotonic())
+
+    def _take_pending(self):
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def _put(self, entry, data):
+        id, key = entry
+        if id is None:
+            return self.client.v3_metadata_put(key=key, data=data)
+        return self.client.v3_process_put_metadata(id=id, key=key, data=data)
+
+    def _store_put(self, entry, data, response):
+        if isinstance(response, Error):
+            self.errors.append((entry, response))
+            if self._cache.get(entry, (None,))[0] is data:
+                self._cache.pop(entry, None)
+
+    def invalidate(self, key: str = None, id: str = None):
+        """Drops cached values of a key, a process or all."""
+        if key is None and id is None:
+            self._cache.clear()
+            return
+        for entry in list(self._cache):
+            if (id is None or entry[0] == id) and (
+                key is None or entry[1] == key
+            ):
+                self._cache.pop(entry, None)
+
+
+class MetadataStore(_MetadataStore):
+    """Sync metadata store, writes are flushed by a timer thread.
+
+    Pending writes are coalesced per (process id, key), the last write
+    wins. Reads are served from the cache or revalidated with the ETag.
+    """
+
+    def __init__(self, client, window: float = 0.1, ttl: float = None):
+        super().__init__(client, window=window, ttl=ttl)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def get(self, key: str, id: str = None, refresh: bool = False):
+        entry = (id, key)
+        with self._lock:
+            cached = self._cached(entry)
+        if cached is not None and cached[2] and not refresh:
+            return cached[0]
+        client, request, retries = self._build_get_request(
+            entry, etag=cached[1] if cached else None
+        )
+        response = send(client, request, retries)
+        with self._lock:
+            return self._store_response(entry, cached, response)
+
+    def set(self, key: str, data, id: str = None):
+        with self._lock:
+            self._set((id, key), data)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Writes all pending values, returns the number of writes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = self._take_pending()
+        for entry, data in pending.items():
+            response = self._put(entry, data)
+            with self._lock:
+                self._store_put(entry, data, response)
+        return len(pending)
+
+    def close(self):
+        self.flush()
+
+
+class AsyncMetadataStore(_MetadataStore):
+    """Async metadata store, see `MetadataStore`.
+
+    Pending writes are flushed concurrently by a task after `window`.
+    """
+
+    def __init__(self, client, window: float = 0.1, ttl: float = None):
+        super().__init__(client, window=window, ttl=ttl)
+        self._flush_handle = None
+        self._flush_tasks = set()
+
+    async def get(self, key: str, id: str = None, refresh: bool = False):
+        entry = (id, key)
+        cached = self._cached(entry)
+        if cached is not None and cached[2] and not refresh:
+            return cached[0]
+        client, request, retries = self._build_get_request(
+            entry, etag=cached[1] if cached else None
+        )
+        response = await asend(client, request, retries)
+        return self._store_response(entry, cached, response)
+
+    def set(self, key: str, data, id: str = None):
+        self._set((id, key), data)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(
+                self.window, self._schedule_flush
+            )
+
+    def _schedule_flush(self):
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = self._take_pending()
+        entries = list(pending.items())
+        responses = await asyncio.gather(
+            *(self._put(entry, data) for entry, data in entries)
+        )
+        for (entry, data), response in zip(entries, responses):
+            self._store_put(entry, data, response)
+        return len(entries)
+
+    async def aclose(self):
+        await self.flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
@@ -1,9 +1,17 @@
-from pydantic import BaseModel
-from typing import Dict
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict
 
 
 class Client(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     base_url: str
     headers: dict[str, str]
     retries: int
     timeout: float
+    http_client: Any = None
+    decoder: Any = None
+    lanes: Any = None
+    lane: str = "default"
+    transport: Any = None
+    transfer_stats: Any = None
@@ -0,0 +1,241 @@
+import asyncio
+import time
+
+from .base.models import Error
+from .keyframes import RateLimit
+from .projection import aget_process_list
+from .scheduler import PollScheduler
+
+# Core playout inputs, e.g. "playout:rtmp://..."
+PLAYOUT_PREFIX = "playout:"
+ACTIONS = {
+    "reopen": "v3_process_get_playout_input_reopen",
+    "errorframe": "v3_process_get_playout_input_errorframe_encode",
+}
+
+
+def is_playout(io) -> bool:
+    """True for a playout-enabled `ProcessConfigIO` input."""
+    return io.address.startswith(PLAYOUT_PREFIX)
+
+
+class PlayoutInput:
+    """State of a playout input of a `PlayoutMonitor`."""
+
+    __slots__ = (
+        "id",
+        "input_id",
+        "address",
+        "status",
+        "error",
+        "polls",
+        "updated_at",
+        "changed_at",
+        "stale",
+        "actions",
+        "action_error",
+    )
+
+    def __init__(self, id: str, input_id: str, address: str):
+        self.id = id
+        self.input_id = input_id
+        self.address = address
+        self.status = None
+        self.error = None
+        self.polls = 0
+        self.updated_at = None
+        # last change of the progress, or last action
+        self.changed_at = time.monotonic()
+        self.stale = False
+        self.actions = 0
+        self.action_error = None
+
+
+class PlayoutMonitor:
+    def __init__(
+        self,
+        client,
+        interval: float = 2.0,
+        stale_after: float = 10.0,
+        action=None,
+        action_rate: float = 0.5,
+        max_actions: int = 100,
+        discover_interval: float = 60.0,
+        max_concurrency: int = 8,
+        progress=None,
+        scheduler: PollScheduler = None,
+    ):
+        """Polls the status of all playout inputs into a state table.
+
+        Playout inputs are discovered from the `ProcessConfig`s (see
+        `is_playout`) every `discover_interval` seconds. Each input is a
+        `PollScheduler` job, so the polls run concurrently and back off
+        while a status is unchanged (up to `stale_after` / 2). An input
+        is stale if its progress has not changed for `stale_after`
+        seconds; it then gets one `action` through a rate limited queue
+        and `stale_after` seconds to recover before the next one.
+        Args:
+            client (AsyncClient): logged in client
+            interval (float): seconds between status polls
+            stale_after (float): seconds without progress until stale
+            action (str | callable): "reopen", "errorframe" or a
+                coroutine function (client, `PlayoutInput`), None
+                only marks inputs stale
+            action_rate (float): max. actions per second
+            max_actions (int): max. queued actions, more are dropped
+            discover_interval (float): seconds between discoveries
+            max_concurrency (int): max. running polls (own scheduler)
+            progress (callable): part of a status that changes while the
+                input is live, default the whole status
+            scheduler (PollScheduler): shared scheduler, started and
+                stopped by the caller
+        """
+        if isinstance(action, str) and action not in ACTIONS:
+            raise ValueError(f'unknown action "{action}"')
+        self.client = client
+        self.interval = interval
+        self.stale_after = stale_after
+        self.action = action
+        self.discover_interval = discover_interval
+        self.progress = progress or (lambda status: status)
+        self.inputs = {}
+        self.actions = 0
+        self.dropped_actions = 0
+        self._own_scheduler = scheduler is None
+        self.scheduler = scheduler or PollScheduler(client, max_concurrency)
+        self._rate_limit = RateLimit(action_rate)
+        self._queue = asyncio.Queue(max_actions)
+        self._queued = set()
+        self._worker = None
+
+    def stale(self) -> list:
+        return [input for input in self.inputs.values() if input.stale]
+
+    async def discover(self):
+        """Adds jobs of new playout inputs, removes those of gone ones."""
+        processes = await aget_process_list(
+            self.client, ["id", "config.input"]
+        )
+        if isinstance(processes, Error):
+            return processes
+        found = {}
+        for process in processes:
+            if process.config is None:
+                continue
+            for io in process.config.input or ():
+                if is_playout(io):
+                    found[(process.id, io.id)] = io.address
+        for key in self.inputs.keys() - found.keys():
+            del self.inputs[key]
+            self.scheduler.remove(self._job_name(key))
+        for key in found.keys() - self.inputs.keys():
+            self.inputs[key] = PlayoutInput(*key, found[key])
+            self.scheduler.add(
+                self._job_name(key),
+                self._poll_call(key),
+                interval=self.interval,
+                max_interval=max(self.interval, self.stale_after / 2),
+                callback=self._update,
+            )
+        return list(self.inputs.values())
+
+    def _job_name(self, key) -> str:
+        return f"playout:{key[0]}:{key[1]}"
+
+    def _poll_call(self, key):
+        status = self.client.v3_process_get_playout_input_status
+
+        async def poll():
+            try:
+                return key, await status(id=key[0], input_id=key[1])
+            except Exception as e:  # equal errors compare unchanged
+                return key, Error(code=0, message=repr(e), details=[])
+
+        return poll
+
+    def _update(self, job, result):
+        key, status = result
+        input = self.inputs.get(key)
+        if input is None:
+            return
+        now = time.monotonic()
+        input.polls += 1
+        input.updated_at = now
+        if isinstance(status, Error):
+            input.error = status
+        else:
+            input.error = None
+            previous = input.status
+            input.status = status
+            if previous is None or self.progress(status) != self.progress(
+                previous
+            ):
+                input.changed_at = now
+        stale = now - input.changed_at >= self.stale_after
+        if stale and not input.stale and self.action is not None:
+            self._enqueue(key)
+        input.stale = stale
+
+    def _enqueue(self, key):
+        if key in self._queued:
+            return
+        try:
+            self._queue.put_nowait(key)
+        except asyncio.QueueFull:
+            self.dropped_actions += 1
+            return
+        self._queued.add(key)
+
+    async def _run_actions(self):
+        while True:
+            key = await self._queue.get()
+            self._queued.discard(key)
+            input = self.inputs.get(key)
+            if input is None or not input.stale:
+                continue
+            await self._rate_limit.wait()
+            try:
+                if callable(self.action):
+                    result = await self.action(self.client, input)
+                else:
+                    method = getattr(self.client, ACTIONS[self.action])
+                    result = await method(id=key[0], input_id=key[1])
+            except Exception as e:
+                result = e
+            self.actions += 1
+            input.actions += 1
+            input.action_error = (
+                result if isinstance(result, (Error, Exception)) else None
+            )
+            # time to recover before the next action
+            input.changed_at = time.monotonic()
+            input.stale = False
+
+    async def start(self):
+        """Discovers the inputs and starts polling."""
+        await self.discover()
+        self.scheduler.add(
+            "playout:discover",
+            self.discover,
+            interval=self.discover_interval,
+            max_interval=self.discover_interval,
+        )
+        if self._own_scheduler:
+            self.scheduler.start()
+        self._worker = asyncio.ensure_future(self._run_actions())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._own_scheduler:
+            await self.scheduler.stop()
+        names = [self._job_name(key) for key in self.inputs]
+        for name in (*names, "playout:discover"):
+            if name in self.scheduler.jobs:
+                self.scheduler.remove(name)
+        self.inputs.clear()
@@ -0,0 +1,140 @@
+import functools
+import typing
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from pydantic import model_validator
+
+from .base.api import ENDPOINTS
+from .base.models import Error
+from .base.models.v3 import Process
+from .lanes import BULK
+from .transport import send, asend
+
+_V3_PROCESS_GET_LIST = ENDPOINTS["v3_process_get_list"]
+
+# Core process list filters
+_FILTERS = ("config", "state", "report", "metadata")
+
+
+def _unwrap(annotation):
+    """Returns (model, is list) of Optional[model] or list[model]."""
+    is_list = False
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Union:
+            args = [
+                arg
+                for arg in typing.get_args(annotation)
+                if arg is not type(None)
+            ]
+            if len(args) != 1:
+                return annotation, is_list
+            annotation = args[0]
+        elif origin is list:
+            is_list = True
+            annotation = typing.get_args(annotation)[0]
+        else:
+            return annotation, is_list
+
+
+def _split(fields):
+    tree = {}
+    for field in fields:
+        name, _, rest = field.partition(".")
+        tree.setdefault(name, set())
+        if rest:
+            tree[name].add(rest)
+    return tree
+
+
+@functools.lru_cache(maxsize=128)
+def projection(model, fields: frozenset):
+    """Narrow copy of `model` with only the given (dotted) fields.
+
+    Fields not in the projection are ignored while decoding. Projected
+    fields default to None. Results are cached per (model, fields).
+    Args:
+        model (BaseModel): e.g. Process
+        fields (frozenset): e.g. {"id", "state.exec", "state.progress.fps"}
+    """
+    definitions = {}
+    for name, sub_fields in _split(fields).items():
+        if name not in model.model_fields:
+            raise ValueError(f'"{name}" is not a field of {model.__name__}')
+        annotation = model.model_fields[name].annotation
+        if sub_fields:
+            sub_model, is_list = _unwrap(annotation)
+            if not (
+                isinstance(sub_model, type)
+                and issubclass(sub_model, BaseModel)
+            ):
+                raise ValueError(f'"{name}" of {model.__name__} has no fields')
+            annotation = projection(sub_model, frozenset(sub_fields))
+            if is_list:
+                annotation = list[annotation]
+        definitions[name] = (typing.Optional[annotation], None)
+    validators = {
+        name: model_validator(mode="before")(decorator.func.__func__)
+        for name, decorator in (
+            model.__pydantic_decorators__.model_validators.items()
+        )
+        if decorator.info.mode == "before"
+    }
+    return create_model(
+        f"{model.__name__}Projection",
+        __config__=ConfigDict(**model.model_config),
+        __validators__=validators,
+        **definitions,
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def projection_adapter(fields: frozenset, many: bool = False):
+    """Cached TypeAdapter of a `Process` projection or a list of it."""
+    model = projection(Process, fields)
+    return TypeAdapter(list[model] if many else model)
+
+
+def process_list_filter(fields) -> str:
+    """Smallest `v3_process_get_list` filter that covers the fields.
+
+    An empty filter returns all fields, so "metadata" is used if none of
+    the filtered fields is projected.
+    """
+    names = {field.partition(".")[0] for field in fields}
+    return ",".join(name for name in _FILTERS if name in names) or "metadata"
+
+
+def _build_response(response, fields: frozenset):
+    if response.status_code == 200:
+        return projection_adapter(fields, many=True).validate_json(
+            response.content
+        )
+    return TypeAdapter(Error).validate_python(response.json())
+
+
+def _build_request(client, fields: frozenset, kwargs):
+    client = client._client_model(BULK)
+    kwargs.setdefault("filter", process_list_filter(fields))
+    return (client, *_V3_PROCESS_GET_LIST._build_request(client, **kwargs))
+
+
+def get_process_list(client, fields, **kwargs):
+    """`v3_process_get_list` decoded into a projection of `Process`.
+
+    Only the listed fields are validated, the JSON is parsed straight
+    into the narrow models. The filter defaults to the smallest one.
+    Args:
+        client (Client): logged in client
+        fields (list): dotted field names, e.g. ["id", "state.exec"]
+        **kwargs: see `v3_process_get_list`
+    """
+    fields = frozenset(fields)
+    response = send(*_build_request(client, fields, kwargs))
+    return _build_response(response, fields)
+
+
+async def aget_process_list(client, fields, **kwargs):
+    """Async `get_process_list` for an `AsyncClient`."""
+    fields = frozenset(fields)
+    response = await asend(*_build_request(client, fields, kwargs))
+    return _build_response(response, fields)
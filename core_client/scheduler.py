@@ -0,0 +1,227 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+
+class PollJob:
+    """A periodic call of a `PollScheduler`, see `PollScheduler.add`."""
+
+    def __init__(
+        self,
+        name: str,
+        call,
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+        priority: int,
+        jitter: float,
+        backoff: float,
+        speedup: float,
+        callback,
+    ):
+        self.name = name
+        self.call = call
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.priority = priority
+        self.jitter = jitter
+        self.backoff = backoff
+        self.speedup = speedup
+        self.callback = callback
+        self.result = None
+        self.error = None
+        self.runs = 0
+        self.changes = 0
+        self.errors = 0
+        self.removed = False
+
+    def _delay(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _adapt(self, changed: bool):
+        if changed:
+            self.interval = max(
+                self.min_interval, self.interval * self.speedup
+            )
+        else:
+            self.interval = min(
+                self.max_interval, self.interval * self.backoff
+            )
+
+
+class PollScheduler:
+    def __init__(self, client, max_concurrency: int = 4):
+        """Runs periodic calls (monitoring loops) of an `AsyncClient`.
+
+        All jobs share the connection pool of the client, at most
+        `max_concurrency` calls run at once and due jobs start by priority.
+        Intervals are jittered and adapt to the results: they back off
+        while a snapshot is unchanged and speed up when it changes.
+        Args:
+            client (AsyncClient): logged in client
+            max_concurrency (int): max. running calls
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.jobs = {}
+        self._timers = []
+        self._ready = []
+        self._running = 0
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+        self._tasks = set()
+
+    def add(
+        self,
+        name: str,
+        method,
+        interval: float,
+        min_interval: float = None,
+        max_interval: float = None,
+        priority: int = 0,
+        jitter: float = 0.1,
+        backoff: float = 1.5,
+        speedup: float = 0.5,
+        callback=None,
+        **kwargs,
+    ) -> PollJob:
+        """Adds a periodic job, the first run is spread over `jitter`.
+
+        Args:
+            name (str): unique job name
+            method (str | callable): client method name, e.g. "v3_srt_get",
+                or a coroutine function without arguments
+            interval (float): initial seconds between runs
+            min_interval (float): lower bound while changing, interval
+            max_interval (float): upper bound while unchanged, 8 * interval
+            priority (int): higher runs first when jobs are due together
+            jitter (float): +/- fraction of the interval
+            backoff (float): interval factor for an unchanged result
+            speedup (float): interval factor for a changed result
+            callback (callable): called with (job, result), may be a
+                coroutine function
+            **kwargs: arguments of the client method
+        """
+        if name in self.jobs:
+            raise ValueError(f'job "{name}" exists')
+        if isinstance(method, str):
+            function = getattr(self.client, method)
+
+            def call():
+                return function(**kwargs)
+
+        else:
+            call = method
+        job = PollJob(
+            name,
+            call,
+            interval,
+            interval if min_interval is None else min_interval,
+            interval * 8 if max_interval is None else max_interval,
+            priority,
+            jitter,
+            backoff,
+            speedup,
+            callback,
+        )
+        self.jobs[name] = job
+        self._schedule(job, random.uniform(0, interval * jitter))
+        return job
+
+    def remove(self, name: str):
+        job = self.jobs.pop(name)
+        job.removed = True
+        # a due job waiting for capacity does not run anymore
+        ready = [item for item in self._ready if item[3] is not job]
+        if len(ready) != len(self._ready):
+            heapq.heapify(ready)
+            self._ready = ready
+
+    def _schedule(self, job: PollJob, delay: float):
+        due = time.monotonic() + delay
+        heapq.heappush(self._timers, (due, next(self._seq), job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        """Stops scheduling and waits for the running calls."""
+        if self._task is not None:
+            # wait_for() of Python < 3.12 can swallow the cancellation
+            self._stopping = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    due, seq, job = heapq.heappop(self._timers)
+                    if not job.removed:
+                        heapq.heappush(
+                            self._ready, (-job.priority, due, seq, job)
+                        )
+                while self._ready and self._running < self.max_concurrency:
+                    job = heapq.heappop(self._ready)[3]
+                    self._running += 1
+                    task = asyncio.ensure_future(self._run_job(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                timeout = None
+                if self._timers and self._running < self.max_concurrency:
+                    timeout = max(self._timers[0][0] - time.monotonic(), 0)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    async def _run_job(self, job: PollJob):
+        try:
+            result = await job.call()
+        except Exception as e:
+            job.errors += 1
+            job.error = e
+            job._adapt(changed=False)
+        else:
+            changed = job.runs == 0 or result != job.result
+            if job.runs:
+                job._adapt(changed)
+            job.runs += 1
+            job.error = None
+            if changed:
+                job.changes += 1
+            job.result = result
+            if job.callback is not None:
+                try:
+                    callback = job.callback(job, result)
+                    if asyncio.iscoroutine(callback):
+                        await callback
+                except Exception as e:
+                    job.errors += 1
+                    job.error = e
+        finally:
+            self._running -= 1
+            if not job.removed:
+                self._schedule(job, job._delay())
+            elif self._wakeup is not None:
+                self._wakeup.set()
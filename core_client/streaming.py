@@ -0,0 +1,319 @@
+import codecs
+import json
+import re
+import time
+from collections import namedtuple
+from httpx import HTTPError
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
+
+from .base.api import ENDPOINTS
+from .base.models import Error
+from .base.models.v3 import Process
+from .projection import process_list_filter, projection_adapter
+from .lanes import BULK
+from .transport import aiter_bytes, astream, iter_bytes, stream
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# end of a number, true, false or null
+_SCALAR_END = re.compile(r"[, \t\n\r\]]")
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING = re.compile(r'["\\]')
+
+FilesystemFileEntry = namedtuple(
+    "FilesystemFileEntry", ["name", "size_bytes", "last_modified"]
+)
+
+_V3_FS_GET_FILE_LIST = ENDPOINTS["v3_fs_get_file_list"]
+_V3_PROCESS_GET_LIST = ENDPOINTS["v3_process_get_list"]
+
+
+class JsonArrayDecoder:
+    """Incremental decoder for a top-level JSON array.
+
+    `feed` takes the response bytes in chunks of any size and returns the
+    array elements completed so far, so only one element is buffered.
+    The end of an element is found by scanning each chunk once, it is
+    decoded when complete.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._started = False
+        self.done = False
+        # text and scan state of an incomplete element
+        self._parts = []
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: bytes, final: bool = False):
+        text = self._text.decode(chunk, final)
+        items = []
+        pos = 0
+        if self._parts:
+            end = self._scan(text, 0)
+            if end is None:
+                self._parts.append(text)
+                pos = len(text)
+            else:
+                self._parts.append(text[:end])
+                items.append(self._decode("".join(self._parts)))
+                self._parts = []
+                pos = end
+        while not self.done and not self._parts:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos == len(text):
+                break
+            if not self._started:
+                if text[pos] != "[":
+                    raise ValueError("response is not a JSON array")
+                self._started = True
+                pos += 1
+            elif text[pos] == ",":
+                pos += 1
+            elif text[pos] == "]":
+                self.done = True
+                pos += 1
+            else:
+                self._scalar = text[pos] not in '[{"'
+                end = self._scan(text, pos)
+                if end is None:
+                    self._parts.append(text[pos:])
+                    break
+                items.append(self._decode(text[pos:end]))
+                pos = end
+        if final and not self.done:
+            raise ValueError("incomplete JSON array")
+        return items
+
+    def _scan(self, text: str, pos: int):
+        """End of the current element in `text`, None if not in it."""
+        if self._scalar:
+            # a number is complete only if a delimiter follows
+            match = _SCALAR_END.search(text, pos)
+            return None if match is None else match.start()
+        while True:
+            if not self._in_string:
+                match = _STRUCTURE.search(text, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                if match.group() == '"':
+                    self._in_string = True
+                elif match.group() in "[{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+                continue
+            if self._escape:
+                if pos == len(text):
+                    return None
+                self._escape = False
+                pos += 1
+            match = _STRING.search(text, pos)
+            if match is None:
+                return None
+            pos = match.end()
+            if match.group() == "\\":
+                self._escape = True
+            else:
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+
+    def _decode(self, text: str):
+        item, end = self._decoder.raw_decode(text)
+        if end != len(text):
+            raise ValueError(f"invalid JSON array element {text[:32]!r}")
+        return item
+
+
+def _raise_for_error(response):
+    try:
+        error = TypeAdapter(Error).validate_python(response.json())
+    except (ValueError, PydanticValidationError):
+        raise HTTPError(f"{response.url}, {response.status_code}")
+    raise HTTPError(f"{error.code}: {error.message}")
+
+
+def iter_json_array(response, chunk_size: int = CHUNK_SIZE, client=None):
+    """Yields the elements of a streamed JSON array response.
+
+    Compressed responses are decompressed chunk by chunk. With `client`
+    the bytes are counted in its transfer stats.
+    """
+    decoder = JsonArrayDecoder()
+    if client is None:
+        chunks = response.iter_bytes(chunk_size)
+    else:
+        chunks = iter_bytes(client, response, chunk_size)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.feed(b"", final=True)
+
+
+async def aiter_json_array(
+    response, chunk_size: int = CHUNK_SIZE, client=None
+):
+    decoder = JsonArrayDecoder()
+    if client is None:
+        chunks = response.aiter_bytes(chunk_size)
+    else:
+        chunks = aiter_bytes(client, response, chunk_size)
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.feed(b"", final=True):
+        yield item
+
+
+def _file_filter(min_size, max_size, older_than, newer_than):
+    now = time.time()
+    min_modified = None if newer_than is None else now - newer_than
+    max_modified = None if older_than is None else now - older_than
+
+    def match(file: dict):
+        size = file["size_bytes"]
+        modified = file["last_modified"]
+        return (
+            (min_size is None or size >= min_size)
+            and (max_size is None or size <= max_size)
+            and (max_modified is None or modified < max_modified)
+            and (min_modified is None or modified >= min_modified)
+        )
+
+    return match
+
+
+def _fs_file_list_request(client, name, glob, sort, order, retries, timeout):
+    client = client._client_model(BULK)
+    request, retries = _V3_FS_GET_FILE_LIST._build_request(
+        client,
+        name=name,
+        glob=glob,
+        sort=sort,
+        order=order,
+        retries=retries,
+        timeout=timeout,
+    )
+    return client, request, retries
+
+
+def iter_fs_file_list(
+    client,
+    name: str,
+    glob: str = "",
+    sort: str = "",
+    order: str = "",
+    min_size: int = None,
+    max_size: int = None,
+    older_than: float = None,
+    newer_than: float = None,
+    retries: int = None,
+    timeout: float = None,
+):
+    """Lazy `v3_fs_get_file_list`, parsed while the response streams in.
+
+    Args:
+        glob (str): glob pattern for file names
+        sort (str): none, name, size or lastmod
+        order (str): asc or desc
+        min_size (int): min. size_bytes
+        max_size (int): max. size_bytes
+        older_than (float): last modified more than n seconds ago
+        newer_than (float): last modified within the last n seconds
+    Yields:
+        FilesystemFileEntry: name, size_bytes, last_modified
+    """
+    match = _file_filter(min_size, max_size, older_than, newer_than)
+    request = _fs_file_list_request(
+        client, name, glob, sort, order, retries, timeout
+    )
+    with stream(*request) as response:
+        if response.status_code != 200:
+            response.read()
+            _raise_for_error(response)
+        for file in iter_json_array(response, client=request[0]):
+            if match(file):
+                yield FilesystemFileEntry(
+                    file["name"], file["size_bytes"], file["last_modified"]
+                )
+
+
+async def aiter_fs_file_list(
+    client,
+    name: str,
+    glob: str = "",
+    sort: str = "",
+    order: str = "",
+    min_size: int = None,
+    max_size: int = None,
+    older_than: float = None,
+    newer_than: float = None,
+    retries: int = None,
+    timeout: float = None,
+):
+    """Async `iter_fs_file_list` for an `AsyncClient`."""
+    match = _file_filter(min_size, max_size, older_than, newer_than)
+    request = _fs_file_list_request(
+        client, name, glob, sort, order, retries, timeout
+    )
+    async with astream(*request) as response:
+        if response.status_code != 200:
+            await response.aread()
+            _raise_for_error(response)
+        async for file in aiter_json_array(response, client=request[0]):
+            if match(file):
+                yield FilesystemFileEntry(
+                    file["name"], file["size_bytes"], file["last_modified"]
+                )
+
+
+_process_adapter = TypeAdapter(Process)
+
+
+def _process_list_request(client, fields, kwargs):
+    if fields is None:
+        model = _process_adapter
+    else:
+        fields = frozenset(fields)
+        kwargs.setdefault("filter", process_list_filter(fields))
+        model = projection_adapter(fields)
+    client = client._client_model(BULK)
+    request, retries = _V3_PROCESS_GET_LIST._build_request(client, **kwargs)
+    return model, (client, request, retries)
+
+
+def iter_process_list(client, fields: list = None, **kwargs):
+    """Streaming `v3_process_get_list`, yields one `Process` at a time.
+
+    The response is decoded while it streams in, so memory stays flat
+    regardless of the number of processes.
+    Args:
+        fields (list): decode a projection, see `projection.projection`
+        **kwargs: see `v3_process_get_list`
+    """
+    model, request = _process_list_request(client, fields, kwargs)
+    with stream(*request) as response:
+        if response.status_code != 200:
+            response.read()
+            _raise_for_error(response)
+        for process in iter_json_array(response, client=request[0]):
+            yield model.validate_python(process)
+
+
+async def aiter_process_list(client, fields: list = None, **kwargs):
+    """Async `iter_process_list` for an `AsyncClient`."""
+    model, request = _process_list_request(client, fields, kwargs)
+    async with astream(*request) as response:
+        if response.status_code != 200:
+            await response.aread()
+            _raise_for_error(response)
+        async for process in aiter_json_array(response, client=request[0]):
+            yield model.validate_python(process)
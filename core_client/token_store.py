@@ -0,0 +1,207 @@
+import abc
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows, the file store is not locked
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "core_client",
+    "tokens.json",
+)
+
+
+def token_key(
+    secret: bytes,
+    base_url: str,
+    username: str = None,
+    password: str = None,
+    auth0_token: str = None,
+):
+    """Store key of a login, None if there are no login credentials.
+
+    The key ends with an HMAC of the credentials keyed by the `secret`
+    of the store, so a client with another password does not reuse the
+    tokens of a login, and the stored keys do not allow guessing the
+    password offline without the secret.
+    """
+    if username:
+        user, credentials = username, f"{username}:{password or ''}"
+    elif auth0_token:
+        user, credentials = "auth0", auth0_token
+    else:
+        return None
+    digest = hmac.new(
+        secret, f"{base_url}|{credentials}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{base_url}|{user}:{digest[:32]}"
+
+
+class TokenStore(abc.ABC):
+    """Token cache shared by clients, keyed by (base_url, credentials).
+
+    Entries are dicts with access_token, refresh_token, expires_at and
+    about (the `About` response). Passwords are never stored, keys end
+    with an HMAC of the credentials, see `token_key`.
+    """
+
+    def secret(self) -> bytes:
+        """HMAC key of the store keys, random per store instance.
+
+        Stores shared by processes keep one secret next to the entries.
+        """
+        secret = getattr(self, "_secret", None)
+        if secret is None:
+            secret = self._secret = secrets.token_bytes(32)
+        return secret
+
+    def key(
+        self,
+        base_url: str,
+        username: str = None,
+        password: str = None,
+        auth0_token: str = None,
+    ):
+        """Store key of a login, see `token_key`."""
+        return token_key(
+            self.secret(), base_url, username, password, auth0_token
+        )
+
+    @abc.abstractmethod
+    def get(self, key: str) -> dict:
+        """The entry of a key or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: dict):
+        """Stores the entry of a key."""
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        """Drops the entry of a key, if any."""
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        """Serializes logins of the same key."""
+        yield
+
+
+class MemoryTokenStore(TokenStore):
+    """Token cache of the current process (threads)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: dict):
+        self._entries[key] = dict(entry)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, path: str = DEFAULT_PATH):
+        """Token cache in a JSON file (mode 0600), shared by processes.
+
+        The secret of the keys is kept in `path` + ".key" (mode 0600).
+        Logins are serialized with an exclusive lock (flock) on `path` +
+        ".login", so concurrent workers log in once.
+        Use a path on tmpfs (e.g. /dev/shm) to keep the tokens in memory.
+        """
+        self.path = path
+        self._thread_locks = MemoryTokenStore()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: dict):
+        self._write_file(self.path, json.dumps(entries).encode())
+
+    def _write_file(self, path: str, data: bytes):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _flock(self, suffix: str):
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(self.path + suffix, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def secret(self) -> bytes:
+        secret = getattr(self, "_secret", None)
+        if secret is not None:
+            return secret
+        path = self.path + ".key"
+        with self._flock(".lock"):
+            try:
+                with open(path, "rb") as file:
+                    secret = file.read()
+            except OSError:
+                pass
+            if not secret:
+                secret = secrets.token_bytes(32)
+                self._write_file(path, secret)
+        self._secret = secret
+        return secret
+
+    def get(self, key: str) -> dict:
+        return self._read().get(key)
+
+    def set(self, key: str, entry: dict):
+        with self._flock(".lock"):
+            entries = self._read()
+            entries[key] = entry
+            self._write(entries)
+
+    def delete(self, key: str):
+        with self._flock(".lock"):
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        # one flock per file, logins of other keys wait for one round trip
+        with self._thread_locks.lock(key), self._flock(".login"):
+            yield
@@ -0,0 +1,129 @@
+import contextlib
+import httpx
+
+from .models import Client
+
+
+def _transport(client: Client, retries: int, asynchronous: bool = False):
+    if client.transport is not None:
+        return client.transport(retries, asynchronous)
+    if asynchronous:
+        return httpx.AsyncHTTPTransport(retries=retries)
+    return httpx.HTTPTransport(retries=retries)
+
+
+def _record(client: Client, response: httpx.Response, body_bytes: int):
+    if client.transfer_stats is not None:
+        client.transfer_stats.record(
+            response.headers.get("content-encoding", "identity"),
+            response.num_bytes_downloaded,
+            body_bytes,
+        )
+
+
+def send(client: Client, request: dict, retries: int):
+    """Sends a request, reusing the pooled connections of the client.
+
+    A one-off connection is used for calls with custom `retries`. With
+    lanes, the request waits for capacity in the lane of the call.
+    """
+    if client.lanes is None:
+        response = _send(client, request, retries)
+    else:
+        with client.lanes.acquire(client.lane):
+            response = _send(client, request, retries)
+    _record(client, response, len(response.content))
+    return response
+
+
+def _send(client: Client, request: dict, retries: int):
+    if client.http_client is not None and retries == client.retries:
+        return client.http_client.request(**request)
+    transport = _transport(client, retries)
+    with httpx.Client(transport=transport, http2=True) as httpx_client:
+        return httpx_client.request(**request)
+
+
+async def asend(client: Client, request: dict, retries: int):
+    if client.lanes is None:
+        response = await _asend(client, request, retries)
+    else:
+        async with client.lanes.acquire(client.lane):
+            response = await _asend(client, request, retries)
+    _record(client, response, len(response.content))
+    return response
+
+
+async def _asend(client: Client, request: dict, retries: int):
+    if client.http_client is not None and retries == client.retries:
+        return await client.http_client.request(**request)
+    transport = _transport(client, retries, asynchronous=True)
+    async with httpx.AsyncClient(transport=transport) as httpx_client:
+        return await httpx_client.request(**request)
+
+
+def iter_bytes(client: Client, response: httpx.Response, chunk_size=None):
+    """Decoded (decompressed) body chunks of a `stream` response, counted
+    in the transfer stats of the client."""
+    body_bytes = 0
+    try:
+        for chunk in response.iter_bytes(chunk_size):
+            body_bytes += len(chunk)
+            yield chunk
+    finally:
+        _record(client, response, body_bytes)
+
+
+async def aiter_bytes(
+    client: Client, response: httpx.Response, chunk_size=None
+):
+    body_bytes = 0
+    try:
+        async for chunk in response.aiter_bytes(chunk_size):
+            body_bytes += len(chunk)
+            yield chunk
+    finally:
+        _record(client, response, body_bytes)
+
+
+@contextlib.contextmanager
+def stream(client: Client, request: dict, retries: int):
+    """Sends a request without reading the response body."""
+    with contextlib.ExitStack() as stack:
+        if client.lanes is not None:
+            stack.enter_context(client.lanes.acquire(client.lane))
+        yield stack.enter_context(_stream(client, request, retries))
+
+
+@contextlib.contextmanager
+def _stream(client: Client, request: dict, retries: int):
+    if client.http_client is not None and retries == client.retries:
+        with client.http_client.stream(**request) as response:
+            yield response
+        return
+    transport = _transport(client, retries)
+    with httpx.Client(transport=transport, http2=True) as httpx_client:
+        with httpx_client.stream(**request) as response:
+            yield response
+
+
+@contextlib.asynccontextmanager
+async def astream(client: Client, request: dict, retries: int):
+    async with contextlib.AsyncExitStack() as stack:
+        if client.lanes is not None:
+            await stack.enter_async_context(client.lanes.acquire(client.lane))
+        yield await stack.enter_async_context(
+            _astream(client, request, retries)
+        )
+
+
+@contextlib.asynccontextmanager
+async def _astream(client: Client, request: dict, retries: int):
+    if client.http_client is not None and retries == client.retries:
+        async with client.http_client.stream(**request) as response:
+            yield response
+        return
+    transport = _transport(client, retries, asynchronous=True)
+    async with httpx.AsyncClient(transport=transport) as httpx_client:
+        async with httpx_client.stream(**request) as response:
+            yield response
@@ -0,0 +1,164 @@
+import copy
+import functools
+import re
+import typing
+from pydantic import BaseModel, Field, create_model
+from pydantic_collections import BaseCollectionModel
+
+from .base.models.v3 import Srt, SrtConnectionStats
+
+
+class _Unused:
+    """Field override: the field is always None for this version."""
+
+
+# Field shapes per Core version, replacing the multi-version unions and
+# `model_validator`s of the generic models. The last entry whose version
+# is <= the Core version applies.
+CHANGES = {
+    SrtConnectionStats: [
+        ((0,), {"sent_unique_bytes": _Unused, "recv_loss_bytes": _Unused}),
+        # v16.11.0: -sent_unique__bytes, -recv_loss__bytes
+        (
+            (16, 11, 0),
+            {"sent_unique__bytes": _Unused, "recv_loss__bytes": _Unused},
+        ),
+    ],
+    Srt: [
+        (
+            (0,),
+            {
+                "name": _Unused,
+                "socketid": _Unused,
+                "subscriber": dict[str, list[int]],
+            },
+        ),
+        # v16.10.0: -publisher, subscriber is a list of socket ids
+        ((16, 10, 0), {"publisher": _Unused, "subscriber": list[int]}),
+    ],
+}
+
+_VERSIONS = sorted({v for changes in CHANGES.values() for v, _ in changes})
+
+# specialized model -> (public model, names of fields of specialized models)
+_PUBLIC = {}
+
+
+def parse_version(number: str) -> tuple:
+    """Version tuple of e.g. "16.11.0", None without a version number."""
+    if not number:
+        return None
+    match = re.match(r"v?(\d+(?:\.\d+)*)", number)
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.group(1).split("."))
+
+
+def epoch(version: tuple) -> tuple:
+    """Latest version with changes up to `version`, None for unknown."""
+    if version is None:
+        return None
+    return max(v for v in _VERSIONS if v <= version)
+
+
+def _changes(model, epoch: tuple) -> dict:
+    for version, changes in reversed(CHANGES.get(model, [])):
+        if version <= epoch:
+            return changes
+    return None
+
+
+def _substitute(annotation, epoch: tuple):
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return specialize(annotation, epoch)
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is None or not args:
+        return annotation
+    new_args = tuple(_substitute(arg, epoch) for arg in args)
+    if new_args == args:
+        return annotation
+    if origin is typing.Union:
+        return typing.Union[new_args]
+    return origin[new_args]
+
+
+@functools.lru_cache(maxsize=None)
+def specialize(model, epoch: tuple):
+    """Subclass of `model` with the field shapes of the Core version `epoch`.
+
+    Models that change with the version lose their `model_validator`s,
+    models containing them are subclassed with the specialized field
+    types, others are returned as they are.
+    """
+    if epoch is None:
+        return model
+    if issubclass(model, BaseCollectionModel):
+        element = model.__element__.annotation
+        specialized = _substitute(element, epoch)
+        if specialized is element:
+            return model
+        subclass = type(
+            model.__name__,
+            (BaseCollectionModel[specialized], model),
+            {"__module__": model.__module__},
+        )
+        _PUBLIC[subclass] = (model, None)
+        return subclass
+
+    changes = _changes(model, epoch) or {}
+    definitions = {}
+    nested = []
+    for name, field in model.model_fields.items():
+        change = changes.get(name)
+        if change is _Unused:
+            # never read from the response, as the validator did
+            definitions[name] = (
+                typing.Optional[field.annotation],
+                Field(None, validation_alias=f"{name} (unused)"),
+            )
+        elif change is not None:
+            definitions[name] = (change, copy.copy(field))
+        else:
+            annotation = _substitute(field.annotation, epoch)
+            if annotation is not field.annotation:
+                definitions[name] = (annotation, copy.copy(field))
+                nested.append(name)
+    if not changes and not definitions:
+        return model
+    subclass = create_model(
+        model.__name__,
+        __base__=model,
+        __module__=model.__module__,
+        **definitions,
+    )
+    if changes:
+        subclass.__pydantic_decorators__.model_validators.clear()
+        subclass.model_rebuild(force=True)
+    _PUBLIC[subclass] = (model, nested)
+    return subclass
+
+
+def public(value):
+    """`value` with the instances of specialized models converted to the
+    public models they specialize, e.g. `Srt`.
+
+    The data is already validated with the version schema, the public
+    instances are built with `model_construct()`.
+    """
+    spec = _PUBLIC.get(type(value))
+    if spec is not None:
+        model, nested = spec
+        if nested is None:
+            return model.model_construct([public(item) for item in value])
+        fields = dict(value)
+        for name in nested:
+            fields[name] = public(fields[name])
+        return model.model_construct(
+            _fields_set=value.model_fields_set, **fields
+        )
+    if isinstance(value, list):
+        return [public(item) for item in value]
+    if isinstance(value, dict):
+        return {key: public(item) for key, item in value.items()}
+    return value
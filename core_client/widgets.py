@@ -0,0 +1,206 @@
+import asyncio
+import bisect
+import threading
+import time
+
+from .base.models import Error
+from .base.models.v3 import Widget
+from .batching import MAX_URL_LENGTH, id_chunks
+from .projection import aget_process_list, get_process_list
+
+FIELDS = ("id", "config.reference", "state.runtime_seconds")
+_FILTER = "config,state"
+
+
+def _session_counts(session, collectors):
+    """(current, total) sessions per reference, references sorted."""
+    current = {}
+    total = {}
+    for name in collectors:
+        collector = getattr(session, name, None)
+        if collector is None:
+            continue
+        for active in collector.active.list:
+            current[active.reference] = current.get(active.reference, 0) + 1
+        if collector.summary is None:
+            continue
+        for reference, summary in collector.summary.reference.items():
+            if isinstance(summary, dict):
+                summary = summary.get("total_sessions", 0)
+            total[reference] = total.get(reference, 0) + summary
+    return (
+        (sorted(current), current),
+        (sorted(total), total),
+    )
+
+
+def _prefix_sum(counts, prefix: str) -> int:
+    """Sum of the counts of references starting with a process
+    reference, as the widget endpoint of the Core."""
+    if not prefix:
+        return 0
+    references, values = counts
+    n = bisect.bisect_left(references, prefix)
+    result = 0
+    while n < len(references) and references[n].startswith(prefix):
+        result += values[references[n]]
+        n += 1
+    return result
+
+
+class _WidgetCache:
+    def __init__(
+        self,
+        client,
+        ids: list = None,
+        interval: float = 5.0,
+        collectors: tuple = ("hls",),
+        max_url_length: int = MAX_URL_LENGTH,
+    ):
+        """`Widget` data of public processes, refreshed in bulk.
+
+        A refresh is one `v3_process_get_list` (reference and runtime of
+        the processes, split into URL sized batches of `ids`) and one
+        `v3_session_get`, however many viewers read the widgets. Reads
+        are dict lookups in memory.
+        Args:
+            client (Client | AsyncClient): logged in client
+            ids (list): public process ids, None for all processes
+            interval (float): seconds between refreshes of `start()`
+            collectors (tuple): session collectors counted as viewers
+            max_url_length (int): max. length of a process list URL
+        """
+        self.client = client
+        self.ids = ids
+        self.interval = interval
+        self.collectors = collectors
+        self.max_url_length = max_url_length
+        self.widgets = {}
+        self.refreshed_at = None
+        self.refreshes = 0
+        self.requests = 0
+        self.reads = 0
+        self.misses = 0
+        self.error = None
+
+    def get(self, id: str) -> Widget:
+        """Cached `Widget` of a process, None if it is unknown."""
+        self.reads += 1
+        widget = self.widgets.get(id)
+        if widget is None:
+            self.misses += 1
+        return widget
+
+    def _id_batches(self):
+        if self.ids is None:
+            return [None]
+        return list(
+            id_chunks(
+                self.client.base_url,
+                self.ids,
+                _FILTER,
+                self.max_url_length,
+            )
+        )
+
+    def _store(self, process_lists, session):
+        self.requests += len(process_lists) + 1
+        for response in (*process_lists, session):
+            if isinstance(response, Error):
+                self.error = response
+                return False
+        current, total = _session_counts(session, self.collectors)
+        widgets = {}
+        for processes in process_lists:
+            for process in processes:
+                config, state = process.config, process.state
+                reference = (config.reference if config else None) or ""
+                widgets[process.id] = Widget.model_construct(
+                    current_sessions=_prefix_sum(current, reference),
+                    total_sessions=_prefix_sum(total, reference),
+                    uptime=state.runtime_seconds if state else 0,
+                )
+        self.widgets = widgets
+        self.refreshed_at = time.time()
+        self.refreshes += 1
+        self.error = None
+        return True
+
+    def _list_kwargs(self, ids):
+        return {} if ids is None else {"id": ",".join(ids)}
+
+
+class WidgetCache(_WidgetCache):
+    """Sync widget cache, `start()` refreshes in a daemon thread."""
+
+    _thread = None
+
+    def refresh(self) -> bool:
+        """Refreshes all widgets, False (and `error`) on an API error."""
+        process_lists = [
+            get_process_list(self.client, FIELDS, **self._list_kwargs(ids))
+            for ids in self._id_batches()
+        ]
+        session = self.client.v3_session_get(
+            collectors=",".join(self.collectors)
+        )
+        return self._store(process_lists, session)
+
+    def start(self):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:  # network errors, retried next interval
+                self.error = e
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+
+class AsyncWidgetCache(_WidgetCache):
+    """Async widget cache, see `WidgetCache`; `start()` refreshes in a
+    task, or `refresh` can be added to a `PollScheduler`."""
+
+    _task = None
+
+    async def refresh(self) -> bool:
+        responses = await asyncio.gather(
+            *(
+                aget_process_list(
+                    self.client, FIELDS, **self._list_kwargs(ids)
+                )
+                for ids in self._id_batches()
+            ),
+            self.client.v3_session_get(collectors=",".join(self.collectors)),
+        )
+        return self._store(responses[:-1], responses[-1])
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:  # network errors, retried next interval
+                self.error = e
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,7 +1,7 @@
 from setuptools import find_packages, setup
 
 install_requirements = [
-    "httpx[http2]>=0.23.0",
+    "httpx[http2]>=0.27.0",
     "pydantic>=2.5.2",
     "pydantic-collections>=0.3.0",
 ]
@@ -31,5 +31,10 @@ setup(
     packages=find_packages(exclude=["tests*"]),
     setup_requires=["pytest-runner"],
     install_requires=install_requirements,
+    extras_require={
+        # br and zstd response compression
+        "brotli": ["httpx[brotli]"],
+        "zstd": ["httpx[zstd]>=0.27.0"],
+    },
     tests_require=tests_requirements,
 )
@@ -0,0 +1,62 @@
+import pytest
+
+from core_client import Client
+from core_client.base.models.v3 import Srt, SrtConnectionStats, SrtList
+from core_client.versions import epoch, parse_version, specialize
+
+from .fixtures import srt
+from .stub import StubCore
+
+
+def test_parse_version():
+    assert parse_version("16.11.0") == (16, 11, 0)
+    assert parse_version("v16.9.1-rc1") == (16, 9, 1)
+    assert parse_version("") is None
+    assert epoch((16, 10, 3)) == (16, 10, 0)
+    assert epoch((17, 0, 0)) == (16, 11, 0)
+    assert epoch(None) is None
+
+
+def test_specialize():
+    model = specialize(SrtList, (16, 11, 0))
+    srt_model = model.__element__.annotation
+    assert issubclass(model, SrtList) and issubclass(srt_model, Srt)
+    assert not srt_model.__pydantic_decorators__.model_validators
+    # models without version changes are not copied
+    assert specialize(SrtList, None) is SrtList
+
+
+@pytest.mark.parametrize(
+    "number", ["16.9.1", "16.10.0", "16.10.2", "16.11.0", "16.13.1"]
+)
+def test_srt_get_versions(number):
+    version = parse_version(number)
+    about = {"app": "datarhei-core", "version": {"number": number}}
+    routes = {
+        ("GET", "/api"): (200, about),
+        ("GET", "/api/v3/srt"): (200, [srt(version)]),
+    }
+    with StubCore(routes) as core:
+        client = Client(base_url=core.url, access_token="token")
+        client.login()
+        assert client.decoder.version == version
+        channel = client.v3_srt_get()[0]
+        stats = channel.connections["132881"].stats
+        # the public models, equal to the generic validation
+        assert type(client.v3_srt_get()) is SrtList
+        assert type(channel) is Srt
+        assert type(stats) is SrtConnectionStats
+        assert channel == Srt.model_validate(channel.model_dump())
+        if version < (16, 10, 0):
+            assert channel.name is None
+            assert channel.publisher == {"1f33d538": 132881}
+        else:
+            assert channel.name == "936718e2"
+            assert channel.publisher is None
+        if version < (16, 11, 0):
+            assert stats.sent_unique__bytes == 10
+            assert stats.sent_unique_bytes is None
+        else:
+            assert stats.sent_unique_bytes == 10
+            assert stats.sent_unique__bytes is None
+        client.close()
@@ -0,0 +1,64 @@
+from core_client.base.models.v3 import ProcessList
+from core_client.compact import ProgressStore
+from core_client.decoding import adapter
+
+from .fixtures import process
+
+processes = adapter(ProcessList).validate_python(
+    [process(i) for i in range(20)]
+)
+
+
+def test_progress_store_roundtrip():
+    store = ProgressStore()
+    store.update_processes(processes)
+    assert len(store) == 20
+    for item in processes:
+        assert store.get(item.id) == item.state.progress
+    progress = store.get(processes[0].id)
+    assert progress.inputs[0].avstream.queue == 124
+    assert progress.inputs[1].pix_fmt is None
+    assert progress.inputs[1].sampling_hz == 44100
+    # codec, coder, format, type, ... are stored once
+    assert len(store.strings) < 20
+
+
+def test_progress_store_update_in_place():
+    store = ProgressStore()
+    store.update_processes(processes)
+    size = store.nbytes()
+    store.update_processes(processes)
+    assert store.nbytes() == size
+    progress = processes[1].state.progress.model_copy(
+        update={"outputs": processes[1].state.progress.outputs[:1]}
+    )
+    store.update(processes[1].id, progress)
+    assert store.get(processes[1].id) == progress
+    store.remove(processes[2].id)
+    assert processes[2].id not in store
+    store.update(processes[2].id, processes[2].state.progress)
+    assert store.nbytes() == size
+
+
+def test_progress_store_releases_strings():
+    store = ProgressStore()
+    store.update_processes(processes)
+    size = len(store.strings)
+    progress = processes[0].state.progress
+    for n in range(100):
+        outputs = [
+            io.model_copy(update={"address": f"rtmp://host/{n}"})
+            for io in progress.outputs
+        ]
+        store.update(
+            processes[0].id, progress.model_copy(update={"outputs": outputs})
+        )
+    # replaced addresses are dropped from the string table
+    assert len(store.strings) == size + 1
+    assert store.get(processes[0].id).outputs[0].address == "rtmp://host/99"
+    for item in processes:
+        store.remove(item.id)
+    assert len(store.strings) == 0
+    store.update_processes(processes)
+    assert len(store.strings) == size
+    assert store.get(processes[3].id) == processes[3].state.progress
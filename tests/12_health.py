@@ -0,0 +1,68 @@
+from core_client.base.models.v3 import Process
+from core_client.decoding import adapter
+from core_client.health import (
+    DROPS,
+    LOOPING,
+    SLOW,
+    STALLED,
+    HealthEngine,
+)
+
+from .fixtures import process
+
+PROCESS = adapter(Process).validate_python(process(0))
+
+
+def progress(frame: int, drop: int = 0, speed: float = 1.0, looping=False):
+    progress = PROCESS.state.progress.model_copy(deep=True)
+    progress.frame = frame
+    progress.drop = drop
+    progress.speed = speed
+    progress.fps = 25.0
+    progress.inputs[0].avstream.looping = looping
+    return progress
+
+
+def test_health_healthy():
+    engine = HealthEngine()
+    for second in range(10):
+        health = engine.update("a", progress(25 * second), now=second)
+    assert health.score == 100.0
+    assert health.alerts == frozenset()
+    assert engine.health("a") == health
+
+
+def test_health_alerts():
+    events = []
+    engine = HealthEngine(
+        on_alert=lambda *event: events.append(event), slow_seconds=3
+    )
+    for second in range(10):
+        engine.update("a", progress(25 * second, speed=0.8), now=second)
+    assert SLOW in engine.health("a").alerts
+    # frame counter stalls
+    for second in range(10, 20):
+        health = engine.update("a", progress(250, speed=0.8), now=second)
+    assert STALLED in health.alerts and health.score == 0.0
+    # recovers, drops frames and loops
+    for second in range(20, 30):
+        health = engine.update(
+            "a",
+            progress(25 * second, drop=10 * second, looping=True),
+            now=second,
+        )
+    assert health.alerts == {DROPS, LOOPING}
+    assert 0 < health.score < 100
+    assert events[:2] == [("a", SLOW, True), ("a", STALLED, True)]
+    assert ("a", STALLED, False) in events and ("a", SLOW, False) in events
+
+
+def test_health_restart():
+    engine = HealthEngine()
+    engine.update("a", progress(1000, drop=500), now=0)
+    health = engine.update("a", progress(25, drop=0), now=1)
+    assert health.drop_rate == 0.0
+    engine.update_processes([PROCESS], now=2)
+    assert len(engine) == 2
+    engine.remove("a")
+    assert engine.health("a") is None
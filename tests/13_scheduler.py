@@ -0,0 +1,100 @@
+import asyncio
+
+from core_client import AsyncClient
+from core_client.scheduler import PollScheduler
+
+from .stub import StubCore
+
+
+async def test_scheduler_adapts_interval():
+    snapshots = iter([1, 1, 1, 1, 2, 3, 4, 5, 6, 7] + [7] * 100)
+
+    async def poll():
+        return next(snapshots)
+
+    scheduler = PollScheduler(client=None)
+    job = scheduler.add(
+        "poll", poll, interval=0.02, min_interval=0.01, max_interval=0.1
+    )
+    scheduler.start()
+    await asyncio.sleep(0.15)
+    assert job.interval > 0.02
+    await asyncio.sleep(0.3)
+    await scheduler.stop()
+    assert job.runs >= 8 and job.changes >= 5
+
+
+async def test_scheduler_priority():
+    order = []
+
+    def poll(name):
+        async def call():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+        return call
+
+    scheduler = PollScheduler(client=None, max_concurrency=1)
+    for priority in range(3):
+        scheduler.add(
+            f"job{priority}",
+            poll(priority),
+            interval=10,
+            priority=priority,
+            jitter=0,
+        )
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    scheduler.remove("job0")
+    await scheduler.stop()
+    assert order == [2, 1, 0]
+    assert list(scheduler.jobs) == ["job1", "job2"]
+
+
+async def test_scheduler_client_method():
+    results = []
+    with StubCore({("GET", "/api/v3/srt"): (200, [])}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        scheduler = PollScheduler(client)
+        scheduler.add(
+            "srt",
+            "v3_srt_get",
+            interval=0.02,
+            callback=lambda job, result: results.append(result),
+        )
+        scheduler.add("error", "v3_rtmp_get", interval=0.02)
+        scheduler.start()
+        # the first call also sets up the connection pool
+        for _ in range(100):
+            if len(results) >= 3:
+                break
+            await asyncio.sleep(0.02)
+        await scheduler.stop()
+        await client.aclose()
+    assert len(results) >= 3 and len(results[0]) == 0
+    # unchanged results back off
+    assert scheduler.jobs["srt"].interval > 0.02
+
+
+async def test_scheduler_remove_ready_job():
+    runs = []
+
+    def poll(name, delay):
+        async def call():
+            runs.append(name)
+            await asyncio.sleep(delay)
+
+        return call
+
+    scheduler = PollScheduler(client=None, max_concurrency=1)
+    scheduler.add("slow", poll("slow", 0.1), interval=10, jitter=0)
+    scheduler.add("queued", poll("queued", 0), interval=10, jitter=0)
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    # due, but waiting for the running job
+    assert runs == ["slow"] and len(scheduler._ready) == 1
+    scheduler.remove("queued")
+    assert scheduler._ready == []
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+    assert runs == ["slow"]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from core_client import AsyncClient, Client
+from core_client.lanes import BULK, CONTROL, DEFAULT, endpoint_lane
+
+from .stub import StubCore
+
+
+def slow_list(handler):
+    time.sleep(0.2)
+    return 200, []
+
+
+ROUTES = {
+    ("GET", "/api/v3/process"): slow_list,
+    ("PUT", "/api/v3/process/abc/command"): (200, "OK"),
+}
+
+
+def test_endpoint_lane():
+    assert endpoint_lane("v3_process_get_list") == BULK
+    assert endpoint_lane("v3_metrics_post") == BULK
+    assert endpoint_lane("v3_process_put_command") == CONTROL
+    assert endpoint_lane("v3_config_reload") == CONTROL
+    assert endpoint_lane("v3_process_get") == DEFAULT
+
+
+def test_lanes_control_preempts_bulk():
+    with StubCore(ROUTES) as core:
+        client = Client(base_url=core.url, access_token="t", lanes={BULK: 1})
+        threads = [
+            threading.Thread(target=client.v3_process_get_list)
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        assert client.v3_process_put_command(id="abc", command="restart")
+        assert time.monotonic() - start < 0.15
+        for thread in threads:
+            thread.join()
+        client.close()
+    stats = client.lane_stats
+    assert stats[BULK].requests == 3 and stats[BULK].waits == 2
+    assert stats[BULK].max_wait_seconds >= 0.15
+    assert stats[CONTROL].requests == 1 and stats[CONTROL].waits == 0
+    assert stats[BULK].in_flight == 0
+
+
+async def test_async_lanes_control_preempts_bulk():
+    with StubCore(ROUTES) as core:
+        client = AsyncClient(
+            base_url=core.url, access_token="t", lanes={BULK: 1}
+        )
+        bulk = [
+            asyncio.ensure_future(client.v3_process_get_list())
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        await client.v3_process_put_command(id="abc", command="restart")
+        assert time.monotonic() - start < 0.15
+        await asyncio.gather(*bulk)
+        await client.aclose()
+    assert client.lane_stats[BULK].waits == 2
+    assert client.lane_stats[CONTROL].waits == 0
@@ -0,0 +1,123 @@
+import base64
+import json
+import time
+
+import pytest
+
+from core_client import Client
+from core_client.token_store import (
+    FileTokenStore,
+    MemoryTokenStore,
+    TokenStore,
+    token_key,
+)
+
+from .stub import StubCore
+
+
+def jwt(exp: float) -> str:
+    payload = base64.b64encode(json.dumps({"exp": int(exp)}).encode())
+    return f"e30=.{payload.decode()}.sig"
+
+
+def routes(access_ttl: float = 3600):
+    return {
+        ("GET", "/api"): (
+            200,
+            {"auths": ["localjwt"], "version": {"number": "16.11.0"}},
+        ),
+        ("POST", "/api/login"): lambda handler: (
+            200,
+            {
+                "access_token": jwt(time.time() + access_ttl),
+                "refresh_token": jwt(time.time() + 86400),
+            },
+        ),
+        ("GET", "/api/login/refresh"): lambda handler: (
+            200,
+            {"access_token": jwt(time.time() + 3600)},
+        ),
+    }
+
+
+def login(core, store):
+    client = Client(
+        base_url=core.url,
+        username="admin",
+        password="datarhei",
+        token_store=store,
+    )
+    client.login()
+    return client
+
+
+def paths(core):
+    return [path for _, path in core.requests]
+
+
+def test_file_token_store(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    with StubCore(routes()) as core:
+        first = login(core, FileTokenStore(path))
+        assert paths(core) == ["/api", "/api/login"]
+        second = login(core, FileTokenStore(path))
+        assert paths(core) == ["/api", "/api/login"]
+        # the cached About does not hide the endpoint method
+        assert second.about().version.number == "16.11.0"
+    assert second.access_token == first.access_token
+    assert second._about.version.number == "16.11.0"
+    assert second.decoder.version == (16, 11, 0)
+    assert (tmp_path / "tokens.json").stat().st_mode & 0o777 == 0o600
+    secret = (tmp_path / "tokens.json.key").read_bytes()
+    assert len(secret) == 32
+    assert (tmp_path / "tokens.json.key").stat().st_mode & 0o777 == 0o600
+    assert FileTokenStore(path).secret() == secret
+    entry = json.loads((tmp_path / "tokens.json").read_text())
+    assert "datarhei" not in json.dumps(entry)
+
+
+def test_token_store_refresh_near_expiry():
+    store = MemoryTokenStore()
+    with StubCore(routes(access_ttl=30)) as core:
+        first = login(core, store)
+        second = login(core, store)
+        assert paths(core) == ["/api", "/api/login", "/api/login/refresh"]
+    assert second.access_token != first.access_token
+    key = store.key(core.url, username="admin", password="datarhei")
+    assert store.get(key)["access_token"] == second.access_token
+
+
+def test_token_store_key_includes_password():
+    store = MemoryTokenStore()
+    with StubCore(routes()) as core:
+        login(core, store)
+        client = Client(
+            base_url=core.url,
+            username="admin",
+            password="wrong",
+            token_store=store,
+        )
+        client.login()
+        # the tokens of another password are not reused
+        assert paths(core) == ["/api", "/api/login"] * 2
+    assert len(store._entries) == 2
+    assert store.key(core.url) is None
+    assert store.key(core.url, auth0_token="a") != (
+        store.key(core.url, auth0_token="b")
+    )
+    # keyed by the secret of the store
+    assert token_key(b"a", core.url, "admin", "x") != (
+        token_key(b"b", core.url, "admin", "x")
+    )
+    assert MemoryTokenStore().key(core.url, "admin", "x") != (
+        store.key(core.url, "admin", "x")
+    )
+
+
+def test_token_store_is_abstract():
+    class Incomplete(TokenStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,112 @@
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+
+from core_client import AsyncClient, Client
+from core_client.lanes import BULK
+
+from .stub import StubCore
+
+ACCESS_TOKEN = "e30=.{}.sig".format(
+    base64.b64encode(
+        json.dumps({"exp": int(time.time()) + 600}).encode()
+    ).decode()
+)
+ROUTES = {
+    ("GET", "/api"): (200, {"auths": ["localjwt"]}),
+    ("POST", "/api/login"): (
+        200,
+        {"access_token": ACCESS_TOKEN, "refresh_token": ACCESS_TOKEN},
+    ),
+    ("GET", "/api/v3/fs"): (200, []),
+}
+
+
+def test_uds(tmp_path):
+    uds = str(tmp_path / "core.sock")
+    with StubCore(ROUTES, uds=uds) as core:
+        client = Client(
+            base_url=core.url, uds=uds, username="admin", password="x"
+        )
+        assert client.login().access_token == ACCESS_TOKEN
+        client.v3_fs_get_list()
+        # one-off connection of a call with custom retries
+        client.v3_fs_get_list(retries=1)
+        client.close()
+    assert [path for _, path in core.requests] == [
+        "/api",
+        "/api/login",
+        "/api/v3/fs",
+        "/api/v3/fs",
+    ]
+
+
+async def test_async_uds(tmp_path):
+    uds = str(tmp_path / "core.sock")
+    with StubCore(ROUTES, uds=uds) as core:
+        client = AsyncClient(
+            base_url=core.url, uds=uds, username="admin", password="x"
+        )
+        client.login()
+        await client.v3_fs_get_list()
+        await client.aclose()
+    assert len(core.requests) == 3
+
+
+def test_transport_factory():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        status, body = ROUTES.get((request.method, request.url.path))
+        return httpx.Response(status, json=body)
+
+    factories = []
+
+    def factory(retries, asynchronous):
+        factories.append((retries, asynchronous))
+        return httpx.MockTransport(handler)
+
+    client = Client(
+        base_url="http://core",
+        username="admin",
+        password="x",
+        transport_factory=factory,
+    )
+    client.login()
+    client.v3_fs_get_list()
+    client.v3_fs_get_list(retries=1)
+    assert requests == ["/api", "/api/login", "/api/v3/fs"] + ["/api/v3/fs"]
+    assert factories == [(3, False), (1, False)]
+
+
+def test_async_pool_per_event_loop():
+    with StubCore(ROUTES) as core:
+        client = AsyncClient(
+            base_url=core.url, access_token=ACCESS_TOKEN, lanes={BULK: 1}
+        )
+
+        async def calls():
+            await asyncio.gather(
+                client.v3_fs_get_list(), client.v3_fs_get_list()
+            )
+            return client._http_client
+
+        # each asyncio.run() has its own loop, pool and lane condition
+        first = asyncio.run(calls())
+        assert asyncio.run(calls()) is not first
+        assert client.lane_stats[BULK].waits == 2
+
+        async def scoped():
+            async with client:
+                await client.v3_fs_get_list()
+
+        asyncio.run(scoped())
+        assert client._http_client is None
+        with Client(base_url=core.url, access_token=ACCESS_TOKEN) as client:
+            client.v3_fs_get_list()
+        assert client._http_client is None
+    assert len(core.requests) == 6
@@ -0,0 +1,157 @@
+import importlib
+import inspect
+import json
+import sys
+import warnings
+
+import httpx
+import pytest
+
+from core_client import AsyncClient, Client
+from core_client.base.api import ENDPOINTS
+from core_client.base.models import Error
+from core_client.endpoints import json_body
+from core_client.base.models.v3 import (
+    Metadata,
+    ProcessConfig,
+    ProcessState,
+)
+
+from .fixtures import process
+
+ID = "restreamer-ui:ingest:00000000-5491-455f-b7ee-6b47d8842f74"
+
+
+def mock_client(routes: dict, client_class=Client):
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.raw_path.decode()))
+        status, body = routes.get(
+            (request.method, request.url.path), (404, None)
+        )
+        if body is None:
+            body = {"code": 404, "message": "Not Found", "details": []}
+        return httpx.Response(status, json=body)
+
+    client = client_class(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, requests
+
+
+def test_query_omits_empty_params():
+    client, requests = mock_client({("GET", "/api/v3/process"): (200, [])})
+    client.v3_process_get_list()
+    client.v3_process_get_list(filter="state", id=f"{ID},b c")
+    assert requests == [
+        ("GET", "/api/v3/process"),
+        (
+            "GET",
+            f"/api/v3/process?filter=state&id={ID.replace(':', '%3A')},b%20c",
+        ),
+    ]
+
+
+def test_path_params_are_encoded():
+    data = process(0)
+    client, requests = mock_client(
+        {
+            ("GET", f"/api/v3/process/{ID}/state"): (200, data["state"]),
+            ("GET", "/api/v3/fs/disk/a b/c.txt"): (200, "x"),
+        }
+    )
+    assert type(client.v3_process_get_state(id=ID)) is ProcessState
+    client.v3_fs_get_file(name="disk", path="a b/c.txt")
+    assert requests == [
+        ("GET", f"/api/v3/process/{ID.replace(':', '%3A')}/state"),
+        ("GET", "/api/v3/fs/disk/a%20b/c.txt"),
+    ]
+
+
+async def test_async_body_and_error():
+    data = process(0)
+    client, requests = mock_client(
+        {("PUT", f"/api/v3/process/{ID}"): (200, data["config"])}, AsyncClient
+    )
+    config = ProcessConfig.model_validate(data["config"])
+    assert (
+        type(await client.v3_process_put(id=ID, config=config))
+        is ProcessConfig
+    )
+    assert type(await client.v3_process_get(id="unknown")) is Error
+    assert requests[1] == ("GET", "/api/v3/process/unknown")
+
+
+def test_arguments():
+    client, _ = mock_client({})
+    with pytest.raises(TypeError, match="unexpected keyword argument 'ids'"):
+        client.v3_process_get_list(ids=ID)
+    with pytest.raises(
+        TypeError, match="missing required keyword argument 'collectors'"
+    ):
+        client.v3_session_get()
+    signature = inspect.signature(Client.v3_process_get)
+    assert list(signature.parameters) == [
+        "self",
+        "id",
+        "filter",
+        "retries",
+        "timeout",
+    ]
+    assert "filter (str)" in Client.v3_process_get.__doc__
+
+
+def test_api_modules():
+    # the deprecated modules warn on (re-)import
+    sys.modules.pop("core_client.base.api.v3_process_get", None)
+    with pytest.warns(DeprecationWarning, match="v3_process_get"):
+        from core_client.base.api.v3_process_get import _build_request, sync
+
+    assert sync.__self__ is ENDPOINTS["v3_process_get"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        for name, endpoint in ENDPOINTS.items():
+            module = importlib.import_module(f"core_client.base.api.{name}")
+            assert module.asyncio.__self__ is endpoint
+    assert (
+        _build_request(Client(base_url="http://core")._client_model(), id="a")[
+            0
+        ]["url"]
+        == "http://core/api/v3/process/a"
+    )
+    assert all(
+        hasattr(Client, name) and hasattr(AsyncClient, name)
+        for name in ENDPOINTS
+    )
+
+
+def test_json_body():
+    client = Client(base_url="http://core")._client_model()
+    data = process(0)["config"]
+    data["limits"] = None
+    config = ProcessConfig.model_validate(data)
+    put = ENDPOINTS["v3_process_put"]
+    request = put._build_request(client, id="a", config=config)[0]
+    assert "json" not in request
+    body = json.loads(request["content"])
+    assert body == json.loads(config.model_dump_json())
+    # explicit nulls clear the fields on Core
+    assert body["limits"] is None
+    assert "limits" not in json.loads(json_body(config, exclude_none=True))
+    request = ENDPOINTS["v3_process_put_metadata"]._build_request(
+        client, id="a", key="ui", data=Metadata(data={"name": None})
+    )[0]
+    assert request["content"] == b'{"name":null}'
+    # dicts are sent as they are
+    request = put._build_request(client, id="a", config=data)[0]
+    assert json.loads(request["content"]) == data
+    request = ENDPOINTS["v3_process_put_command"]._build_request(
+        client, id="a", command="start"
+    )[0]
+    assert request["content"] == b'{"command":"start"}'
+    assert client.headers["content-type"] == "application/json"
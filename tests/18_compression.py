@@ -0,0 +1,86 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from core_client import AsyncClient, Client, compression
+from core_client.compression import accept_encoding
+from core_client.streaming import aiter_process_list, iter_process_list
+
+from .fixtures import process
+
+BODY = json.dumps([process(i) for i in range(20)]).encode()
+
+
+def mock_client(client_class=Client, **kwargs):
+    headers = []
+
+    def handler(request):
+        headers.append(request.headers["accept-encoding"])
+        # streamed as by a network transport, content= is read at once
+        if "gzip" in request.headers["accept-encoding"]:
+            return httpx.Response(
+                200,
+                stream=httpx.ByteStream(gzip.compress(BODY)),
+                headers={"content-encoding": "gzip"},
+            )
+        return httpx.Response(200, stream=httpx.ByteStream(BODY))
+
+    client = client_class(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+        **kwargs,
+    )
+    return client, headers
+
+
+def test_accept_encoding():
+    assert accept_encoding(("gzip", "deflate")) == "gzip, deflate;q=0.9"
+    assert accept_encoding(()) == "identity"
+    with pytest.raises(ValueError):
+        accept_encoding(("lzma",))
+    # encodings without an installed decoder package are skipped
+    expected = "br, gzip;q=0.9" if compression.brotli else "gzip"
+    assert accept_encoding(("br", "gzip")) == expected
+    expected = "zstd, gzip;q=0.9" if compression.zstandard else "gzip"
+    assert accept_encoding(("zstd", "gzip")) == expected
+
+
+def test_gzip_response():
+    client, headers = mock_client()
+    res = client.v3_process_get_list()
+    assert len(res) == 20
+    assert "gzip" in headers[0]
+    stats = client.transfer_stats
+    assert stats.responses == 1 and stats.encodings == {"gzip": 1}
+    assert stats.body_bytes == len(BODY)
+    assert stats.wire_bytes == len(gzip.compress(BODY))
+    assert stats.ratio > 5
+
+
+def test_compression_disabled():
+    client, headers = mock_client(compression=())
+    client.v3_process_get_list()
+    assert headers == ["identity"]
+    assert client.transfer_stats.encodings == {"identity": 1}
+    assert client.transfer_stats.ratio == 1.0
+
+
+def test_streaming_gzip_response():
+    client, _ = mock_client()
+    assert len(list(iter_process_list(client))) == 20
+    stats = client.transfer_stats
+    assert stats.body_bytes == len(BODY)
+    assert stats.saved_bytes == len(BODY) - len(gzip.compress(BODY))
+
+
+async def test_async_streaming_gzip_response():
+    client, _ = mock_client(AsyncClient)
+    assert len([p async for p in aiter_process_list(client)]) == 20
+    assert await client.v3_process_get_list()
+    stats = client.transfer_stats
+    assert stats.responses == 2 and stats.body_bytes == 2 * len(BODY)
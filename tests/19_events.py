@@ -0,0 +1,162 @@
+import json
+
+import pytest
+from httpx import HTTPError
+
+from core_client import AsyncClient, Client
+from core_client.base.models.v3 import ProcessList
+from core_client.events import (
+    ADDED,
+    REMOVED,
+    STATE,
+    UPDATED,
+    Event,
+    EventStreamDecoder,
+    ProcessChange,
+    aprocess_changes,
+    diff_processes,
+    process_change,
+)
+
+from .fixtures import process
+from .stub import StubCore
+
+ID = "restreamer-ui:ingest:a"
+
+
+def event(ts, message, level="info", component="process", **data):
+    return {
+        "ts": ts,
+        "level": level,
+        "event": component,
+        "message": message,
+        "data": {"id": ID, **data},
+    }
+
+
+def sse(id, value) -> bytes:
+    return f"id: {id}\ndata: {json.dumps(value)}\n\n".encode()
+
+
+def event_stream(connections: list, content_type="text/event-stream"):
+    """Route sending one body per connection, then closing it."""
+    requests = []
+
+    def route(handler):
+        requests.append((dict(handler.headers), json.loads(handler.body)))
+        body = connections[min(len(requests), len(connections)) - 1]
+        handler.send_response(200)
+        handler.send_header("content-type", content_type)
+        handler.end_headers()
+        for line in body.splitlines(keepends=True):
+            handler.wfile.write(line)
+            handler.wfile.flush()
+        handler.close_connection = True
+
+    return route, requests
+
+
+def test_decoder_chunks():
+    body = (
+        b": keep-alive\nretry: 250\n\n"
+        + sse(1, event(1, "Process added"))
+        + b"event: process\ndata: first\ndata: second\n\n"
+        + 'id: 3\r\ndata: {"message": "\xe4"}\r\n\r\n'.encode()
+    )
+    for size in (1, 3, len(body)):
+        decoder = EventStreamDecoder()
+        events = []
+        for n in range(0, len(body), size):
+            events += decoder.feed(body[n:][:size])
+        assert decoder.retry == 0.25
+        assert events == [
+            Event("1", 1, "info", "process", "Process added", {"id": ID}),
+            Event("1", None, None, "process", "first\nsecond", {}),
+            Event("3", None, None, None, "\xe4", {}),
+        ]
+    decoder = EventStreamDecoder(max_event_bytes=8)
+    with pytest.raises(ValueError):
+        decoder.feed(b"data: " + b"x" * 10)
+
+
+def test_process_change():
+    assert process_change(
+        Event("1", 5, "info", "process", "Process deleted", {"id": ID})
+    ) == ProcessChange(ID, REMOVED, None, 5)
+    assert process_change(
+        Event("2", 6, "info", "process", "", {"id": ID, "state": "running"})
+    ) == ProcessChange(ID, STATE, "running", 6)
+    assert process_change(Event("3", 7, "info", "http", "", {})) is None
+
+
+def test_diff_processes():
+    data = [process(i) for i in range(3)]
+    changes, snapshot = diff_processes({}, ProcessList.model_validate(data))
+    assert [change.change for change in changes] == [ADDED] * 3
+    data[0]["state"]["exec"] = "failed"
+    data[1]["config"]["reference"] = "changed"
+    changes, snapshot = diff_processes(
+        snapshot, ProcessList.model_validate(data[:2]), ts=10
+    )
+    assert sorted(changes) == sorted(
+        [
+            ProcessChange(data[0]["id"], STATE, "failed", 10),
+            ProcessChange(data[1]["id"], UPDATED, "running", 10),
+            ProcessChange(data[2]["id"], REMOVED, None, 10),
+        ]
+    )
+    assert list(snapshot) == [data[0]["id"], data[1]["id"]]
+
+
+def test_events_reconnect_resume():
+    route, requests = event_stream(
+        [
+            b"retry: 10\n\n"
+            + sse(1, event(1, "Process added"))
+            + sse(2, event(2, "", state="running")),
+            sse(3, event(3, "Process deleted")),
+        ]
+    )
+    with StubCore({("POST", "/api/v3/events"): route}) as core:
+        client = Client(base_url=core.url, access_token="token")
+        events = client.events([{"event": "process"}])
+        received = [next(events) for _ in range(3)]
+        events.close()
+    assert [event.id for event in received] == ["1", "2", "3"]
+    assert "last-event-id" not in requests[0][0]
+    assert requests[1][0]["last-event-id"] == "2"
+    assert requests[1][1] == {"filters": [{"event": "process"}]}
+
+
+async def test_async_events_json_lines():
+    lines = [json.dumps(event(ts, "", state="running")) for ts in (1, 2)]
+    route, requests = event_stream(
+        [
+            "\n".join(lines).encode() + b"\n",
+            # resumed stream repeats the last event
+            "\n".join(
+                lines[1:] + [json.dumps(event(3, "Process updated"))]
+            ).encode(),
+        ],
+        content_type="application/x-json-stream",
+    )
+    with StubCore({("POST", "/api/v3/events"): route}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        events = client.events(reconnect_delay=0.01)
+        changes = aprocess_changes(events)
+        received = [await changes.__anext__() for _ in range(3)]
+        await events.aclose()
+        await client.aclose()
+    assert received == [
+        ProcessChange(ID, STATE, "running", 1),
+        ProcessChange(ID, STATE, "running", 2),
+        ProcessChange(ID, UPDATED, None, 3),
+    ]
+    assert len(requests) == 2 and requests[0][1] == {"filters": []}
+
+
+def test_events_not_supported():
+    with StubCore() as core:
+        client = Client(base_url=core.url, access_token="token")
+        with pytest.raises(HTTPError, match="404"):
+            next(client.events())
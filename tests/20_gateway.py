@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+
+from core_client import AsyncClient
+from core_client.gateway import Gateway
+
+from .fixtures import process
+
+ID = "restreamer-ui:ingest:a"
+VIEWER = {"authorization": "Bearer viewer"}
+
+
+def upstream(delay: float = 0.02):
+    """AsyncClient on a mock Core, and its received requests."""
+    requests = []
+    state = process(0)["state"]
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(delay)
+        if request.url.path.startswith("/api/v3/widget/"):
+            return httpx.Response(200, json={"uptime": len(requests)})
+        if request.headers.get("authorization") not in (
+            "Bearer token",
+            VIEWER["authorization"],
+        ):
+            return httpx.Response(
+                401,
+                json={"code": 401, "message": "Unauthorized", "details": []},
+            )
+        if request.method == "GET" and request.url.path.endswith("/state"):
+            return httpx.Response(200, json={**state, "time": len(requests)})
+        if request.method == "GET" and request.url.path == "/api/v3/session":
+            return httpx.Response(200, json={})
+        if request.method == "PUT":
+            return httpx.Response(200, json="OK")
+        return httpx.Response(
+            404, json={"code": 404, "message": "Not Found", "details": []}
+        )
+
+    client = AsyncClient(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, requests
+
+
+def viewer(gateway: Gateway, headers: dict = VIEWER):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=gateway),
+        base_url="http://gateway",
+        headers=headers,
+    )
+
+
+async def test_single_flight():
+    client, requests = upstream()
+    gateway = Gateway(client)
+    async with viewer(gateway) as http:
+        responses = await asyncio.gather(
+            *(http.get(f"/api/v3/process/{ID}/state") for _ in range(200))
+        )
+        # the miss checked the credentials of the caller
+        assert len(requests) == 1
+        assert requests[0].headers["authorization"] == "Bearer viewer"
+        assert {r.json()["time"] for r in responses} == {1}
+        response = await http.get(f"/api/v3/process/{ID}/state")
+        assert response.headers["x-cache"] == "HIT"
+        stats = (await http.get("/_gateway/stats")).json()
+    assert stats["v3_process_get_state"] == {
+        "hits": 1,
+        "stale": 0,
+        "misses": 200,
+        "coalesced": 199,
+        "errors": 0,
+        "upstream": 1,
+        "hit_rate": round(1 / 201, 4),
+    }
+
+
+async def test_stale_while_revalidate():
+    client, requests = upstream()
+    gateway = Gateway(client, ttl={"v3_process_get_state": 0.05}, stale=10)
+    async with viewer(gateway) as http:
+        url = f"/api/v3/process/{ID}/state"
+        assert (await http.get(url)).headers["x-cache"] == "MISS"
+        await asyncio.sleep(0.06)
+        responses = await asyncio.gather(*(http.get(url) for _ in range(20)))
+        # served at once, one background refresh
+        assert {r.headers["x-cache"] for r in responses} == {"STALE"}
+        assert {r.json()["time"] for r in responses} == {1}
+        await asyncio.sleep(0.04)
+        assert len(requests) == 2
+        assert requests[1].headers["authorization"] == "Bearer token"
+        response = await http.get(url)
+    assert response.headers["x-cache"] == "HIT"
+    assert response.json()["time"] == 2
+
+
+async def test_write_pass_through():
+    client, requests = upstream(delay=0)
+    gateway = Gateway({"core1": client})
+    async with viewer(gateway) as http:
+        url = f"/core1/api/v3/process/{ID}/state"
+        await http.get(url)
+        response = await http.put(
+            f"/core1/api/v3/process/{ID}/command",
+            json={"command": "stop"},
+        )
+        assert response.json() == "OK"
+        assert requests[1].url.path == f"/api/v3/process/{ID}/command"
+        assert requests[1].headers["authorization"] == "Bearer viewer"
+        assert requests[1].content == b'{"command":"stop"}'
+        # the write dropped the cached state
+        assert (await http.get(url)).headers["x-cache"] == "MISS"
+        # query parameters are part of the key
+        await http.get("/core1/api/v3/session?collectors=hls,rtmp")
+        response = await http.get("/core1/api/v3/session?collectors=hls")
+        assert response.headers["x-cache"] == "MISS"
+        assert (await http.get("/core2/api/v3/session")).status_code == 404
+    assert len(requests) == 5
+
+
+async def test_callers_need_credentials():
+    client, requests = upstream(delay=0)
+    gateway = Gateway(client, auth_ttl=0.05)
+    url = f"/api/v3/process/{ID}/state"
+    async with viewer(gateway, headers={}) as http:
+        assert (await http.get(url, headers=VIEWER)).status_code == 200
+        # cached entries are not served without credentials
+        response = await http.get(url)
+        assert response.status_code == 401 and len(requests) == 1
+        response = await http.get(url, headers={"authorization": "Bearer x"})
+        assert response.status_code == 401 and len(requests) == 2
+        response = await http.get(url, headers=VIEWER)
+        assert response.headers["x-cache"] == "HIT" and len(requests) == 2
+        # checked again after auth_ttl
+        await asyncio.sleep(0.06)
+        response = await http.get(url, headers=VIEWER)
+        assert response.headers["x-cache"] == "MISS" and len(requests) == 3
+        # the widget is public
+        response = await http.get(f"/api/v3/widget/process/{ID}")
+        assert response.status_code == 200
+        assert requests[3].headers["authorization"] == "Bearer token"
+
+
+async def test_write_drops_process_and_widget():
+    client, requests = upstream(delay=0)
+    gateway = Gateway(client)
+    urls = [
+        f"/api/v3/process/{ID}/state",
+        f"/api/v3/process/{ID}d/state",
+        f"/api/v3/widget/process/{ID}",
+    ]
+    async with viewer(gateway) as http:
+        for url in urls:
+            await http.get(url)
+        await http.put(f"/api/v3/process/{ID}", json={})
+        responses = [await http.get(url) for url in urls]
+    assert [r.headers["x-cache"] for r in responses] == ["MISS", "HIT", "MISS"]
@@ -0,0 +1,101 @@
+import httpx
+
+from core_client import AsyncClient, Client
+from core_client.base.models.v3 import Widget
+from core_client.widgets import AsyncWidgetCache, WidgetCache
+
+from .fixtures import process
+
+PROCESSES = [process(i) for i in range(30)]
+
+
+def active(reference: str):
+    return {
+        "id": f"hls:{reference}",
+        "reference": reference,
+        "created_at": 1662548810,
+        "local": "",
+        "remote": "",
+        "extra": "",
+        "bytes_rx": 0,
+        "bytes_tx": 0,
+        "bandwidth_rx_kbit": 0,
+        "bandwidth_tx_kbit": 0,
+    }
+
+
+SESSION = {
+    "hls": {
+        "active": {
+            "list": [active("00000001"), active("00000001/sub"), active("x")],
+            "sessions": 3,
+            "bandwidth_rx_mbit": 0,
+            "bandwidth_tx_mbit": 0,
+            "max_sessions": 0,
+            "max_bandwidth_rx_mbit": 0,
+            "max_bandwidth_tx_mbit": 0,
+        },
+        "summary": {
+            "remote": {},
+            "local": {},
+            "reference": {
+                "00000001": {"total_sessions": 10},
+                "00000002": {"total_sessions": 4},
+            },
+            "sessions": 14,
+            "traffic_rx_mb": 0,
+            "traffic_tx_mb": 0,
+        },
+    }
+}
+
+
+def mock_client(client_class=Client):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url)
+        if request.url.path == "/api/v3/session":
+            return httpx.Response(200, json=SESSION)
+        ids = request.url.params.get("id")
+        processes = [
+            p for p in PROCESSES if ids is None or p["id"] in ids.split(",")
+        ]
+        return httpx.Response(200, json=processes)
+
+    client = client_class(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, requests
+
+
+def test_refresh_and_reads():
+    client, requests = mock_client()
+    cache = WidgetCache(client)
+    assert cache.refresh()
+    assert len(cache.widgets) == 30
+    for _ in range(1000):
+        widget = cache.get(PROCESSES[1]["id"])
+    assert widget == Widget(current_sessions=2, total_sessions=10, uptime=48)
+    assert cache.get(PROCESSES[2]["id"]).total_sessions == 4
+    assert cache.get("unknown") is None
+    assert (cache.reads, cache.misses) == (1002, 1)
+    # one list and one session call, whatever the number of reads
+    assert len(requests) == cache.requests == 2
+    assert requests[0].params["filter"] == "config,state"
+    assert requests[1].params["collectors"] == "hls"
+
+
+async def test_async_batches():
+    client, requests = mock_client(AsyncClient)
+    ids = [p["id"] for p in PROCESSES[:20]]
+    cache = AsyncWidgetCache(client, ids=ids, max_url_length=300)
+    assert await cache.refresh()
+    assert sorted(cache.widgets) == sorted(ids)
+    lists = [url for url in requests if url.path == "/api/v3/process"]
+    assert len(lists) > 1 and all(len(str(url)) <= 300 for url in lists)
+    assert cache.requests == len(lists) + 1
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import httpx
+
+from core_client import AsyncClient
+from core_client.base.models import Error
+from core_client.keyframes import KeyframeHarvester
+
+ERROR_FRAME = b"\xff\xd8error"
+
+
+def mock_client(delay: float = 0.01):
+    stats = {"requests": 0, "running": 0, "max_running": 0}
+
+    async def handler(request):
+        stats["requests"] += 1
+        stats["running"] += 1
+        stats["max_running"] = max(stats["max_running"], stats["running"])
+        await asyncio.sleep(delay)
+        stats["running"] -= 1
+        _, _, _, _, id, _, input_id, _, name = request.url.path.split("/")
+        if id == "missing":
+            return httpx.Response(
+                404, json={"code": 404, "message": "Not Found", "details": []}
+            )
+        # odd processes show the same error frame
+        n = int(id.rpartition("-")[2])
+        data = ERROR_FRAME if n % 2 else f"{id}/{input_id}/{name}".encode()
+        return httpx.Response(
+            200, content=data, headers={"content-type": "image/jpeg"}
+        )
+
+    client = AsyncClient(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, stats
+
+
+async def test_harvest():
+    client, stats = mock_client()
+    harvester = KeyframeHarvester(client, concurrency=8)
+    inputs = [(f"proc-{n}", "in") for n in range(100)] + [("missing", "in")]
+    keyframes = [k async for k in harvester.harvest(inputs + inputs[:10])]
+    assert len(keyframes) == 101 and stats["requests"] == 101
+    assert stats["max_running"] == 8
+    errors = [k for k in keyframes if k.error is not None]
+    assert len(errors) == 1 and isinstance(errors[0].error, Error)
+    assert harvester.get("proc-0", "in") == b"proc-0/in/last.jpg"
+    # 50 odd processes share one stored error frame
+    assert harvester.duplicates == 49
+    assert harvester.stored_bytes == len(ERROR_FRAME) + sum(
+        len(f"proc-{n}/in/last.jpg") for n in range(0, 100, 2)
+    )
+
+    keyframes = [k async for k in harvester.harvest(inputs[:5])]
+    assert all(k.cached and not k.changed for k in keyframes)
+    keyframes = [k async for k in harvester.harvest(inputs[:5], refresh=True)]
+    assert not any(k.cached or k.changed for k in keyframes)
+    assert stats["requests"] == 106
+    harvester.invalidate()
+    assert harvester.stored_bytes == 0
+
+
+async def test_streams_and_shares_flights():
+    client, stats = mock_client(delay=0.05)
+    harvester = KeyframeHarvester(client)
+    inputs = [(f"proc-{n}", "in") for n in range(4)]
+    first, second = await asyncio.gather(
+        harvester.harvest(inputs).__anext__(),
+        harvester.harvest(inputs).__anext__(),
+    )
+    assert first.data is not None and second.data is not None
+    assert stats["requests"] == 4
+
+
+async def test_rate_limit():
+    client, stats = mock_client(delay=0)
+    harvester = KeyframeHarvester(
+        {"a": client, "b": client}, rate=100, burst=2
+    )
+    inputs = [(core, f"proc-{n}", "in") for core in "ab" for n in range(10)]
+    start = time.monotonic()
+    keyframes = [k async for k in harvester.harvest(inputs)]
+    # 2 at once, then 100/s, per Core
+    assert 0.07 < time.monotonic() - start < 0.5
+    assert {k.core for k in keyframes} == {"a", "b"}
@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core_client import AsyncClient
+from core_client.playout import PlayoutMonitor
+
+from .fixtures import process
+
+
+def processes(count: int):
+    data = [process(i) for i in range(count)]
+    for p in data:
+        p["config"]["input"][0]["address"] = "playout:rtmp://localhost/live"
+    # no playout input
+    data.append(process(count))
+    return data
+
+
+def mock_client(data: list):
+    calls = {"status": {}, "reopen": []}
+
+    def handler(request):
+        path = request.url.path
+        if path == "/api/v3/process":
+            return httpx.Response(200, json=data)
+        id = path.split("/")[4]
+        if path.endswith("/status"):
+            n = calls["status"][id] = calls["status"].get(id, 0) + 1
+            # the first process is stuck
+            frames = 100 if id == data[0]["id"] else 100 + n
+            return httpx.Response(200, json={"stream": 1, "frames": frames})
+        if path.endswith("/reopen"):
+            calls["reopen"].append(id)
+            return httpx.Response(200, json="OK")
+        return httpx.Response(
+            404, json={"code": 404, "message": "Not Found", "details": []}
+        )
+
+    client = AsyncClient(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, calls
+
+
+async def test_monitor_reopens_stale_inputs():
+    data = processes(3)
+    client, calls = mock_client(data)
+    monitor = PlayoutMonitor(
+        client,
+        interval=0.01,
+        stale_after=0.1,
+        action="reopen",
+        action_rate=100,
+        progress=lambda status: status["frames"],
+    )
+    await monitor.start()
+    assert sorted(monitor.inputs) == sorted(
+        (p["id"], "input_0") for p in data[:3]
+    )
+    await asyncio.sleep(0.35)
+    await monitor.stop()
+    stuck = data[0]["id"]
+    assert calls["reopen"] and set(calls["reopen"]) == {stuck}
+    # one action per stale period
+    assert len(calls["reopen"]) <= 3
+    assert all(n > 5 for n in calls["status"].values())
+    assert monitor.actions == len(calls["reopen"])
+    assert monitor.inputs == {}
+
+
+async def test_discover_and_stale_without_action():
+    data = processes(2)
+    client, _ = mock_client(data)
+    monitor = PlayoutMonitor(client, interval=0.01, stale_after=0.05)
+    monitor.scheduler.start()
+    await monitor.discover()
+    await asyncio.sleep(0.15)
+    assert [input.id for input in monitor.stale()] == [data[0]["id"]]
+    live = monitor.inputs[(data[1]["id"], "input_0")]
+    assert live.status["frames"] > 101 and live.error is None
+    del data[0]
+    await monitor.discover()
+    assert list(monitor.inputs) == [(data[0]["id"], "input_0")]
+    assert monitor.actions == 0
+    await monitor.stop()
+    await monitor.scheduler.stop()
+
+
+def test_unknown_action():
+    with pytest.raises(ValueError):
+        PlayoutMonitor(None, action="restart")
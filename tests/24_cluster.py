@@ -0,0 +1,119 @@
+import base64
+import json
+import threading
+import time
+
+import httpx
+
+from core_client import AsyncClient, Client
+from core_client.cluster import AsyncClusterClient, ClusterClient
+
+from .fixtures import process
+
+TOKEN = "e30=.{}.sig".format(
+    base64.b64encode(json.dumps({"exp": 2**31}).encode()).decode()
+)
+NOT_FOUND = {"code": 404, "message": "Not Found", "details": []}
+
+
+def mock_cluster(owners: dict):
+    """Nodes "a" and "b" own the process ids of `owners`."""
+    nodes = [
+        {"id": id, "address": f"http://{id}", "state": "connected"}
+        for id in ("a", "b")
+    ]
+    calls = []
+    threads = []
+
+    def handler(request):
+        host, path = request.url.host, request.url.path
+        if path == "/api":
+            threads.append(threading.current_thread())
+            about = {"auths": ["localjwt"], "version": {"number": "16.11.0"}}
+            return httpx.Response(200, json=about)
+        calls.append((host, request.method, path))
+        if path == "/api/v3/cluster":
+            now = int(time.time())
+            return httpx.Response(
+                200, json=[dict(node, last_update=now) for node in nodes]
+            )
+        if path == "/api/v3/process":
+            ids = [id for id, owner in owners.items() if owner == host]
+            return httpx.Response(
+                200, json=[process(0) | {"id": id} for id in ids]
+            )
+        id = path.split("/")[4]
+        if owners.get(id) != host:
+            return httpx.Response(404, json=NOT_FOUND)
+        if request.method == "DELETE":
+            return httpx.Response(200, json="OK")
+        return httpx.Response(200, json=process(0) | {"id": id})
+
+    def transport_factory(retries, asynchronous=False):
+        return httpx.MockTransport(handler)
+
+    return nodes, calls, threads, transport_factory
+
+
+def test_routing_and_not_found():
+    owners = {"p1": "a", "p2": "b"}
+    nodes, calls, _, transport_factory = mock_cluster(owners)
+    client = ClusterClient(
+        Client(
+            base_url="http://seed",
+            access_token=TOKEN,
+            transport_factory=transport_factory,
+        )
+    )
+    assert sorted(client.refresh()) == ["a", "b"]
+    assert client.node_clients["b"].access_token == TOKEN
+
+    assert client.v3_process_get(id="p2").id == "p2"
+    assert client.processes == {"p2": "b"}
+    calls.clear()
+    client.v3_process_get(id="p2")
+    assert calls == [("b", "GET", "/api/v3/process/p2")]
+
+    # moved: the 404 of the cached node drops the entry
+    owners["p2"] = "a"
+    calls.clear()
+    assert client.v3_process_get(id="p2").id == "p2"
+    assert client.processes["p2"] == "a"
+    assert calls[0] == ("b", "GET", "/api/v3/process/p2")
+    assert calls[-1] == ("a", "GET", "/api/v3/process/p2")
+
+    assert sorted(p.id for p in client.v3_process_get_list()) == ["p1", "p2"]
+    assert client.processes == {"p1": "a", "p2": "a"}
+
+    # a gone node drops its client and process entries
+    del nodes[0]
+    old = client.node_clients["b"]
+    client.refresh()
+    assert list(client.node_clients) == ["b"]
+    assert client.node_clients["b"] is old and client.processes == {}
+    client.close()
+
+
+async def test_async_refresh_and_routing():
+    owners = {"p1": "a", "p2": "b"}
+    _, calls, threads, transport_factory = mock_cluster(owners)
+    client = AsyncClusterClient(
+        AsyncClient(
+            base_url="http://seed",
+            access_token=TOKEN,
+            transport_factory=transport_factory,
+        )
+    )
+    assert sorted(await client.refresh()) == ["a", "b"]
+    # the sync logins ran in the executor
+    assert len(threads) == 2
+    assert threading.current_thread() not in threads
+
+    assert (await client.v3_process_get(id="p1")).id == "p1"
+    owners["p1"] = "b"
+    calls.clear()
+    assert (await client.v3_process_delete(id="p1")) == "OK"
+    assert client.processes["p1"] == "b"
+    assert calls[0] == ("a", "DELETE", "/api/v3/process/p1")
+    assert calls[-1] == ("b", "DELETE", "/api/v3/process/p1")
+    await client.aclose()
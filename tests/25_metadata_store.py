@@ -0,0 +1,112 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from core_client import AsyncClient, Client
+from core_client.metadata_store import AsyncMetadataStore, MetadataStore
+
+
+def mock_core():
+    """Metadata of the mock Core with the requests it received."""
+    data = {"/api/v3/metadata/key": "a", "/api/v3/process/p/metadata/key": 1}
+    requests = []
+
+    def handler(request):
+        path = request.url.path
+        requests.append((request.method, path))
+        if request.method == "PUT":
+            data[path] = json.loads(request.content)
+            return httpx.Response(200, json=data[path])
+        etag = f'"{hash(json.dumps(data[path]))}"'
+        if request.headers.get("if-none-match") == etag:
+            requests.append(304)
+            return httpx.Response(304, headers={"etag": etag})
+        return httpx.Response(200, json=data[path], headers={"etag": etag})
+
+    def transport_factory(retries, asynchronous=False):
+        return httpx.MockTransport(handler)
+
+    return data, requests, transport_factory
+
+
+def test_revalidate_with_etag():
+    data, requests, transport_factory = mock_core()
+    client = Client(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=transport_factory,
+    )
+    store = MetadataStore(client, ttl=0)
+    first = store.get("key")
+    assert store.get("key") == first
+    assert store.get("key", id="p") is not None
+    assert requests == [
+        ("GET", "/api/v3/metadata/key"),
+        ("GET", "/api/v3/metadata/key"),
+        304,
+        ("GET", "/api/v3/process/p/metadata/key"),
+    ]
+
+    # cached until the next write without ttl
+    store.ttl = None
+    requests.clear()
+    store.get("key")
+    assert requests == []
+    data["/api/v3/metadata/key"] = "b"
+    assert store.get("key", refresh=True) != first
+
+
+def test_coalesce_and_timer_flush():
+    data, requests, transport_factory = mock_core()
+    client = Client(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=transport_factory,
+    )
+    store = MetadataStore(client, window=0.05)
+    for n in range(10):
+        store.set("key", n)
+        store.set("key", {"n": n}, id="p")
+    # pending writes are read back without requests
+    assert store.get("key") == 9 and requests == []
+    time.sleep(0.3)
+    assert sorted(requests) == [
+        ("PUT", "/api/v3/metadata/key"),
+        ("PUT", "/api/v3/process/p/metadata/key"),
+    ]
+    assert data["/api/v3/metadata/key"] == 9
+    assert data["/api/v3/process/p/metadata/key"] == {"n": 9}
+    assert store.flush() == 0
+
+    store.window = 60
+    store.set("key", "last")
+    store.close()
+    assert data["/api/v3/metadata/key"] == "last"
+    assert store.errors == []
+
+
+async def test_async_coalesce_and_flush():
+    data, requests, transport_factory = mock_core()
+    client = AsyncClient(
+        base_url="http://core",
+        access_token="token",
+        transport_factory=transport_factory,
+    )
+    store = AsyncMetadataStore(client, window=0.05)
+    for n in range(10):
+        store.set("key", n)
+    await asyncio.sleep(0.2)
+    assert requests == [("PUT", "/api/v3/metadata/key")]
+    assert data["/api/v3/metadata/key"] == 9
+
+    store.window = 60
+    store.set("key", "last", id="p")
+    await store.aclose()
+    assert data["/api/v3/process/p/metadata/key"] == "last"
+
+    store.ttl = 0
+    requests.clear()
+    await store.get("key")
+    assert requests == [("GET", "/api/v3/metadata/key")]
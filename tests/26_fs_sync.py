@@ -0,0 +1,178 @@
+import json
+import os
+
+import pytest
+
+from core_client import AsyncClient, Client
+from core_client.fs_sync import MANIFEST, afs_sync, fs_sync
+
+from .stub import StubCore
+
+PREFIX = "/api/v3/fs/disk"
+
+
+class FsRoutes(dict):
+    """StubCore routes of a "disk" filesystem held in `files`."""
+
+    def __init__(self, files: dict = None):
+        super().__init__()
+        self.files = dict(files or {})
+        self.modified = 1000
+        # paths whose GET drops the connection
+        self.broken = set()
+
+    def get(self, key, default=None):
+        method, path = key
+        if path == PREFIX:
+            return lambda handler: (200, self._list())
+        if not path.startswith(f"{PREFIX}/"):
+            return default
+        path = path.removeprefix(PREFIX)
+        if method == "PUT":
+            return lambda handler: self._put(path, handler.body)
+        if path not in self.files:
+            return (404, {"code": 404, "message": "", "details": []})
+        if method == "DELETE":
+            del self.files[path]
+            return (200, "OK")
+        if path in self.broken:
+            return self._drop
+        return (200, self.files[path][0])
+
+    def _list(self):
+        return [
+            {"name": path, "size_bytes": len(data), "last_modified": modified}
+            for path, (data, modified) in self.files.items()
+        ]
+
+    def _put(self, path: str, data: bytes):
+        self.modified += 1
+        self.files[path] = (data, self.modified)
+        return 201, path
+
+    def _drop(self, handler):
+        handler.close_connection = True
+        handler.wfile.write(b"HTTP/1.1 200 OK\r\ncontent-length: 10\r\n\r\n")
+
+
+def write(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def sync_paths(core):
+    return sorted(
+        (method, path.removeprefix(PREFIX))
+        for method, path in core.requests
+        if path.startswith(f"{PREFIX}/")
+    )
+
+
+def test_push_skips_unchanged_and_deletes(tmp_path):
+    write(tmp_path / "a.ts", b"a" * 100)
+    write(tmp_path / "sub" / "b.ts", b"b")
+    routes = FsRoutes({"/old.ts": (b"old", 1)})
+    with StubCore(routes) as core:
+        client = Client(base_url=core.url, access_token="token")
+        result = fs_sync(client, str(tmp_path), "disk", delete=True)
+        assert sorted(result.transferred) == ["/a.ts", "/sub/b.ts"]
+        assert result.deleted == ["/old.ts"] and result.errors == []
+        assert routes.files["/a.ts"][0] == b"a" * 100
+        assert sync_paths(core) == [
+            ("DELETE", "/old.ts"),
+            ("PUT", "/a.ts"),
+            ("PUT", "/sub/b.ts"),
+        ]
+        with open(tmp_path / MANIFEST) as f:
+            assert sorted(json.load(f)["disk"]) == ["/a.ts", "/sub/b.ts"]
+
+        core.requests.clear()
+        write(tmp_path / "sub" / "b.ts", b"bb")
+        result = fs_sync(client, str(tmp_path), "disk")
+        assert result.transferred == ["/sub/b.ts"] and result.unchanged == 1
+        assert sync_paths(core) == [("PUT", "/sub/b.ts")]
+
+
+def test_pull_and_errors(tmp_path):
+    routes = FsRoutes(
+        {
+            "/a.ts": (b"a", 1500),
+            "/sub/b.ts": (b"b", 1600),
+            "/../evil": (b"evil", 1),
+        }
+    )
+    write(tmp_path / "gone.ts", b"gone")
+    with StubCore(routes) as core:
+        client = Client(base_url=core.url, access_token="token")
+        result = fs_sync(
+            client, str(tmp_path), "disk", direction="pull", delete=True
+        )
+        assert sorted(result.transferred) == ["/a.ts", "/sub/b.ts"]
+        assert result.deleted == ["/gone.ts"]
+        # traversal names are not written
+        assert [path for path, _ in result.errors] == ["/../evil"]
+        assert not os.path.exists(tmp_path.parent / "evil")
+        assert (tmp_path / "sub" / "b.ts").read_bytes() == b"b"
+        assert os.stat(tmp_path / "a.ts").st_mtime == 1500
+        assert not os.path.exists(tmp_path / "gone.ts")
+
+        core.requests.clear()
+        del routes.files["/../evil"]
+        result = fs_sync(client, str(tmp_path), "disk", direction="pull")
+        assert result.transferred == [] and result.unchanged == 2
+        assert sync_paths(core) == []
+
+        # a missing file is an error of its path
+        routes.files["/c.ts"] = (b"c", 1700)
+        routes.files["/d.ts"] = (b"d", 1800)
+        routes.get = _missing(routes, "/d.ts")
+        result = fs_sync(client, str(tmp_path), "disk", direction="pull")
+        assert result.transferred == ["/c.ts"]
+        assert [path for path, _ in result.errors] == ["/d.ts"]
+
+
+def _missing(routes, missing: str):
+    get = routes.get
+
+    def missing_get(key, default=None):
+        if key == ("GET", f"{PREFIX}{missing}"):
+            return (404, {"code": 404, "message": "", "details": []})
+        return get(key, default)
+
+    return missing_get
+
+
+def test_transport_error_keeps_progress(tmp_path):
+    routes = FsRoutes({f"/{n}.ts": (b"x", 1000 + n) for n in range(4)})
+    routes.broken.add("/3.ts")
+    with StubCore(routes) as core:
+        client = Client(base_url=core.url, access_token="token")
+        with pytest.raises(Exception):
+            fs_sync(client, str(tmp_path), "disk", direction="pull")
+        with open(tmp_path / MANIFEST) as f:
+            assert sorted(json.load(f)["disk"]) == ["/0.ts", "/1.ts", "/2.ts"]
+
+        core.requests.clear()
+        routes.broken.clear()
+        result = fs_sync(client, str(tmp_path), "disk", direction="pull")
+        assert result.transferred == ["/3.ts"] and result.unchanged == 3
+
+
+async def test_async_push_and_pull(tmp_path):
+    write(tmp_path / "push" / "a.ts", b"a" * 100)
+    routes = FsRoutes({"/b.ts": (b"b", 1500)})
+    with StubCore(routes) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        result = await afs_sync(client, str(tmp_path / "push"), "disk")
+        assert result.transferred == ["/a.ts"]
+        assert routes.files["/a.ts"][0] == b"a" * 100
+
+        routes.broken.add("/b.ts")
+        with pytest.raises(Exception):
+            await afs_sync(
+                client, str(tmp_path / "pull"), "disk", direction="pull"
+            )
+        with open(tmp_path / "pull" / MANIFEST) as f:
+            assert list(json.load(f)["disk"]) == ["/a.ts"]
+        await client.aclose()
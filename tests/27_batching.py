@@ -0,0 +1,74 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+from core_client import AsyncClient
+from core_client.base.models import Error
+from core_client.batching import ProcessBatcher, id_chunks
+
+from .fixtures import process
+from .stub import StubCore
+
+processes = {p["id"]: p for p in (process(i) for i in range(60))}
+
+
+def process_list(handler):
+    query = parse_qs(urlsplit(handler.path).query)
+    ids = query["id"][0].split(",")
+    return 200, [processes[id] for id in ids if id in processes]
+
+
+def batch_ids(core):
+    return [
+        parse_qs(urlsplit(path).query)["id"][0].split(",")
+        for _, path in core.requests
+    ]
+
+
+async def test_batch_fan_out_and_missing():
+    ids = list(processes)[:10]
+    with StubCore({("GET", "/api/v3/process"): process_list}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        batcher = ProcessBatcher(client)
+        results = await asyncio.gather(
+            *(batcher.v3_process_get(id=id) for id in ids),
+            # waiters of the same id share the result
+            batcher.v3_process_get(id=ids[0]),
+            batcher.v3_process_get(id="missing"),
+        )
+        assert [p.id for p in results[:10]] == ids
+        assert results[10] is results[0]
+        assert isinstance(results[11], Error) and results[11].code == 404
+        assert batcher.calls == 12 and batcher.requests == 1
+        assert sorted(batch_ids(core)[0]) == sorted([*ids, "missing"])
+        await client.aclose()
+
+
+async def test_batch_per_filter_and_url_chunks():
+    ids = list(processes)
+    with StubCore({("GET", "/api/v3/process"): process_list}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        batcher = ProcessBatcher(client, window=0.01, max_url_length=500)
+        results = await asyncio.gather(
+            *(batcher.v3_process_get(id=id) for id in ids),
+            batcher.v3_process_get(id=ids[0], filter="state"),
+        )
+        assert [p.id for p in results[:-1]] == ids
+        assert results[-1].id == ids[0]
+        assert all(len(path) <= 500 for _, path in core.requests)
+        chunks = list(id_chunks(client.base_url, ids, "", 500))
+        assert len(chunks) > 1 and batcher.requests == len(chunks) + 1
+        assert sorted(sum(batch_ids(core), [])) == sorted([*ids, ids[0]])
+        await client.aclose()
+
+
+async def test_batch_error_for_all_waiters():
+    error = {"code": 500, "message": "Internal Server Error", "details": []}
+    with StubCore({("GET", "/api/v3/process"): (500, error)}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        batcher = ProcessBatcher(client)
+        results = await asyncio.gather(
+            batcher.v3_process_get(id="a"), batcher.v3_process_get(id="b")
+        )
+        assert all(isinstance(r, Error) and r.code == 500 for r in results)
+        assert len(core.requests) == 1
+        await client.aclose()
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from core_client import AsyncClient, Client
+
+from .fixtures import process
+from .stub import StubCore
+
+PROCESSES = "/api/v3/process"
+
+
+def test_non_get_endpoints_are_rejected():
+    with pytest.raises(ValueError):
+        Client(base_url="http://core", coalesce=("v3_process_post",))
+    with pytest.raises(ValueError):
+        AsyncClient(base_url="http://core", coalesce=("unknown",))
+
+
+def test_sync_calls_share_one_request():
+    def slow(handler):
+        time.sleep(0.2)
+        return 200, []
+
+    with StubCore({("GET", PROCESSES): slow}) as core:
+        client = Client(
+            base_url=core.url,
+            access_token="token",
+            coalesce=("v3_process_get_list",),
+        )
+        with ThreadPoolExecutor(4) as executor:
+            results = list(
+                executor.map(lambda _: client.v3_process_get_list(), range(4))
+            )
+        assert len(core.requests) == 1
+        assert all(result is results[0] for result in results)
+        assert client.coalesce_stats == {
+            "v3_process_get_list": {"hits": 3, "misses": 1}
+        }
+        # done flights are not reused
+        client.v3_process_get_list()
+        assert len(core.requests) == 2
+
+
+def test_sync_error_reaches_all_callers():
+    calls = []
+    started = threading.Event()
+
+    def handler(request):
+        calls.append(request)
+        started.set()
+        time.sleep(0.1)
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    client = Client(
+        base_url="http://core",
+        access_token="token",
+        coalesce=("v3_process_get_list",),
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+
+    def call():
+        try:
+            client.v3_process_get_list()
+        except httpx.ReadTimeout as e:
+            return e
+
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(call)
+        started.wait()
+        second = executor.submit(call)
+        errors = [first.result(), second.result()]
+    assert len(calls) == 1 and errors[0] is errors[1] is not None
+
+
+def async_client(delay: float, fail: bool = False):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(delay)
+        if fail:
+            raise httpx.ReadTimeout("timeout", request=request)
+        if request.url.path == PROCESSES:
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, json=process(0))
+
+    client = AsyncClient(
+        base_url="http://core",
+        access_token="token",
+        coalesce=("v3_process_get_list", "v3_process_get"),
+        transport_factory=lambda retries, asynchronous: httpx.MockTransport(
+            handler
+        ),
+    )
+    return client, calls
+
+
+async def test_async_calls_share_one_request():
+    client, calls = async_client(delay=0.05)
+    results = await asyncio.gather(
+        *(client.v3_process_get_list() for _ in range(5))
+    )
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert client.coalesce_stats["v3_process_get_list"] == {
+        "hits": 4,
+        "misses": 1,
+    }
+    # other arguments are other flights
+    await asyncio.gather(
+        client.v3_process_get(id="a"), client.v3_process_get(id="b")
+    )
+    assert len(calls) == 3
+
+
+async def test_async_cancel_and_error():
+    client, calls = async_client(delay=0.05)
+    first = asyncio.ensure_future(client.v3_process_get_list())
+    second = asyncio.ensure_future(client.v3_process_get_list())
+    await asyncio.sleep(0.01)
+    # a cancelled caller does not cancel the shared request
+    first.cancel()
+    assert (await second) is not None
+    assert first.cancelled() and len(calls) == 1
+
+    client, calls = async_client(delay=0.05, fail=True)
+    results = await asyncio.gather(
+        client.v3_process_get_list(),
+        client.v3_process_get_list(),
+        return_exceptions=True,
+    )
+    assert len(calls) == 1
+    assert all(isinstance(r, httpx.ReadTimeout) for r in results)
+    assert client._flights == {}
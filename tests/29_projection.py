@@ -0,0 +1,48 @@
+from core_client import AsyncClient, Client
+from core_client.base.models import Error
+from core_client.projection import aget_process_list, get_process_list
+
+from .fixtures import process
+from .stub import StubCore
+
+processes = [process(i) for i in range(5)]
+
+
+def test_get_process_list():
+    fields = ["id", "config.output.address", "state.progress.outputs.fps"]
+    with StubCore({("GET", "/api/v3/process"): (200, processes)}) as core:
+        client = Client(base_url=core.url, access_token="token")
+        res = get_process_list(client, fields, reference="00000001")
+        path = core.requests[0][1]
+        assert "filter=config,state" in path
+        assert "reference=00000001" in path
+        assert [p.id for p in res] == [p["id"] for p in processes]
+        assert type(res[0]).__name__ == "ProcessProjection"
+        assert set(type(res[0]).model_fields) == {"id", "config", "state"}
+        assert res[0].config.output[1].address == "rtmp://127.0.0.1/live/abc"
+        assert set(type(res[0].config).model_fields) == {"output"}
+        assert res[0].state.progress.outputs[0].fps == 24.9
+        assert not hasattr(res[0], "report")
+
+        # an explicit filter is kept
+        get_process_list(client, ["id"], filter="state")
+        assert "filter=state" in core.requests[1][1]
+
+
+async def test_aget_process_list():
+    with StubCore({("GET", "/api/v3/process"): (200, processes)}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        res = await aget_process_list(client, ["id", "reference"])
+        assert "filter=metadata" in core.requests[0][1]
+        assert [p.reference for p in res] == [
+            p["reference"] for p in processes
+        ]
+        assert set(type(res[0]).model_fields) == {"id", "reference"}
+        await client.aclose()
+
+    error = {"code": 401, "message": "Unauthorized", "details": []}
+    with StubCore({("GET", "/api/v3/process"): (401, error)}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        res = await aget_process_list(client, ["id"])
+        assert isinstance(res, Error) and res.code == 401
+        await client.aclose()
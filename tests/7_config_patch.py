@@ -0,0 +1,74 @@
+from core_client import AsyncClient, Client
+from core_client.config_patch import config_diff, config_merge_patch
+
+base = {
+    "name": "core",
+    "log": {"level": "info", "topics": ["a", "b"]},
+    "api": {"auth": {"enable": True, "username": "admin"}},
+}
+
+
+def test_config_diff_equal():
+    assert config_diff(base, base) == {}
+
+
+def test_config_diff_nested():
+    new = config_merge_patch(base, {"log": {"level": "debug"}})
+    assert config_diff(base, new) == {"log": {"level": "debug"}}
+    assert base["log"]["level"] == "info"
+
+
+def test_config_diff_remove_and_list():
+    new = config_merge_patch(base, {"name": None, "log": {"topics": ["a"]}})
+    assert "name" not in new
+    assert config_diff(base, new) == {
+        "name": None,
+        "log": {"topics": ["a"]},
+    }
+
+
+def test_v3_config_patch_skips_unchanged():
+    calls = []
+    client = Client(base_url="http://127.0.0.1:8080")
+    client._config_cache = config_merge_patch(base, {})
+    client.v3_config_put = lambda **kwargs: calls.append("put") or {}
+    client.v3_config_reload = lambda **kwargs: calls.append("reload")
+
+    assert client.v3_config_patch({"name": "core"}) == {}
+    assert calls == []
+
+    res = client.v3_config_patch({"api": {"auth": {"enable": False}}})
+    assert res == {"api": {"auth": {"enable": False}}}
+    assert calls == ["put", "reload"]
+    assert client._config_cache["api"]["auth"]["enable"] is False
+
+
+def test_v3_config_patch_none_is_unchanged():
+    calls = []
+    client = Client(base_url="http://127.0.0.1:8080")
+    client._config_cache = config_merge_patch(base, {"host": None})
+    client.v3_config_put = lambda **kwargs: calls.append("put") or {}
+    client.v3_config_reload = lambda **kwargs: calls.append("reload")
+
+    assert client.v3_config_patch({"host": None, "other": None}) == {}
+    assert calls == []
+
+
+async def test_async_v3_config_patch():
+    calls = []
+
+    async def put(**kwargs):
+        calls.append("put")
+        return {}
+
+    async def reload(**kwargs):
+        calls.append("reload")
+
+    client = AsyncClient(base_url="http://127.0.0.1:8080")
+    client._config_cache = config_merge_patch(base, {})
+    client.v3_config_put = put
+    client.v3_config_reload = reload
+
+    assert await client.v3_config_patch({"name": None}) == {"name": None}
+    assert calls == ["put", "reload"]
+    assert "name" not in client._config_cache
@@ -0,0 +1,134 @@
+import json
+import time
+
+import pytest
+from httpx import HTTPError
+
+from core_client import AsyncClient, Client
+from core_client.base.models.v3 import Process
+from core_client.projection import process_list_filter
+from core_client.streaming import (
+    FilesystemFileEntry,
+    JsonArrayDecoder,
+    aiter_fs_file_list,
+    aiter_process_list,
+    iter_fs_file_list,
+    iter_process_list,
+)
+
+from .fixtures import process
+from .stub import StubCore
+
+processes = [process(i) for i in range(50)]
+
+
+def test_json_array_decoder_chunks():
+    data = [{"a": 'ä"]', "b": [1, {"c": None}]}, 1, 22.5, "x", None]
+    raw = json.dumps(data).encode()
+    for size in (1, 2, 7, 64):
+        decoder = JsonArrayDecoder()
+        items = []
+        for i in range(0, len(raw), size):
+            items += decoder.feed(raw[i:][:size])
+        items += decoder.feed(b"", final=True)
+        assert items == data
+
+
+def test_json_array_decoder_incomplete():
+    decoder = JsonArrayDecoder()
+    assert decoder.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    with pytest.raises(ValueError):
+        decoder.feed(b"", final=True)
+
+
+def test_json_array_decoder_boundaries():
+    decoder = JsonArrayDecoder()
+    # a number split between chunks is not decoded early
+    assert decoder.feed(b"[12") == []
+    assert decoder.feed(b"3, tr") == [123]
+    assert decoder.feed(b'ue, "a\\') == [True]
+    assert decoder.feed(b'"b"]') == ['a"b']
+    assert decoder.feed(b"", final=True) == []
+    with pytest.raises(ValueError):
+        JsonArrayDecoder().feed(b"[12x, 1]")
+
+
+def test_json_array_decoder_decodes_once():
+    class Counting(json.JSONDecoder):
+        calls = 0
+
+        def raw_decode(self, s, idx=0):
+            Counting.calls += 1
+            return super().raw_decode(s, idx)
+
+    raw = json.dumps([{"data": "x" * 1000, "list": list(range(200))}])
+    decoder = JsonArrayDecoder()
+    decoder._decoder = Counting()
+    items = []
+    for i in range(0, len(raw), 16):
+        items += decoder.feed(raw[i:][:16].encode())
+    assert len(items) == 1 and Counting.calls == 1
+
+
+files = [
+    {"name": f"/file-{i}.ts", "size_bytes": i * 100, "last_modified": t}
+    for i, t in enumerate([0, 0, time.time() - 60, time.time()])
+]
+
+
+def test_iter_fs_file_list():
+    with StubCore({("GET", "/api/v3/fs/disk"): (200, files)}) as core:
+        client = Client(base_url=core.url, access_token="token")
+        res = list(iter_fs_file_list(client, "disk", glob="/file-*"))
+        assert res == [FilesystemFileEntry(**file) for file in files]
+        assert "glob=%2Ffile-%2A" in core.requests[0][1]
+        res = iter_fs_file_list(client, "disk", min_size=100, newer_than=30)
+        assert [file.name for file in res] == ["/file-3.ts"]
+        res = iter_fs_file_list(client, "disk", max_size=100, older_than=30)
+        assert [file.name for file in res] == ["/file-0.ts", "/file-1.ts"]
+        with pytest.raises(HTTPError):
+            list(iter_fs_file_list(client, "mem"))
+
+
+async def test_aiter_fs_file_list():
+    with StubCore({("GET", "/api/v3/fs/disk"): (200, files)}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        res = [f async for f in aiter_fs_file_list(client, "disk")]
+        assert [file.name for file in res] == [f["name"] for f in files]
+        res = aiter_fs_file_list(client, "disk", min_size=100, max_size=200)
+        assert [file.size_bytes async for file in res] == [100, 200]
+        with pytest.raises(HTTPError):
+            [f async for f in aiter_fs_file_list(client, "mem")]
+        await client.aclose()
+
+
+def test_iter_process_list():
+    with StubCore({("GET", "/api/v3/process"): (200, processes)}) as core:
+        client = Client(base_url=core.url, access_token="token")
+        res = list(iter_process_list(client, filter="state"))
+        assert len(res) == 50
+        assert type(res[0]) is Process
+        assert res[49].id == processes[49]["id"]
+        assert core.requests[0][1].startswith("/api/v3/process?filter=state")
+
+
+async def test_aiter_process_list():
+    with StubCore({("GET", "/api/v3/process"): (200, processes)}) as core:
+        client = AsyncClient(base_url=core.url, access_token="token")
+        res = [p async for p in aiter_process_list(client)]
+        assert [p.id for p in res] == [p["id"] for p in processes]
+        await client.aclose()
+
+
+def test_iter_process_list_projection():
+    fields = ["id", "state.exec", "state.progress.outputs.fps"]
+    assert process_list_filter(fields) == "state"
+    assert process_list_filter(["id"]) == "metadata"
+    with StubCore({("GET", "/api/v3/process"): (200, processes)}) as core:
+        client = Client(base_url=core.url, access_token="token")
+        res = list(iter_process_list(client, fields=fields))
+        assert res[0].id == processes[0]["id"]
+        assert res[0].state.exec == "running"
+        assert res[0].state.progress.outputs[1].fps == 24.9
+        assert not hasattr(res[0], "config")
+        assert "filter=state" in core.requests[0][1]
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from core_client import Client
+from core_client.base.models.v3 import Process, ProcessList
+from core_client.decoding import Decoder, adapter
+
+from .fixtures import process
+from .stub import StubCore
+
+
+def test_decoder_validates_json_bytes():
+    data = [process(i) for i in range(3)]
+    decoded = Decoder()(ProcessList, json.dumps(data).encode())
+    assert adapter(ProcessList) is adapter(ProcessList)
+    assert decoded.model_dump() == (
+        adapter(ProcessList).validate_python(data).model_dump()
+    )
+    # empty avstream objects are removed by the model validator
+    assert decoded[0].state.progress.outputs[0].avstream is None
+
+
+def test_schema_drift_raises():
+    data = process(0)
+    del data["state"]["exec"]
+    with StubCore(
+        {("GET", f"/api/v3/process/{data['id']}"): (200, data)}
+    ) as core:
+        client = Client(base_url=core.url, access_token="token")
+        with pytest.raises(ValidationError):
+            client.v3_process_get(id=data["id"])
+        client.close()
+    assert type(Decoder()(Process, json.dumps(process(1)))) is Process
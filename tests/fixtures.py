@@ -0,0 +1,279 @@
+def progress_io(id: str, index: int, type: str = "video", avstream=None):
+    io = {
+        "address": "http://127.0.0.1:8080/memfs/abc.m3u8",
+        "avstream": avstream,
+        "bitrate_kbit": 1994.933,
+        "codec": "h264" if type == "video" else "aac",
+        "coder": "libx264" if type == "video" else "aac",
+        "format": "hls",
+        "fps": 24.9,
+        "frame": 2195923,
+        "id": id,
+        "index": index,
+        "packet": 2195923,
+        "pps": 24.9,
+        "q": 0,
+        "size_kb": 21973597,
+        "stream": 0,
+        "type": type,
+    }
+    if type == "video":
+        io.update({"height": 720, "pix_fmt": "yuv420p", "width": 1280})
+    else:
+        io.update({"channels": 2, "layout": "stereo", "sampling_hz": 44100})
+    return io
+
+
+def avstream():
+    avstream_io = {"packet": 10, "size_kb": 100, "state": "running", "time": 5}
+    return {
+        "input": avstream_io,
+        "output": avstream_io,
+        "aqueue": 0,
+        "queue": 124,
+        "dup": 46212,
+        "drop": 0,
+        "enc": 154,
+        "looping": False,
+        "duplicating": False,
+        "gop": "none",
+    }
+
+
+def process(i: int, outputs: int = 2):
+    """Process as returned by `v3_process_get_list(filter="")`."""
+    id = f"restreamer-ui:ingest:{i:08d}-5491-455f-b7ee-6b47d8842f74"
+    config_io = {
+        "address": "rtmp://127.0.0.1/live/abc",
+        "cleanup": [],
+        "id": "input_0",
+        "options": ["-fflags", "+genpts", "-thread_queue_size", "512"],
+    }
+    return {
+        "config": {
+            "autostart": True,
+            "id": id,
+            "input": [config_io],
+            "limits": {
+                "cpu_usage": 0,
+                "memory_mbytes": 0,
+                "waitfor_seconds": 0,
+            },
+            "options": ["-err_detect", "ignore_err"],
+            "output": [
+                {**config_io, "id": f"output_{n}"} for n in range(outputs)
+            ],
+            "reconnect": True,
+            "reconnect_delay_seconds": 15,
+            "reference": f"{i:08d}",
+            "stale_timeout_seconds": 30,
+            "type": "ffmpeg",
+        },
+        "created_at": 1659013800,
+        "id": id,
+        "metadata": None,
+        "reference": f"{i:08d}",
+        "state": {
+            "command": ["-err_detect", "ignore_err", "-i", "-"],
+            "cpu_usage": 3.5,
+            "exec": "running",
+            "last_logline": "frame=2195923 fps=25 q=-1.0 size=N/A",
+            "memory_bytes": 123456789,
+            "order": "start",
+            "progress": {
+                "bitrate_kbit": 1970.133,
+                "drop": 0,
+                "dup": 0,
+                "fps": 24.533,
+                "frame": 2252071,
+                "inputs": [
+                    progress_io("input_0", 0, avstream=avstream()),
+                    progress_io("input_0", 1, type="audio"),
+                ],
+                "outputs": [
+                    progress_io(f"output_{n}", n, avstream={})
+                    for n in range(outputs)
+                ],
+                "packet": 2252071,
+                "q": -1,
+                "size_kb": 22584958,
+                "speed": 1,
+                "time": 90082,
+            },
+            "reconnect_seconds": 11,
+            "runtime_seconds": 48,
+        },
+        "report": {
+            "created_at": 1659013803,
+            "log": [["1659013803", "ffmpeg version 4.4.1-datarhei"]],
+            "prelude": ["ffmpeg version 4.4.1-datarhei"],
+            "history": [],
+        },
+        "type": "ffmpeg",
+    }
+
+
+def srt_stats(version: tuple):
+    """`SrtConnectionStats`, v16.11.0 renamed the "__bytes" fields."""
+    stats = {
+        name: 0
+        for name in (
+            "timestamp_ms sent_pkt recv_pkt sent_unique_pkt recv_unique_pkt "
+            "send_loss_pkt recv_loss_pkt sent_retrans_pkt recv_retran_pkts "
+            "sent_ack_pkt recv_ack_pkt sent_nak_pkt recv_nak_pkt send_km_pkt "
+            "recv_km_pkt send_duration_us send_drop_pkt recv_drop_pkt "
+            "recv_undecrypt_pkt sent_bytes recv_bytes recv_unique_bytes "
+            "sent_retrans_bytes send_drop_bytes recv_drop_bytes "
+            "recv_undecrypt_bytes pkt_send_period_us flow_window_pkt "
+            "flight_size_pkt rtt_ms bandwidth_mbit avail_send_buf_bytes "
+            "avail_recv_buf_bytes max_bandwidth_mbit mss_bytes send_buf_pkt "
+            "send_buf_bytes send_buf_ms send_tsbpd_delay_ms recv_buf_pkt "
+            "recv_buf_bytes recv_buf_ms recv_tsbpd_delay_ms "
+            "reorder_tolerance_pkt pkt_recv_avg_belated_time_ms"
+        ).split()
+    }
+    if version < (16, 11, 0):
+        stats.update({"sent_unique__bytes": 10, "recv_loss__bytes": 20})
+    else:
+        stats.update({"sent_unique_bytes": 10, "recv_loss_bytes": 20})
+    return stats
+
+
+def srt(version: tuple):
+    """`Srt` channel, v16.10.0 replaced publisher by name and socketid."""
+    channel = {
+        "connections": {"132881": {"log": {}, "stats": srt_stats(version)}},
+        "log": {},
+    }
+    if version < (16, 10, 0):
+        channel.update(
+            {
+                "publisher": {"1f33d538": 132881},
+                "subscriber": {"5f61d80a": [140529]},
+            }
+        )
+    else:
+        channel.update(
+            {"name": "936718e2", "socketid": "347916646", "subscriber": [1]}
+        )
+    return channel
+
+
+def config():
+    """Core config (v16 defaults) as in `ConfigSaved.config`."""
+    allow_block = {"allow": [], "block": []}
+    return {
+        "created_at": "2023-01-18T10:20:22.012811213Z",
+        "version": 3,
+        "id": "6ddbb5e6-b0ca-4b3a-9a97-66b6e1d5a6b1",
+        "name": "core-1",
+        "address": ":8080",
+        "log": {"level": "info", "topics": [], "max_lines": 1000},
+        "db": {"dir": "./config"},
+        "host": {"name": ["example.com"], "auto": True},
+        "api": {
+            "read_only": False,
+            "access": {"http": allow_block, "https": allow_block},
+            "auth": {
+                "enable": True,
+                "disable_localhost": False,
+                "username": "admin",
+                "password": "datarhei",
+                "jwt": {"secret": "Re0F2bPpOzaBcs2oufZOwNf9ZQBf8Bm4"},
+                "auth0": {
+                    "enable": False,
+                    "tenants": [
+                        {
+                            "audience": "https://core.example.com",
+                            "clientid": "l8KGAWu2Pi3g3A7Ox4hqC3ZPz1QzuJAG",
+                            "domain": "example.eu.auth0.com",
+                            "users": ["auth0|6395f1b9b0d6c63b7d6fbd60"],
+                        }
+                    ],
+                },
+            },
+        },
+        "tls": {
+            "address": ":8181",
+            "enable": False,
+            "auto": False,
+            "cert_file": "",
+            "key_file": "",
+        },
+        "rtmp": {
+            "enable": True,
+            "enable_tls": False,
+            "address": ":1935",
+            "address_tls": ":1936",
+            "app": "/",
+            "token": "",
+        },
+        "srt": {
+            "enable": True,
+            "address": ":6000",
+            "passphrase": "",
+            "token": "",
+            "log": {"enable": False, "topics": []},
+        },
+        "storage": {
+            "disk": {
+                "dir": "./data",
+                "max_size_mbytes": 0,
+                "cache": {
+                    "enable": True,
+                    "max_size_mbytes": 0,
+                    "ttl_seconds": 300,
+                    "max_file_size_mbytes": 1,
+                    "types": {"allow": [".ts"], "block": [".m3u8"]},
+                },
+            },
+            "memory": {
+                "auth": {
+                    "enable": True,
+                    "username": "admin",
+                    "password": "YWV1vMqb2SQr2ySG",
+                },
+                "max_size_mbytes": 0,
+                "purge": False,
+            },
+            "cors": {"origins": ["*"]},
+            "mimetypes_file": "./mime.types",
+        },
+        "ffmpeg": {
+            "binary": "ffmpeg",
+            "max_processes": 0,
+            "access": {"input": allow_block, "output": allow_block},
+            "log": {"max_lines": 50, "max_history": 3},
+        },
+        "playout": {"enable": False, "min_port": 0, "max_port": 0},
+        "debug": {
+            "profiling": False,
+            "force_gc": 0,
+            "memory_limit_mbytes": 0,
+        },
+        "metrics": {
+            "enable": False,
+            "enable_prometheus": False,
+            "range_sec": 300,
+            "interval_sec": 2,
+        },
+        "sessions": {
+            "enable": True,
+            "ip_ignorelist": ["127.0.0.1/32", "::1/128"],
+            "session_timeout_sec": 30,
+            "persist": False,
+            "persist_interval_sec": 300,
+            "max_bitrate_mbit": 0,
+            "max_sessions": 0,
+        },
+        "service": {
+            "enable": False,
+            "token": "",
+            "url": "https://service.datarhei.com",
+        },
+        "router": {
+            "blocked_prefixes": ["/api"],
+            "routes": {},
+            "ui_path": "",
+        },
+    }
@@ -0,0 +1,100 @@
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class ThreadingTCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # concurrent clients, the default backlog (5) drops connects
+    request_queue_size = 128
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ("uds", 0)
+
+
+class StubCore:
+    """Local HTTP stub of a Core API for tests without a Core backend.
+
+    `routes` maps (method, path) to (status, body) or to a callable that
+    gets the request handler and returns (status, body). A body that is
+    not bytes is sent as JSON. With `uds` the stub listens on a Unix
+    domain socket at that path.
+    """
+
+    def __init__(self, routes: dict = None, uds: str = None):
+        self.routes = {} if routes is None else routes
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are separate writes, TCP only
+            disable_nagle_algorithm = not uds
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                if self.headers.get("transfer-encoding") == "chunked":
+                    self.body = self._read_chunked()
+                else:
+                    length = int(self.headers.get("content-length") or 0)
+                    self.body = self.rfile.read(length) if length else b""
+                path = unquote(self.path.split("?")[0])
+                stub.requests.append((self.command, self.path))
+                route = stub.routes.get((self.command, path))
+                if route is None:
+                    route = (404, {"code": 404, "message": "", "details": []})
+                if callable(route):
+                    route = route(self)
+                if route is None:
+                    return
+                status, body = route
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_chunked(self):
+                body = b""
+                while size := int(self.rfile.readline().split(b";")[0], 16):
+                    body += self.rfile.read(size)
+                    self.rfile.readline()
+                # trailers
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return body
+
+            do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+        if uds:
+            self.server = ThreadingUnixHTTPServer(uds, Handler)
+            self.url = "http://core"
+        else:
+            self.server = ThreadingTCPHTTPServer(("127.0.0.1", 0), Handler)
+            self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()